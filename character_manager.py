@@ -10,13 +10,91 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import re
+import time
+import atexit
+import heapq
+import zlib
+import struct
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError
+    CharacterDeadError,
+    SaveLockTimeoutError,
+    StaleSaveError
 )
+from quest_handler import QuestLog
+from inventory_system import Inventory
+
+try:
+    import fcntl
+except ImportError:  # Windows: text saves are not locked
+    fcntl = None
+
+# Starting stats for each playable class (see create_character)
+CHARACTER_CLASSES = {
+    "Warrior": {"health": 120, "strength": 15, "magic": 5},
+    "Mage": {"health": 80, "strength": 8, "magic": 20},
+    "Rogue": {"health": 90, "strength": 12, "magic": 10},
+    "Cleric": {"health": 100, "strength": 10, "magic": 15}
+}
+
+# Save durability levels, from fastest to safest. Every level replaces
+# the save atomically; they differ in what survives a power loss.
+DURABILITY_NONE = "none"   # no fsync: the OS flushes when it likes
+DURABILITY_FILE = "file"   # fsync the new file before renaming it
+DURABILITY_DIR = "dir"     # also fsync the directory so the rename is durable
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_DIR)
+DEFAULT_DURABILITY = DURABILITY_FILE
+
+# Threads used by the text backend for batch reads and writes
+BATCH_IO_WORKERS = 8
+
+# Seconds to wait for another process's lock on a text save
+SAVE_LOCK_TIMEOUT = 10.0
+
+# Binary save layout (format 1); all integers are little-endian:
+#   header      _SAVE_HEADER: SAVE_MAGIC, u16 format version
+#   name        str
+#   class       str
+#   stats       _SAVE_STATS: i32 each of _SAVE_STAT_FIELDS, in order
+#   inventory   uvarint count, then count x (str item_id, uvarint quantity)
+#   active_quests, completed_quests
+#               uvarint count, then count x str quest_id
+#   extra       uvarint count, then count x (str field, value): every
+#               other saved field (equipped items, cooldowns, ...)
+# where uvarint is an unsigned LEB128 integer (7 bits per byte, low
+# bits first), str is a uvarint byte length followed by UTF-8, and
+# value is a one byte tag followed by its payload:
+#   N None, T True, F False, I i64, D f64, S str,
+#   L list / U tuple: uvarint count, then count x value
+#   M dict: uvarint count, then count x (value key, value)
+# Journal deltas (see JournaledTextStorage) are stored as one value.
+# Equal characters always encode to equal bytes (SaveScheduler
+# compares snapshots). Changing the layout needs a new
+# SAVE_FORMAT_VERSION and a migration.
+SAVE_MAGIC = b"QCSV"
+SAVE_FORMAT_VERSION = 1
+_SAVE_HEADER = struct.Struct("<4sH")
+_SAVE_STAT_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+_SAVE_STATS = struct.Struct(f"<{len(_SAVE_STAT_FIELDS)}i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# Runtime-only character keys that are never written to a save
+TRANSIENT_FIELDS = ("quest_tracker", "item_data")
+
+# Columns of a roster entry (see list_roster) and the supported orderings
+ROSTER_FIELDS = ("name", "class", "level", "saved_at", "size")
+ROSTER_SORTS = ("name", "level", "recent")
 
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
@@ -48,18 +126,11 @@ def create_character(name, character_class):
     
     # Raise InvalidCharacterClassError if class not in valid list
     
-    valid_classes = {
-        "Warrior": {"health": 120, "strength": 15, "magic": 5},
-        "Mage": {"health": 80, "strength": 8, "magic": 20},
-        "Rogue": {"health": 90, "strength": 12, "magic": 10},
-        "Cleric": {"health": 100, "strength": 10, "magic": 15}
-    }
-
     character_class = character_class.strip().title()
-    if character_class not in valid_classes:
+    if character_class not in CHARACTER_CLASSES:
         raise InvalidCharacterClassError(f"Invalid character class: {character_class}")
 
-    stats = valid_classes[character_class]
+    stats = CHARACTER_CLASSES[character_class]
 
     character = {
         "name": name.strip(),
@@ -71,19 +142,26 @@ def create_character(name, character_class):
         "magic": stats["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
+        "inventory": Inventory(),
+        "active_quests": QuestLog(),
+        "completed_quests": QuestLog()
         }
     return character
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory=None, durability=None, check_version=False,
+                   on_saved=None):
     """
     Save character to file
     
-    Filename format: {character_name}_save.txt
+    Filename format: {character_name}_save.dat
+    (older text saves named {character_name}_save.txt still load)
     
-    File format:
+    With save_directory=None the configured storage backend is used (see
+    configure_storage); by default that is data/save_games.
+    
+    Saves use the binary format from serialize_character, which keeps
+    every field of the character (equipped items, cooldowns, ...).
+    Older text saves still load (see decode_character). Their format was:
     NAME: character_name
     CLASS: class_name
     LEVEL: 1
@@ -93,46 +171,684 @@ def save_character(character, save_directory="data/save_games"):
     MAGIC: 5
     EXPERIENCE: 0
     GOLD: 100
-    INVENTORY: item1,item2,item3
+    INVENTORY: item1:2,item2:1 (item:count; old item1,item1,item2 saves still load)
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    Save files are written to a temporary file and renamed over the old
+    save, so a crash never leaves a truncated save behind. durability
+    picks how long to wait for the disk (see DURABILITY_* below;
+    defaults to DEFAULT_DURABILITY).
+    
+    Every save bumps character["save_version"] once it is on disk. With
+    check_version=True the save is refused if the stored save is no
+    longer the version this character was loaded (or last saved) at,
+    i.e. another process saved it in between. Reload and retry in that
+    case.
+    
+    on_saved, if given, is called with the written save data once it is
+    on disk. With async saves (see enable_async_saves) that happens
+    later, on the writer thread; a queued save that failed is raised
+    here, on the next call.
+    
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
+            StaleSaveError if check_version finds a newer save
+            SaveLockTimeoutError if another process holds the save
     """
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
+    storage = get_storage(save_directory)
+    writer = _save_writer
+    if writer is not None:
+        writer.raise_errors()
+
+    def saved(data):
+        _saved_at_version(character, version + 1)
+        if on_saved is not None:
+            on_saved(data)
+
+    try:
+        name = character["name"]
+        version = character.get("save_version", 0)
+        if writer is not None:
+            # Build on a save of this character still queued or being written
+            version = writer.queued_version(storage, name, version)
+        expected = version if check_version else None
+        data = serialize_character(dict(character, save_version=version + 1))
+        if writer is not None:
+            # Async mode: hand the snapshot to the writer thread
+            writer.submit(storage, name, data, durability, expected, saved, version + 1)
+        else:
+            storage.write(name, data, durability, expected)
+            saved(data)
+        return True
+
+    except (StaleSaveError, SaveLockTimeoutError):
+        raise
+    except Exception as e:
+        raise IOError("Error saving character") from e
+
+def _saved_at_version(character, version):
+    """Move character's save_version on once a save at version is on disk"""
+    if character.get("save_version", 0) < version:
+        character["save_version"] = version
+
+def serialize_character(character):
+    """
+    Build the contents of a save file
+    
+    The save record (the character dict without TRANSIENT_FIELDS) in
+    the binary layout described next to _SAVE_HEADER. The fields every
+    save has are stored positionally, so their names are not repeated
+    in every file; any other fields follow by name.
+    
+    Returns: The save file contents as bytes
+    Raises: KeyError if a required field is missing, ValueError if a
+            field holds something that cannot be saved
+    """
+    return encode_save_record(_record_from_character(character))
+
+def encode_save_record(record):
+    """
+    Save data in the current format for a plain save record
+    
+    Returns: bytes (see serialize_character for the layout)
+    Raises: ValueError if a field holds something that cannot be saved
+    """
+    record = dict(record)
+    out = bytearray(_SAVE_HEADER.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION))
+    try:
+        _pack_str(out, record.pop("name"))
+        _pack_str(out, record.pop("class"))
+        out += _SAVE_STATS.pack(*(record.pop(key) for key in _SAVE_STAT_FIELDS))
+        inventory = record.pop("inventory")
+        _pack_uvarint(out, len(inventory))
+        for item_id, count in inventory.items():
+            _pack_str(out, item_id)
+            _pack_uvarint(out, count)
+        for key in ("active_quests", "completed_quests"):
+            quest_ids = record.pop(key)
+            _pack_uvarint(out, len(quest_ids))
+            for quest_id in quest_ids:
+                _pack_str(out, quest_id)
+        _pack_uvarint(out, len(record))
+        for key, value in record.items():
+            _pack_str(out, key)
+            _pack_value(out, value)
+    except (struct.error, AttributeError, TypeError) as e:
+        raise ValueError(f"Cannot save character: {e}") from e
+    return bytes(out)
+
+def _pack_uvarint(out, number):
+    if number < 0:
+        raise ValueError(f"Cannot save a negative count: {number}")
+    while number > 0x7F:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+
+def _pack_str(out, text):
+    data = text.encode("utf-8")
+    _pack_uvarint(out, len(data))
+    out += data
+
+def _pack_value(out, value):
+    """Append a tagged value (see the layout next to _SAVE_HEADER)"""
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        out += b"I"
+        out += _I64.pack(value)
+    elif isinstance(value, float):
+        out += b"D"
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        out += b"S"
+        _pack_str(out, value)
+    elif isinstance(value, (list, tuple)):
+        out += b"L" if isinstance(value, list) else b"U"
+        _pack_uvarint(out, len(value))
+        for item in value:
+            _pack_value(out, item)
+    elif isinstance(value, dict):
+        out += b"M"
+        _pack_uvarint(out, len(value))
+        for key, item in value.items():
+            _pack_value(out, key)
+            _pack_value(out, item)
+    else:
+        raise ValueError(f"Cannot save a {type(value).__name__} value")
+
+class _SaveReader:
+    """
+    Reads the pieces of a binary save (or journal delta) from data
+    
+    Raises struct.error, IndexError, ValueError or UnicodeDecodeError
+    on bad data.
+    """
+
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def count(self):
+        """A uvarint"""
+        number = self.data[self.offset]
+        self.offset += 1
+        if number < 0x80:
+            return number
+        number &= 0x7F
+        shift = 7
+        while True:
+            byte = self.data[self.offset]
+            self.offset += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return number
+            shift += 7
+
+    def string(self):
+        length = self.count()
+        end = self.offset + length
+        if end > len(self.data):
+            raise ValueError("Truncated string")
+        text = self.data[self.offset:end].decode("utf-8")
+        self.offset = end
+        return text
+
+    def strings(self):
+        """A uvarint count followed by that many strs, as a list"""
+        count = self.count()
+        data, offset = self.data, self.offset
+        texts = []
+        for _ in range(count):
+            length = data[offset]
+            if length < 0x80:
+                offset += 1
+            else:
+                self.offset = offset
+                length = self.count()
+                offset = self.offset
+            texts.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        if offset > len(data):
+            raise ValueError("Truncated string")
+        self.offset = offset
+        return texts
+
+    def string_counts(self):
+        """A uvarint count followed by (str, uvarint) pairs, as a dict"""
+        count = self.count()
+        data, offset = self.data, self.offset
+        counts = {}
+        for _ in range(count):
+            length = data[offset]
+            if length < 0x80:
+                offset += 1
+            else:
+                self.offset = offset
+                length = self.count()
+                offset = self.offset
+            text = data[offset:offset + length].decode("utf-8")
+            offset += length
+            number = data[offset]
+            if number < 0x80:
+                offset += 1
+            else:
+                self.offset = offset
+                number = self.count()
+                offset = self.offset
+            counts[text] = number
+        self.offset = offset
+        return counts
+
+    def value(self):
+        tag = self.data[self.offset:self.offset + 1]
+        self.offset += 1
+        if tag == b"N":
+            return None
+        if tag == b"T":
+            return True
+        if tag == b"F":
+            return False
+        if tag == b"I":
+            return self.unpack(_I64)[0]
+        if tag == b"D":
+            return self.unpack(_F64)[0]
+        if tag == b"S":
+            return self.string()
+        if tag == b"L":
+            return [self.value() for _ in range(self.count())]
+        if tag == b"U":
+            return tuple(self.value() for _ in range(self.count()))
+        if tag == b"M":
+            items = {}
+            for _ in range(self.count()):
+                key = self.value()
+                items[key] = self.value()
+            return items
+        raise ValueError(f"Unknown value tag: {tag!r}")
+
+    def record(self):
+        """The save record that follows the header"""
+        record = {"name": self.string(), "class": self.string()}
+        record.update(zip(_SAVE_STAT_FIELDS, self.unpack(_SAVE_STATS)))
+        record["inventory"] = self.string_counts()
+        record["active_quests"] = self.strings()
+        record["completed_quests"] = self.strings()
+        for _ in range(self.count()):
+            key = self.string()
+            record[key] = self.value()
+        if self.offset != len(self.data):
+            raise ValueError("Trailing data after save record")
+        return record
+
+def encode_save_value(value):
+    """A single tagged value as bytes (used for journal deltas)"""
+    out = bytearray()
+    _pack_value(out, value)
+    return bytes(out)
+
+def decode_save_value(data):
+    """
+    Inverse of encode_save_value
+    
+    Raises: ValueError if data is not exactly one encoded value
+    """
+    reader = _SaveReader(data)
+    try:
+        value = reader.value()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Bad save value: {e}") from e
+    if reader.offset != len(data):
+        raise ValueError("Trailing data after save value")
+    return value
+
+# Fields every save has; also the fields (and order) of the text format
+_TEXT_SAVE_FIELDS = (
+    "name", "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold",
+    "inventory", "active_quests", "completed_quests",
+)
+
+def _record_from_character(character):
+    """Plain-data copy of a character, as stored in a save"""
+    for key in _TEXT_SAVE_FIELDS:
+        if key not in character:
+            raise KeyError(key)
+    record = {}
+    for key, value in character.items():
+        if key in TRANSIENT_FIELDS:
+            continue
+        if key == "inventory":
+            value = value.counts() if isinstance(value, Inventory) else _count_items(value)
+        elif key in ("active_quests", "completed_quests"):
+            value = list(value)
+        record[key] = value
+    return record
+
+def _character_from_record(record):
+    """Rebuild the runtime containers of a decoded save record"""
+    character = dict(record)
+    if isinstance(character.get("inventory"), dict):
+        character["inventory"] = Inventory.from_counts(character["inventory"])
+    for key in ("active_quests", "completed_quests"):
+        if isinstance(character.get(key), list):
+            character[key] = QuestLog(character[key])
+    return character
+
+def serialize_character_text(character):
+    """
+    Build a save in the original text format (format 0, see save_character)
+    
+    Only the fields listed there are kept. Not used for saving anymore;
+    kept for exporting and for testing the text migration.
+    
+    Returns: The save file contents as a string
+    """
+    lines = []
+    for key in _TEXT_SAVE_FIELDS[:-3]:
+        lines.append(f"{key.upper()}: {character[key]}\n")
 
-    os.makedirs(save_directory, exist_ok=True)
+    lines.append(f"INVENTORY: {format_inventory(character['inventory'])}\n")
+    lines.append(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
+    lines.append(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
+    return "".join(lines)
 
-    file_path = os.path.join(save_directory, f"{character['name']}_save.txt")
+def write_file_atomically(file_path, data, durability=None):
+    """
+    Replace file_path with data so readers see either the old or new file
+    
+    data may be bytes or a string (written as UTF-8).
+    
+    Writes a temporary file in the same directory, optionally fsyncs it,
+    then renames it over file_path with os.replace.
+    
+    Raises: OSError if writing fails (the original file is left untouched)
+    """
+    if durability is None:
+        durability = DEFAULT_DURABILITY
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {durability}")
 
+    directory = os.path.dirname(file_path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory
+    )
+    if isinstance(data, str):
+        data = data.encode("utf-8")
     try:
-        with open(file_path, "w") as f:
-            for key in [
-                "name", "class", "level", "health", "max_health",
-                "strength", "magic", "experience", "gold"
-            ]:
-                f.write(f"{key.upper()}: {character[key]}\n")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durability != DURABILITY_NONE:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if durability == DURABILITY_DIR:
+        _fsync_directory(directory)
+
+def _fsync_directory(directory):
+    """Persist a rename by fsyncing its directory (not possible on Windows)"""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+class SaveScheduler:
+    """
+    Coalesces autosaves so unchanged characters never touch the disk
+    
+    Remembers what each character looked like when it was last saved.
+    request_save() writes only if the character changed since then, and
+    at most once per min_interval seconds; a change made inside the
+    interval stays pending until tick(), a later request_save() or
+    flush() writes it. A save only counts as written once it is on
+    disk, so with async saves a failed write is retried (and its error
+    raised by the next request_save).
+    
+    Save bookkeeping (BOOKKEEPING_FIELDS) is left out of the comparison:
+    save_version moves on when a write lands, which is not a change.
+    """
+    BOOKKEEPING_FIELDS = ("save_version",)
+
+    def __init__(self, min_interval=5.0, save_directory=None, clock=time.monotonic):
+        self.min_interval = min_interval
+        self.save_directory = save_directory
+        self.clock = clock
+        self._saved = {}       # name -> serialized save last written
+        self._last_write = {}  # name -> clock() of last write
+        self._pending = {}     # name -> character waiting for the interval
+
+    def _snapshot(self, character):
+        """Serialized character without its save bookkeeping"""
+        if any(field in character for field in self.BOOKKEEPING_FIELDS):
+            character = {key: value for key, value in character.items()
+                         if key not in self.BOOKKEEPING_FIELDS}
+        return serialize_character(character)
+
+    def mark_saved(self, character):
+        """Record that character's current state is already on disk"""
+        self._saved[character["name"]] = self._snapshot(character)
+        self._last_write[character["name"]] = self.clock()
+        self._pending.pop(character["name"], None)
 
-            f.write(f"INVENTORY: {','.join(character['inventory'])}\n")
-            f.write(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
-            f.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
+    def is_dirty(self, character):
+        """True if character changed since it was last saved"""
+        return self._snapshot(character) != self._saved.get(character["name"])
 
+    def request_save(self, character, force=False):
+        """
+        Save character if it changed and the interval has passed (or force)
+        
+        Returns: True if the character was written (or queued, with
+                 async saves)
+        Raises: IOError if the save, or an earlier async save, failed
+        """
+        if _save_writer is not None:
+            _save_writer.raise_errors()
+        name = character["name"]
+        snapshot = self._snapshot(character)
+        if snapshot == self._saved.get(name):
+            self._pending.pop(name, None)
+            return False
+
+        last = self._last_write.get(name)
+        if not force and last is not None and self.clock() - last < self.min_interval:
+            self._pending[name] = character
+            return False
+
+        save_character(character, self.save_directory,
+                       on_saved=lambda data: self._saved.__setitem__(name, snapshot))
+        self._last_write[name] = self.clock()
+        self._pending.pop(name, None)
         return True
 
-    except Exception as e:
-        raise IOError("Error saving character") from e
+    def tick(self):
+        """
+        Write pending characters whose interval has passed
+        
+        Returns: Number of characters written
+        """
+        written = 0
+        for character in list(self._pending.values()):
+            if self.request_save(character):
+                written += 1
+        return written
+
+    def flush(self):
+        """
+        Write every pending character now (e.g. on quit)
+        
+        Returns: Number of characters written
+        """
+        written = 0
+        for character in list(self._pending.values()):
+            if self.request_save(character, force=True):
+                written += 1
+        return written
 
-def load_character(character_name, save_directory="data/save_games"):
+class AsyncSaveWriter:
+    """
+    Background thread that writes saves so callers never wait on the disk
+    
+    submit() queues the serialized save and returns immediately. Only
+    the newest snapshot per file is kept, so a character saved again
+    before the writer got to it is written once. When max_pending
+    different files are queued, submit() blocks until the writer
+    catches up (or raises IOError after timeout seconds).
+    
+    Failed writes are kept until raise_errors() or flush() reports them.
+    """
+
+    def __init__(self, max_pending=1024, timeout=None):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pending = OrderedDict()  # (storage, name) -> (text, durability, expected, on_saved, version)
+        self._writing = None           # (storage, name) being written right now
+        self._versions = {}            # (storage, name) -> save_version last queued
+        self._errors = []
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, storage, name, text, durability=None, expected_version=None,
+               on_saved=None, version=None):
+        """
+        Queue text to be written as name's save in storage
+        
+        on_saved(text) is called on the writer thread once the save is
+        written. version is the save_version in text (see
+        queued_version). A save replacing a queued one keeps the queued
+        save's expected_version, since that is what is still on disk.
+        
+        Raises: IOError if the queue stays full for `timeout` seconds
+        """
+        key = (storage, name)
+        with self._cond:
+            if self._closed:
+                raise IOError("Save writer is closed")
+            if key in self._pending:
+                expected_version = self._pending[key][2]
+            elif not self._cond.wait_for(
+                    lambda: len(self._pending) < self.max_pending, self.timeout):
+                raise IOError("Save queue is full")
+            self._pending[key] = (text, durability, expected_version, on_saved, version)
+            if version is not None:
+                self._versions[key] = version
+            self._cond.notify_all()
+
+    def queued_version(self, storage, name, saved_version):
+        """
+        save_version a new save of name should build on
+        
+        That is the version of the last save queued for name, unless
+        it failed, or saved_version if that is newer.
+        """
+        with self._cond:
+            return max(saved_version, self._versions.get((storage, name), 0))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                key, (text, durability, expected_version, on_saved, version) = \
+                    self._pending.popitem(last=False)
+                self._writing = key
+                self._cond.notify_all()
+            try:
+                storage, name = key
+                storage.write(name, text, durability, expected_version)
+                if on_saved is not None:
+                    on_saved(text)
+            except Exception as e:
+                with self._cond:
+                    self._errors.append((key, e))
+                    # Later saves must not build on a version never written
+                    if version is not None and self._versions.get(key) == version:
+                        del self._versions[key]
+            finally:
+                with self._cond:
+                    self._writing = None
+                    self._cond.notify_all()
+
+    def wait_for(self, storage, name, timeout=None):
+        """Block until no save for name in storage is queued or being written"""
+        key = (storage, name)
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: key not in self._pending and self._writing != key,
+                timeout)
+
+    def cancel(self, storage, name):
+        """Drop a queued save for name and wait out one in progress"""
+        with self._cond:
+            self._pending.pop((storage, name), None)
+            self._versions.pop((storage, name), None)
+            self._cond.notify_all()
+        self.wait_for(storage, name)
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued save is written
+        
+        Raises: IOError if any save failed since the last flush
+        """
+        with self._cond:
+            done = self._cond.wait_for(
+                lambda: not self._pending and self._writing is None, timeout)
+        self.raise_errors()
+        return done
+
+    def raise_errors(self):
+        """
+        Report the saves that failed since the last call (or flush)
+        
+        Raises: IOError chained to the most recent failure
+        """
+        with self._cond:
+            errors, self._errors = self._errors, []
+        if errors:
+            (_, name), error = errors[-1]
+            raise IOError(f"{len(errors)} save(s) failed, last: {name}") from error
+
+    def close(self):
+        """Write everything still queued, then stop the thread"""
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+
+# The active writer when async saves are enabled, otherwise None
+_save_writer = None
+
+def enable_async_saves(max_pending=1024, timeout=None):
+    """
+    Switch save_character to queue saves on a background writer thread
+    
+    Returns: The AsyncSaveWriter in use
+    """
+    global _save_writer
+    if _save_writer is None:
+        _save_writer = AsyncSaveWriter(max_pending, timeout)
+        atexit.register(disable_async_saves)
+    return _save_writer
+
+def disable_async_saves():
+    """Write all queued saves and go back to synchronous saving"""
+    global _save_writer
+    writer, _save_writer = _save_writer, None
+    if writer is not None:
+        atexit.unregister(disable_async_saves)
+        writer.close()
+
+def flush_saves(timeout=None):
+    """
+    Wait for queued async saves to reach the disk (no-op when synchronous)
+    
+    Raises: IOError if a queued save failed
+    """
+    if _save_writer is not None:
+        _save_writer.flush(timeout)
+
+def load_character(character_name, save_directory=None):
     """
     Load character from save file
     
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
+                        (None: the configured storage backend)
     
     Returns: Character dictionary
     Raises: 
@@ -145,20 +861,99 @@ def load_character(character_name, save_directory="data/save_games"):
     # Try to read file → SaveFileCorruptedError
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
+    storage = get_storage(save_directory)
+
+    # Make sure a queued async save for this character has been written
+    if _save_writer is not None:
+        _save_writer.wait_for(storage, character_name)
+
+    character = decode_character(storage.read(character_name))
+    validate_character_data(character)
+    return character
+
+# from_version -> function upgrading a save record to from_version + 1
+_SAVE_MIGRATIONS = {}
+
+def register_save_migration(from_version):
+    """
+    Decorator registering the upgrade of save records from from_version
+    
+    The function takes a record in format from_version and returns it
+    in format from_version + 1; decode_character chains them up to
+    SAVE_FORMAT_VERSION.
+    """
+    def register(migrate):
+        _SAVE_MIGRATIONS[from_version] = migrate
+        return migrate
+    return register
 
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+@register_save_migration(0)
+def _migrate_text_save(text):
+    """Format 0 is the original KEY: value text save"""
+    try:
+        return _record_from_character(parse_character_text(text))
+    except KeyError as e:
+        raise InvalidSaveDataError(f"Missing field: {e.args[0]}")
+
+def read_save_record(data):
+    """
+    Split stored save data into its format version and raw record
+    
+    Data without the SAVE_MAGIC header is a format 0 text save.
+    
+    Returns: (format version, record)
+    Raises: InvalidSaveDataError if the data cannot be decoded or was
+            written by a newer version of the game
+    """
+    if isinstance(data, str):
+        return 0, data
+    data = bytes(data)
+    if not data.startswith(SAVE_MAGIC):
+        try:
+            return 0, data.decode("utf-8")
+        except UnicodeDecodeError:
+            raise InvalidSaveDataError("Save data is not a known save format.")
 
     try:
-        with open(file_path) as f:
-            lines = f.readlines()
-    except:
-        raise SaveFileCorruptedError("Save file exists but cannot be read.")
+        _, version = _SAVE_HEADER.unpack_from(data)
+    except struct.error:
+        raise InvalidSaveDataError("Save data is incorrectly formatted.")
+    if version > SAVE_FORMAT_VERSION:
+        raise InvalidSaveDataError(f"Save format {version} is newer than this game supports.")
+    try:
+        record = _SaveReader(data, _SAVE_HEADER.size).record()
+    except (struct.error, IndexError, ValueError, UnicodeDecodeError):
+        raise InvalidSaveDataError("Save data is incorrectly formatted.")
+    return version, record
 
+def decode_character(data):
+    """
+    Turn stored save data of any format version into a character
+    
+    Older formats are upgraded through the registered migrations.
+    
+    Returns: Character dictionary (not yet validated)
+    Raises: InvalidSaveDataError if the data cannot be decoded or was
+            written by a newer version of the game
+    """
+    version, record = read_save_record(data)
+    while version < SAVE_FORMAT_VERSION:
+        migrate = _SAVE_MIGRATIONS.get(version)
+        if migrate is None:
+            raise InvalidSaveDataError(f"No migration from save format {version}.")
+        record = migrate(record)
+        version += 1
+    return _character_from_record(record)
+
+def parse_character_text(text):
+    """
+    Parse save file text back into a character dictionary
+    
+    Raises: InvalidSaveDataError if data format is wrong
+    """
     character = {}
     try:
-        for line in lines:
+        for line in text.splitlines():
             if ":" not in line:
                 raise InvalidSaveDataError("Malformed save file line.")
 
@@ -166,8 +961,10 @@ def load_character(character_name, save_directory="data/save_games"):
             key = key.lower().strip()
             value = value.strip()
 
-            if key in ["inventory", "active_quests", "completed_quests"]:
-                character[key] = value.split(",") if value else []
+            if key in ["active_quests", "completed_quests"]:
+                character[key] = QuestLog(value.split(",") if value else [])
+            elif key == "inventory":
+                character[key] = parse_inventory(value)
             elif key in ["level", "health", "max_health", "strength", "magic", "experience", "gold"]:
                 character[key] = int(value)
             else:
@@ -176,29 +973,164 @@ def load_character(character_name, save_directory="data/save_games"):
     except Exception:
         raise InvalidSaveDataError("Save data is incorrectly formatted.")
 
-    validate_character_data(character)
     return character
 
-def list_saved_characters(save_directory="data/save_games"):
+def summarize_save(data):
+    """
+    Read class and level from stored save data of any format
+    
+    Text saves are scanned only up to the LEVEL line.
+    
+    Returns: (class, level) - None/0 for fields that are missing or bad
+    """
+    try:
+        version, record = read_save_record(data)
+    except InvalidSaveDataError:
+        return None, 0
+    if version > 0:
+        level = record.get("level")
+        return record.get("class"), level if isinstance(level, int) else 0
+
+    character_class, level = None, None
+    for line in record.splitlines():
+        key, _, value = line.partition(":")
+        if key == "CLASS":
+            character_class = value.strip()
+        elif key == "LEVEL":
+            level = value.strip()
+        if character_class is not None and level is not None:
+            break
+    try:
+        level = int(level)
+    except (TypeError, ValueError):
+        level = 0
+    return character_class, level
+
+def stored_save_version(data):
+    """save_version of stored save data (0 for saves from before versions)"""
+    version, record = read_save_record(data)
+    return record.get("save_version", 0) if version > 0 else 0
+
+def _check_save_version(name, data, expected_version):
+    """
+    Raises: StaleSaveError unless the stored save data (None if there is
+            none) is at expected_version; None skips the check
+    """
+    if expected_version is None:
+        return
+    found = 0 if data is None else stored_save_version(data)
+    if found != expected_version:
+        raise StaleSaveError(
+            f"Save for '{name}' is at version {found}, expected {expected_version}; reload and retry.")
+
+@contextmanager
+def _file_lock(path, exclusive, timeout):
+    """
+    Hold an advisory flock on path (created if needed) for the block
+    
+    Locks are shared or exclusive per open file, so threads and
+    processes both wait for each other. Shared locks open the file
+    read-only, so read-only save directories can still be read. If the
+    lock file can't be opened or created, the block runs unlocked (the
+    read or write itself reports the problem). A no-op where fcntl is
+    missing.
+    
+    The lock file may be removed while its lock is held (see
+    TextFileStorage.delete); a lock taken on a file that was removed
+    meanwhile is dropped and taken again on the new file.
+    
+    Raises: SaveLockTimeoutError if the lock isn't free within timeout
+    """
+    if fcntl is None:
+        yield
+        return
+    operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    flags = (os.O_RDWR if exclusive else os.O_RDONLY) | os.O_CREAT
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, flags, 0o644)
+        except OSError:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                yield
+                return
+        try:
+            delay = 0.001
+            while True:
+                try:
+                    fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise SaveLockTimeoutError(f"Timed out waiting for lock on {path}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.05)
+            locked = os.fstat(fd)
+            try:
+                current = os.stat(path)
+                same = (locked.st_dev, locked.st_ino) == (current.st_dev, current.st_ino)
+            except FileNotFoundError:
+                same = False
+            if same:
+                yield
+                return
+        finally:
+            os.close(fd)  # also releases the lock
+
+def _save_size(data):
+    """Size in bytes of stored save data"""
+    return len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+
+def list_saved_characters(save_directory=None):
     """
     Get list of all saved character names
     
-    Returns: List of character names (without _save.txt extension)
+    Names come from the roster index (see list_roster), so the save
+    directory is not scanned.
+    
+    Returns: Sorted list of character names
     """
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
-    if not os.path.isdir(save_directory):
-        return []
+    return get_storage(save_directory).list_names()
 
-    characters = []
-    for file in os.listdir(save_directory):
-        if file.endswith("_save.txt"):
-            characters.append(file[:-9])  # Remove suffix
+def list_roster(save_directory=None, character_class=None, min_level=None,
+                max_level=None, saved_since=None, sort="name", offset=0, limit=None):
+    """
+    List saved characters from the roster index, filtered and paginated
+    
+    Args:
+        character_class: Only characters of this class
+        min_level, max_level: Inclusive level range
+        saved_since: Only characters saved at or after this time.time()
+        sort: "name", "level" (highest first) or "recent" (newest first)
+        offset, limit: Page through the results
+    
+    Returns: List of dicts with the ROSTER_FIELDS keys
+    Raises: ValueError for an unknown sort
+    """
+    if sort not in ROSTER_SORTS:
+        raise ValueError(f"Unknown roster sort: {sort}")
+    return get_storage(save_directory).list_roster(
+        character_class, min_level, max_level, saved_since, sort, offset, limit)
 
-    return characters
+def rebuild_roster(save_directory=None):
+    """
+    Rebuild the text backend's roster from the save files
+    
+    Only needed if saves were copied in or removed by hand.
+    
+    Returns: Number of characters in the roster
+    """
+    storage = get_storage(save_directory)
+    if isinstance(storage, TextFileStorage):
+        storage.roster.rebuild()
+    return len(storage.list_names())
 
-def delete_character(character_name, save_directory="data/save_games"):
+def delete_character(character_name, save_directory=None):
     """
     Delete a character's save file
     
@@ -207,14 +1139,1099 @@ def delete_character(character_name, save_directory="data/save_games"):
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
+    storage = get_storage(save_directory)
 
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+    # Drop queued async saves so the writer can't recreate the save
+    if _save_writer is not None:
+        _save_writer.cancel(storage, character_name)
 
-    os.remove(file_path)
+    storage.delete(character_name)
     return True
+
+def load_characters(character_names, save_directory=None):
+    """
+    Load many characters at once
+    
+    The saves are read in one batch (one query on the SQLite backend,
+    a thread pool on the text backend). A missing or broken save does
+    not stop the batch; it is reported in errors instead.
+    
+    Returns: (characters, errors) - dicts keyed by character name;
+             errors holds the CharacterNotFoundError,
+             SaveFileCorruptedError or InvalidSaveDataError for that name
+    """
+    storage = get_storage(save_directory)
+    names = list(dict.fromkeys(character_names))
+
+    if _save_writer is not None:
+        for name in names:
+            _save_writer.wait_for(storage, name)
+
+    texts, errors = storage.read_many(names)
+    characters = {}
+    for name in names:
+        if name not in texts:
+            continue
+        try:
+            character = decode_character(texts[name])
+            validate_character_data(character)
+            characters[name] = character
+        except InvalidSaveDataError as e:
+            errors[name] = e
+    return characters, errors
+
+def save_characters(characters, save_directory=None, durability=None):
+    """
+    Save many characters at once
+    
+    The SQLite backend writes the whole batch in one transaction; the
+    text backend writes the files from a thread pool. If a character
+    appears twice, the last one is saved.
     
+    Returns: Dict of character name -> IOError for the saves that
+             failed (empty if everything was saved)
+    """
+    storage = get_storage(save_directory)
+    writer = _save_writer
+    texts = {}
+    versions = {}  # name -> (character, save_version being written)
+    errors = {}
+    for character in characters:
+        name = character.get("name")
+        try:
+            version = character.get("save_version", 0)
+            if writer is not None:
+                version = writer.queued_version(storage, name, version)
+            texts[name] = serialize_character(dict(character, save_version=version + 1))
+            versions[name] = (character, version + 1)
+        except Exception as e:
+            error = IOError("Error saving character")
+            error.__cause__ = e
+            errors[name] = error
+
+    if writer is not None:
+        for name, text in texts.items():
+            character, version = versions[name]
+            try:
+                writer.submit(storage, name, text, durability,
+                              on_saved=lambda data, c=character, v=version: _saved_at_version(c, v),
+                              version=version)
+            except Exception as e:
+                error = IOError("Error saving character")
+                error.__cause__ = e
+                errors[name] = error
+        return errors
+
+    try:
+        failed = storage.write_many(texts.items(), durability)
+    except Exception as e:
+        # The whole batch was rolled back
+        failed = dict.fromkeys(texts, e)
+    for name, e in failed.items():
+        error = IOError("Error saving character")
+        error.__cause__ = e
+        errors[name] = error
+    for name, (character, version) in versions.items():
+        if name not in failed:
+            _saved_at_version(character, version)
+    return errors
+
+# ============================================================================
+# SAVE STORAGE BACKENDS
+# ============================================================================
+
+class RosterIndex:
+    """
+    Roster of the characters saved in one text-backend directory
+    
+    Kept in memory and backed by an append-only journal (roster.idx)
+    of tab-separated lines: "+ name class level saved_at size" for a
+    save and "- name" for a delete. Backslash, tab, CR and newline in
+    names are written as \\, \t, \r and \n. The journal is rewritten
+    compactly once it holds many dead lines. If it is missing or
+    unreadable, it is rebuilt by scanning the save files once.
+    
+    One RosterIndex is shared per directory (see for_directory). Lines
+    other processes append are picked up on the next call. Appends,
+    compactions and rebuilds hold an exclusive flock on roster.lock, so
+    a rewrite never drops lines another process is appending.
+    """
+    FILENAME = "roster.idx"
+    LOCK_FILENAME = "roster.lock"
+    # Compact once the journal has this many lines beyond 2x the roster
+    COMPACT_SLACK = 1000
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, save_directory):
+        key = os.path.abspath(save_directory)
+        with cls._instances_lock:
+            roster = cls._instances.get(key)
+            if roster is None:
+                roster = cls._instances[key] = cls(save_directory)
+            return roster
+
+    def __init__(self, save_directory):
+        self.save_directory = save_directory
+        self.path = os.path.join(save_directory, self.FILENAME)
+        self.lock_path = os.path.join(save_directory, self.LOCK_FILENAME)
+        self._entries = {}       # name -> ROSTER_FIELDS tuple
+        self._journal_id = None  # (device, inode) of the journal applied
+        self._offset = 0         # bytes of the journal applied
+        self._lines = 0          # lines in the journal
+        self._stale = False      # True when the journal must be rebuilt
+        self._lock = threading.Lock()
+        self._journal_locks = 0  # nesting depth of _journal_lock
+
+    def _refresh(self):
+        """Apply journal lines written since the last call"""
+        if self._stale:
+            self._rebuild()
+            return
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._rebuild()
+            return
+        if (st.st_dev, st.st_ino) != self._journal_id or st.st_size < self._offset:
+            # Compacted or replaced by someone else: read it from the start
+            self._entries, self._offset, self._lines = {}, 0, 0
+            self._journal_id = (st.st_dev, st.st_ino)
+        if st.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # leave a half-written last line for later
+        try:
+            for line in data[:end].decode("utf-8").split("\n")[:-1]:
+                self._apply(line)
+        except (UnicodeDecodeError, ValueError):
+            self._rebuild()
+            return
+        self._offset += end
+
+    _ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\r": "\\r", "\n": "\\n"})
+    _UNESCAPES = {"\\": "\\", "t": "\t", "r": "\r", "n": "\n"}
+    _ESCAPE_RE = re.compile(r"\\(.?)", re.DOTALL)
+
+    @classmethod
+    def _escape(cls, text):
+        return text.translate(cls._ESCAPES)
+
+    @classmethod
+    def _unescape(cls, text):
+        """Raises: ValueError for an unknown escape"""
+        def unescape(match):
+            if match.group(1) not in cls._UNESCAPES:
+                raise ValueError(f"Bad roster escape: {match.group(0)!r}")
+            return cls._UNESCAPES[match.group(1)]
+        return cls._ESCAPE_RE.sub(unescape, text)
+
+    def _apply(self, line):
+        fields = line.split("\t")
+        if fields[0] == "+" and len(fields) == 6:
+            name, character_class, level, saved_at, size = fields[1:]
+            name = self._unescape(name)
+            self._entries[name] = (name, self._unescape(character_class) or None, int(level),
+                                   float(saved_at), int(size))
+        elif fields[0] == "-" and len(fields) == 2:
+            self._entries.pop(self._unescape(fields[1]), None)
+        else:
+            raise ValueError(f"Bad roster line: {line!r}")
+        self._lines += 1
+
+    @classmethod
+    def _format(cls, entry):
+        name, character_class, level, saved_at, size = entry
+        return (f"+\t{cls._escape(name)}\t{cls._escape(character_class or '')}"
+                f"\t{level}\t{saved_at!r}\t{size}\n")
+
+    @contextmanager
+    def _journal_lock(self):
+        """Exclusive flock on roster.lock; nests (call with _lock held)"""
+        if self._journal_locks:
+            lock = nullcontext()
+        else:
+            lock = _file_lock(self.lock_path, True, SAVE_LOCK_TIMEOUT)
+        with lock:
+            self._journal_locks += 1
+            try:
+                yield
+            finally:
+                self._journal_locks -= 1
+
+    def _append(self, lines):
+        try:
+            os.makedirs(self.save_directory, exist_ok=True)
+            with self._journal_lock():
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                self._refresh()
+                if self._lines > 2 * len(self._entries) + self.COMPACT_SLACK:
+                    self._compact()
+        except (OSError, SaveLockTimeoutError):
+            # The roster is derived data: rebuild it rather than fail the save
+            self._stale = True
+
+    def _compact(self):
+        """Rewrite the journal with one line per character (hold _journal_lock)"""
+        text = "".join(self._format(entry) for entry in self._entries.values())
+        try:
+            write_file_atomically(self.path, text, DURABILITY_NONE)
+            st = os.stat(self.path)
+        except OSError:
+            self._stale = True
+            return
+        self._journal_id = (st.st_dev, st.st_ino)
+        self._offset = st.st_size
+        self._lines = len(self._entries)
+        self._stale = False
+
+    def _rebuild(self):
+        """Scan the save files and write a fresh journal"""
+        self._entries = {}
+        if not os.path.isdir(self.save_directory):
+            # Nothing saved yet; the first save creates the journal
+            self._journal_id, self._offset, self._lines = None, 0, 0
+            self._stale = False
+            return
+        try:
+            with self._journal_lock():
+                self._scan()
+        except (OSError, SaveLockTimeoutError):
+            self._stale = True
+
+    def _scan(self):
+        files = os.listdir(self.save_directory)
+        # Legacy text saves first, so a binary save of the same name wins
+        for suffix in (TextFileStorage.LEGACY_SUFFIX, TextFileStorage.SUFFIX):
+            for file in files:
+                if not file.endswith(suffix):
+                    continue
+                try:
+                    with open(os.path.join(self.save_directory, file), "rb") as f:
+                        data = f.read()
+                        st = os.fstat(f.fileno())
+                except OSError:
+                    continue
+                name = file[:-len(suffix)]
+                self._entries[name] = (name, *summarize_save(data), st.st_mtime, st.st_size)
+        self._compact()
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+
+    def record(self, saves, saved_at=None):
+        """Add or update roster entries for (name, data) pairs just written"""
+        if saved_at is None:
+            saved_at = time.time()
+        with self._lock:
+            self._refresh()
+            lines = []
+            for name, data in saves:
+                entry = (name, *summarize_save(data), saved_at, _save_size(data))
+                lines.append(self._format(entry))
+            self._append(lines)
+
+    def forget(self, name):
+        with self._lock:
+            self._refresh()
+            self._append([f"-\t{self._escape(name)}\n"])
+
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return sorted(self._entries)
+
+    def query(self, character_class=None, min_level=None, max_level=None,
+              saved_since=None, sort="name", offset=0, limit=None):
+        """Filter, sort and page the roster (arguments as in list_roster)"""
+        with self._lock:
+            self._refresh()
+            entries = list(self._entries.values())
+
+        if character_class is not None:
+            entries = [e for e in entries if e[1] == character_class]
+        if min_level is not None:
+            entries = [e for e in entries if e[2] >= min_level]
+        if max_level is not None:
+            entries = [e for e in entries if e[2] <= max_level]
+        if saved_since is not None:
+            entries = [e for e in entries if e[3] >= saved_since]
+
+        if sort == "level":
+            key = lambda e: (-e[2], e[0])
+        elif sort == "recent":
+            key = lambda e: (-e[3], e[0])
+        else:
+            key = lambda e: e[0]
+        if limit is None:
+            entries = sorted(entries, key=key)[offset:]
+        else:
+            # Only the first offset + limit entries need to be ordered
+            entries = heapq.nsmallest(offset + limit, entries, key=key)[offset:]
+        return [dict(zip(ROSTER_FIELDS, entry)) for entry in entries]
+
+class TextFileStorage:
+    """
+    Save backend with one {name}_save.dat file per character
+    
+    Text saves from before the binary format ({name}_save.txt) are
+    still read; the next save replaces them with a .dat file.
+    
+    Saves and deletes keep the directory's RosterIndex up to date, so
+    listing characters never scans the directory.
+    
+    Each character has a {name}_save.lock file next to its save. Reads
+    hold a shared flock on it and writes/deletes an exclusive one, so
+    worker processes sharing a directory never interleave on a save.
+    (The save itself can't be locked: os.replace swaps its inode.)
+    delete() removes the lock file while holding its lock; _file_lock
+    notices and relocks anyone who was waiting on the removed file.
+    """
+    SUFFIX = "_save.dat"
+    LEGACY_SUFFIX = "_save.txt"
+    LOCK_SUFFIX = "_save.lock"
+
+    def __init__(self, save_directory="data/save_games"):
+        self.save_directory = save_directory
+        self.roster = RosterIndex.for_directory(save_directory)
+        self.lock_timeout = SAVE_LOCK_TIMEOUT
+
+    def path_for(self, name):
+        return os.path.join(self.save_directory, f"{name}{self.SUFFIX}")
+
+    def legacy_path_for(self, name):
+        return os.path.join(self.save_directory, f"{name}{self.LEGACY_SUFFIX}")
+
+    def _existing_path(self, name):
+        """Path of name's save file (current or legacy), None if there is none"""
+        for path in (self.path_for(name), self.legacy_path_for(name)):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _remove_legacy(self, name):
+        """Drop name's text save once a binary save has replaced it"""
+        try:
+            os.remove(self.legacy_path_for(name))
+        except FileNotFoundError:
+            pass
+
+    def lock_path_for(self, name):
+        return os.path.join(self.save_directory, f"{name}{self.LOCK_SUFFIX}")
+
+    def lock(self, name, exclusive=True):
+        """
+        Context manager holding name's save lock
+        
+        Raises: SaveLockTimeoutError after lock_timeout seconds
+        """
+        return _file_lock(self.lock_path_for(name), exclusive, self.lock_timeout)
+
+    def write(self, name, text, durability=None, expected_version=None):
+        """
+        Raises: StaleSaveError if expected_version doesn't match the
+                stored save, SaveLockTimeoutError
+        """
+        os.makedirs(self.save_directory, exist_ok=True)
+        with self.lock(name):
+            self._write_locked(name, text, durability, expected_version)
+        self.roster.record([(name, text)])
+
+    def _write_locked(self, name, text, durability, expected_version=None):
+        if expected_version is not None:
+            try:
+                current = self._read_locked(name)
+            except CharacterNotFoundError:
+                current = None
+            _check_save_version(name, current, expected_version)
+        write_file_atomically(self.path_for(name), text, durability)
+        self._remove_legacy(name)
+
+    def write_many(self, saves, durability=None):
+        """
+        Write (name, text) pairs from a thread pool
+        
+        With DURABILITY_DIR the directory is synced once for the whole
+        batch rather than once per file.
+        
+        Returns: Dict of name -> exception for the writes that failed
+        """
+        os.makedirs(self.save_directory, exist_ok=True)
+        if durability is None:
+            durability = DEFAULT_DURABILITY
+        file_durability = DURABILITY_FILE if durability == DURABILITY_DIR else durability
+
+        def write(save):
+            name, text = save
+            try:
+                with self.lock(name):
+                    self._write_locked(name, text, file_durability)
+            except Exception as e:
+                return save, e
+            return save, None
+
+        errors = {}
+        written = []
+        with ThreadPoolExecutor(BATCH_IO_WORKERS) as pool:
+            for save, error in pool.map(write, saves):
+                if error is None:
+                    written.append(save)
+                else:
+                    errors[save[0]] = error
+        if durability == DURABILITY_DIR:
+            _fsync_directory(self.save_directory)
+        self.roster.record(written)
+        return errors
+
+    def read(self, name):
+        """
+        Raises: CharacterNotFoundError, SaveFileCorruptedError,
+                SaveLockTimeoutError
+        """
+        if self._existing_path(name) is None:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        with self.lock(name, exclusive=False):
+            return self._read_locked(name)
+
+    def _read_locked(self, name):
+        for path in (self.path_for(name), self.legacy_path_for(name)):
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                continue
+            except Exception:
+                raise SaveFileCorruptedError("Save file exists but cannot be read.")
+        raise CharacterNotFoundError(f"Character '{name}' not found.")
+
+    def read_many(self, names):
+        """
+        Read many saves from a thread pool
+        
+        Returns: (texts, errors) - dicts of name -> text and
+                 name -> CharacterNotFoundError/SaveFileCorruptedError
+        """
+        def read(name):
+            try:
+                return name, self.read(name), None
+            except (CharacterNotFoundError, SaveFileCorruptedError) as e:
+                return name, None, e
+
+        texts, errors = {}, {}
+        with ThreadPoolExecutor(BATCH_IO_WORKERS) as pool:
+            for name, text, error in pool.map(read, names):
+                if error is None:
+                    texts[name] = text
+                else:
+                    errors[name] = error
+        return texts, errors
+
+    def list_names(self):
+        return self.roster.names()
+
+    def list_roster(self, *args):
+        return self.roster.query(*args)
+
+    def delete(self, name):
+        """
+        Raises: CharacterNotFoundError
+        """
+        if self._existing_path(name) is None:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        with self.lock(name):
+            self._delete_locked(name)
+            try:
+                os.remove(self.lock_path_for(name))
+            except FileNotFoundError:
+                pass
+        self.roster.forget(name)
+
+    def _delete_locked(self, name):
+        removed = False
+        for path in (self.path_for(name), self.legacy_path_for(name)):
+            try:
+                os.remove(path)
+                removed = True
+            except FileNotFoundError:
+                pass
+        if not removed:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+
+    def close(self):
+        pass
+
+    # Two storages for the same directory are interchangeable
+    def __eq__(self, other):
+        return (type(other) is type(self)
+                and os.path.abspath(other.save_directory) == os.path.abspath(self.save_directory))
+
+    def __hash__(self):
+        return hash((type(self), os.path.abspath(self.save_directory)))
+
+class SQLiteStorage:
+    """
+    Save backend keeping every character in a single SQLite database
+    
+    The database runs in WAL mode; statements are parameterized, so
+    sqlite3 reuses the compiled statements, and write_many() commits a
+    whole batch in one transaction. The DURABILITY_* levels map onto
+    SQLite's synchronous setting.
+    """
+    _SYNCHRONOUS = {DURABILITY_NONE: "OFF", DURABILITY_FILE: "NORMAL", DURABILITY_DIR: "FULL"}
+
+    def __init__(self, db_path="data/save_games/saves.db", durability=None):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._synchronous = None
+        try:
+            # Autocommit; batches open their own transaction
+            self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS characters ("
+                " name TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " saved_at REAL NOT NULL,"
+                " class TEXT,"
+                " level INTEGER NOT NULL DEFAULT 0,"
+                " size INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._add_roster_columns()
+            for column in ("class", "level", "saved_at"):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS characters_{column} ON characters ({column})")
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Cannot open save database: {db_path}") from e
+        self._set_durability(durability)
+
+    def _add_roster_columns(self):
+        """Upgrade databases created before the roster columns existed"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(characters)")}
+        if "class" in columns:
+            return
+        self._conn.execute("BEGIN")
+        self._conn.execute("ALTER TABLE characters ADD COLUMN class TEXT")
+        self._conn.execute("ALTER TABLE characters ADD COLUMN level INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("ALTER TABLE characters ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        rows = self._conn.execute("SELECT name, data FROM characters").fetchall()
+        self._conn.executemany(
+            "UPDATE characters SET class = ?, level = ?, size = ? WHERE name = ?",
+            ((*summarize_save(data), _save_size(data), name) for name, data in rows),
+        )
+        self._conn.execute("COMMIT")
+
+    def _set_durability(self, durability):
+        if durability is None:
+            durability = DEFAULT_DURABILITY
+        synchronous = self._SYNCHRONOUS[durability]
+        if synchronous != self._synchronous:
+            self._conn.execute(f"PRAGMA synchronous={synchronous}")
+            self._synchronous = synchronous
+
+    def write(self, name, data, durability=None, expected_version=None):
+        """
+        Raises: StaleSaveError if expected_version doesn't match the
+                stored save
+        """
+        if expected_version is None:
+            self.write_many([(name, data)], durability)
+            return
+        with self._lock:
+            self._set_durability(durability)
+            # IMMEDIATE takes the write lock before the version is read
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT data FROM characters WHERE name = ?", (name,)).fetchone()
+                _check_save_version(name, row and row[0], expected_version)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO characters"
+                    " (name, data, saved_at, class, level, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, data, time.time(), *summarize_save(data), _save_size(data)),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def write_many(self, saves, durability=None):
+        """
+        Write (name, text) pairs in a single transaction
+        
+        Returns: Empty dict (the batch is written as a whole)
+        Raises: sqlite3.Error after rolling back if any write fails
+        """
+        now = time.time()
+        with self._lock:
+            self._set_durability(durability)
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO characters"
+                    " (name, data, saved_at, class, level, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((name, data, now, *summarize_save(data), _save_size(data))
+                     for name, data in saves),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return {}
+
+    def read(self, name):
+        """
+        Raises: CharacterNotFoundError, SaveFileCorruptedError
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM characters WHERE name = ?", (name,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError("Save database cannot be read.") from e
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        return row[0]
+
+    # SQLite's default limit on ? parameters in one statement
+    _MAX_VARIABLES = 999
+
+    def read_many(self, names):
+        """
+        Read many saves with one query per 999 names
+        
+        Returns: (texts, errors) - dicts of name -> text and
+                 name -> CharacterNotFoundError
+        Raises: SaveFileCorruptedError if the database cannot be read
+        """
+        names = list(names)
+        texts = {}
+        try:
+            with self._lock:
+                for start in range(0, len(names), self._MAX_VARIABLES):
+                    chunk = names[start:start + self._MAX_VARIABLES]
+                    marks = ",".join("?" * len(chunk))
+                    texts.update(self._conn.execute(
+                        f"SELECT name, data FROM characters WHERE name IN ({marks})", chunk))
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError("Save database cannot be read.") from e
+        errors = {name: CharacterNotFoundError(f"Character '{name}' not found.")
+                  for name in names if name not in texts}
+        return texts, errors
+
+    def list_names(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM characters ORDER BY name")]
+
+    _ROSTER_ORDER = {"name": "name", "level": "level DESC, name", "recent": "saved_at DESC, name"}
+
+    def list_roster(self, character_class=None, min_level=None, max_level=None,
+                    saved_since=None, sort="name", offset=0, limit=None):
+        """Filter, sort and page the roster with one indexed query"""
+        where, params = [], []
+        for clause, value in (("class = ?", character_class), ("level >= ?", min_level),
+                              ("level <= ?", max_level), ("saved_at >= ?", saved_since)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = "SELECT name, class, level, saved_at, size FROM characters"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {self._ROSTER_ORDER[sort]} LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(ROSTER_FIELDS, row)) for row in rows]
+
+    def delete(self, name):
+        """
+        Raises: CharacterNotFoundError
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM characters WHERE name = ?", (name,))
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def diff_save_records(old, new):
+    """
+    Describe the change from save record old to new
+    
+    Dict fields (inventory, cooldowns, ...) are diffed key by key and
+    lists that only grew (completed quests) record just the new items.
+    
+    Returns: None if nothing changed, else a delta
+             (changed, removed, dict_patches, list_appends) for
+             apply_save_delta, with None for empty parts
+    """
+    changed, dict_patches, list_appends = {}, {}, {}
+    for field, value in new.items():
+        if field not in old:
+            changed[field] = value
+            continue
+        previous = old[field]
+        if type(previous) is type(value) and previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            items = {key: item for key, item in value.items()
+                     if key not in previous or previous[key] != item}
+            dropped = tuple(key for key in previous if key not in value)
+            dict_patches[field] = (items, dropped)
+        elif (isinstance(previous, list) and isinstance(value, list)
+              and len(value) > len(previous) and value[:len(previous)] == previous):
+            list_appends[field] = value[len(previous):]
+        else:
+            changed[field] = value
+    removed = tuple(field for field in old if field not in new)
+
+    if not (changed or removed or dict_patches or list_appends):
+        return None
+    return changed or None, removed or None, dict_patches or None, list_appends or None
+
+def apply_save_delta(record, delta):
+    """Apply a diff_save_records delta to record in place"""
+    changed, removed, dict_patches, list_appends = delta
+    record.update(changed or ())
+    for field in removed or ():
+        record.pop(field, None)
+    for field, (items, dropped) in (dict_patches or {}).items():
+        value = dict(record[field])
+        value.update(items)
+        for key in dropped:
+            value.pop(key, None)
+        record[field] = value
+    for field, items in (list_appends or {}).items():
+        record[field] = record[field] + items
+
+class _JournalState:
+    """What a JournaledTextStorage knows about one character's files"""
+    __slots__ = ("record", "snapshot", "journal_size", "entries", "stamp")
+
+    def __init__(self, record, snapshot, journal_size=0, entries=0):
+        self.record = record              # current save record
+        self.snapshot = snapshot          # (size, crc32) of the snapshot file
+        self.journal_size = journal_size  # bytes of valid journal
+        self.entries = entries            # delta entries in the journal
+        self.stamp = None                 # file stats when last read/written
+
+class JournaledTextStorage(TextFileStorage):
+    """
+    Text backend that appends small deltas instead of rewriting saves
+    
+    Each save is diffed against the character's last saved state and
+    only the change is appended to {name}_save.journal; {name}_save.dat
+    becomes a snapshot. After compact_after entries, or once the
+    journal would grow past MAX_JOURNAL_RATIO times the snapshot, the
+    full save is written as a new snapshot and the journal removed. Reads replay snapshot +
+    journal.
+    
+    The journal header holds the size and CRC32 of the snapshot it
+    extends, so a journal left over from an interrupted compaction is
+    ignored. Each entry is length-prefixed with a CRC32, so a torn last
+    append is dropped on replay and overwritten by the next one.
+    
+    Saved states are cached (STATE_CACHE_SIZE characters). A cached
+    state is re-read if the files' stats show another process wrote
+    them; the save lock is held while checking. Use for_directory() to
+    share one storage, and so one cache, per directory.
+    """
+    JOURNAL_SUFFIX = "_save.journal"
+    JOURNAL_MAGIC = b"QCJL"
+    _JOURNAL_HEADER = struct.Struct("<4sII")  # magic, snapshot size, snapshot crc32
+    _JOURNAL_ENTRY = struct.Struct("<II")     # payload size, payload crc32
+    DEFAULT_COMPACT_AFTER = 64
+    MAX_JOURNAL_RATIO = 2
+    STATE_CACHE_SIZE = 1024
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, save_directory, compact_after=None):
+        """
+        The shared storage for save_directory (keyed by its real path)
+        
+        compact_after only applies when the storage is first created.
+        """
+        key = os.path.realpath(save_directory)
+        with cls._instances_lock:
+            storage = cls._instances.get(key)
+            if storage is None:
+                storage = cls._instances[key] = cls(save_directory, compact_after)
+            return storage
+
+    def __init__(self, save_directory="data/save_games", compact_after=None):
+        super().__init__(save_directory)
+        self.compact_after = compact_after or self.DEFAULT_COMPACT_AFTER
+        self.bytes_written = 0  # snapshot + journal bytes, for benchmarks
+        self._states = OrderedDict()
+        self._lock = threading.RLock()
+
+    def journal_path(self, name):
+        return os.path.join(self.save_directory, f"{name}{self.JOURNAL_SUFFIX}")
+
+    def _stamp(self, name):
+        """Stats that change whenever name's snapshot or journal is written"""
+        path = self._existing_path(name)
+        try:
+            st = os.stat(path or self.path_for(name))
+        except FileNotFoundError:
+            return None
+        try:
+            journal = os.stat(self.journal_path(name))
+            journal = (journal.st_ino, journal.st_size)
+        except FileNotFoundError:
+            journal = None
+        return st.st_ino, st.st_size, st.st_mtime_ns, journal
+
+    def _state(self, name):
+        """
+        Cached or replayed state of name's save (call with its lock held)
+        
+        Raises: CharacterNotFoundError, SaveFileCorruptedError,
+                InvalidSaveDataError
+        """
+        stamp = self._stamp(name)
+        state = self._states.get(name)
+        if state is not None and state.stamp == stamp:
+            self._states.move_to_end(name)
+            return state
+
+        snapshot = self._read_locked(name)
+        state = _JournalState(self._current_record(snapshot),
+                              (len(snapshot), zlib.crc32(snapshot)))
+        self._replay(name, state)
+        state.stamp = stamp
+
+        self._states[name] = state
+        if len(self._states) > self.STATE_CACHE_SIZE:
+            self._states.popitem(last=False)
+        return state
+
+    @staticmethod
+    def _current_record(data):
+        """Save record of data, migrated to SAVE_FORMAT_VERSION"""
+        version, record = read_save_record(data)
+        if version != SAVE_FORMAT_VERSION:
+            record = _record_from_character(decode_character(data))
+        return record
+
+    def _replay(self, name, state):
+        """Apply the journal entries that belong to state's snapshot"""
+        try:
+            with open(self.journal_path(name), "rb") as f:
+                journal = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            raise SaveFileCorruptedError("Save journal cannot be read.") from e
+
+        header = self._JOURNAL_HEADER
+        if len(journal) < header.size:
+            return
+        magic, size, crc = header.unpack_from(journal)
+        if magic != self.JOURNAL_MAGIC or (size, crc) != state.snapshot:
+            return  # stale: written against an older snapshot
+
+        offset, entry = header.size, self._JOURNAL_ENTRY
+        while offset + entry.size <= len(journal):
+            length, crc = entry.unpack_from(journal, offset)
+            start = offset + entry.size
+            payload = journal[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break  # torn append
+            try:
+                apply_save_delta(state.record, decode_save_value(payload))
+            except (ValueError, TypeError, KeyError) as e:
+                raise InvalidSaveDataError("Save journal is incorrectly formatted.") from e
+            offset = start + length
+            state.entries += 1
+        state.journal_size = offset
+
+    def write(self, name, data, durability=None, expected_version=None):
+        """
+        Raises: StaleSaveError if expected_version doesn't match the
+                stored save, SaveLockTimeoutError
+        """
+        if durability is None:
+            durability = DEFAULT_DURABILITY
+        record = self._current_record(data)
+        os.makedirs(self.save_directory, exist_ok=True)
+        with self._lock, self.lock(name):
+            try:
+                state = self._state(name)
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                state = None
+            if expected_version is not None:
+                found = 0 if state is None else state.record.get("save_version", 0)
+                if found != expected_version:
+                    raise StaleSaveError(
+                        f"Save for '{name}' is at version {found}, "
+                        f"expected {expected_version}; reload and retry.")
+            self._write_locked_state(name, data, record, state, durability)
+        self.roster.record([(name, data)])
+
+    def _write_locked_state(self, name, data, record, state, durability):
+        """Append a delta if the journal has room, else write a snapshot"""
+        if state is not None and state.entries < self.compact_after:
+            delta = diff_save_records(state.record, record)
+            if delta is None:
+                return
+            payload = encode_save_value(delta)
+            entry_size = self._JOURNAL_ENTRY.size + len(payload)
+            if state.journal_size + entry_size <= self.MAX_JOURNAL_RATIO * state.snapshot[0]:
+                self._append(name, state, payload, durability)
+                state.record = record
+                state.stamp = self._stamp(name)
+                return
+        self._write_snapshot(name, data, record, durability)
+
+    def _append(self, name, state, payload, durability):
+        path = self.journal_path(name)
+        entry = self._JOURNAL_ENTRY.pack(len(payload), zlib.crc32(payload)) + payload
+        new_file = state.journal_size == 0
+        if new_file:
+            entry = self._JOURNAL_HEADER.pack(self.JOURNAL_MAGIC, *state.snapshot) + entry
+        with open(path, "wb" if new_file else "r+b") as f:
+            f.seek(state.journal_size)
+            f.write(entry)
+            f.truncate()  # drop a torn entry left behind by a crash
+            if durability != DURABILITY_NONE:
+                f.flush()
+                os.fsync(f.fileno())
+        if new_file and durability == DURABILITY_DIR:
+            _fsync_directory(self.save_directory)
+        state.journal_size += len(entry)
+        state.entries += 1
+        self.bytes_written += len(entry)
+
+    def _write_snapshot(self, name, data, record, durability):
+        """Write a full save and drop the journal it replaces"""
+        write_file_atomically(self.path_for(name), data, durability)
+        self._remove_legacy(name)
+        self.bytes_written += len(data)
+        try:
+            os.remove(self.journal_path(name))
+        except FileNotFoundError:
+            pass
+        state = _JournalState(record, (len(data), zlib.crc32(data)))
+        state.stamp = self._stamp(name)
+        self._states[name] = state
+        self._states.move_to_end(name)
+        if len(self._states) > self.STATE_CACHE_SIZE:
+            self._states.popitem(last=False)
+
+    def write_many(self, saves, durability=None):
+        """
+        Write (name, data) pairs one after another (appends are small)
+        
+        Returns: Dict of name -> exception for the writes that failed
+        """
+        errors = {}
+        for name, data in saves:
+            try:
+                self.write(name, data, durability)
+            except Exception as e:
+                errors[name] = e
+        return errors
+
+    def read(self, name):
+        """
+        Raises: CharacterNotFoundError, SaveFileCorruptedError,
+                InvalidSaveDataError, SaveLockTimeoutError
+        """
+        if self._existing_path(name) is None:
+            raise CharacterNotFoundError(f"Character '{name}' not found.")
+        with self._lock, self.lock(name, exclusive=False):
+            return encode_save_record(self._state(name).record)
+
+    def compact(self, name, durability=None):
+        """Fold name's journal into a new snapshot now"""
+        with self._lock, self.lock(name):
+            record = self._state(name).record
+            self._write_snapshot(name, encode_save_record(record), record, durability)
+
+    def delete(self, name):
+        with self._lock:
+            super().delete(name)
+
+    def _delete_locked(self, name):
+        self._states.pop(name, None)
+        super()._delete_locked(name)
+        try:
+            os.remove(self.journal_path(name))
+        except FileNotFoundError:
+            pass
+
+# Backend used when no save_directory is passed; created on first use
+_storage = None
+
+def configure_storage(backend=None, path=None, durability=None, compact_after=None):
+    """
+    Choose where characters are saved when no save_directory is given
+    
+    Args:
+        backend: "text" (one file per character), "journal" (text
+                 snapshots plus append-only deltas) or "sqlite";
+                 defaults to the QC_SAVE_BACKEND environment variable,
+                 else "text"
+        path: Save directory (text/journal) or database file (sqlite);
+              defaults to QC_SAVE_PATH, else data/save_games or
+              data/save_games/saves.db
+        durability: Default DURABILITY_* level for the sqlite backend
+        compact_after: Journal entries before a new snapshot is written
+                       (journal backend)
+    
+    Returns: The new storage backend
+    Raises: ValueError for an unknown backend
+    """
+    global _storage
+    backend = backend or os.environ.get("QC_SAVE_BACKEND", "text")
+    path = path or os.environ.get("QC_SAVE_PATH")
+
+    if backend == "text":
+        storage = TextFileStorage(path or "data/save_games")
+    elif backend == "journal":
+        storage = JournaledTextStorage.for_directory(path or "data/save_games", compact_after)
+    elif backend == "sqlite":
+        storage = SQLiteStorage(path or "data/save_games/saves.db", durability)
+    else:
+        raise ValueError(f"Unknown save backend: {backend}")
+
+    # Finish writes queued for the old backend before switching
+    flush_saves()
+    old, _storage = _storage, storage
+    if old is not None:
+        old.close()
+    return storage
+
+def get_storage(save_directory=None):
+    """
+    Storage for save_directory, or the configured backend if it is None
+    
+    An explicit save_directory uses the journal backend if that is the
+    configured one (shared per directory, see for_directory), otherwise
+    the plain text backend.
+    """
+    if save_directory is not None:
+        if isinstance(_storage, JournaledTextStorage):
+            return JournaledTextStorage.for_directory(save_directory, _storage.compact_after)
+        return TextFileStorage(save_directory)
+    if _storage is None:
+        configure_storage()
+    return _storage
 
 # ============================================================================
 # CHARACTER OPERATIONS
@@ -244,6 +2261,7 @@ def gain_experience(character, xp_amount):
         raise CharacterDeadError("Cannot gain XP while dead!")
 
     character["experience"] += xp_amount
+    old_level = character["level"]
 
     while character["experience"] >= character["level"] * 100:
         character["experience"] -= character["level"] * 100
@@ -253,6 +2271,11 @@ def gain_experience(character, xp_amount):
         character["magic"] += 2
         character["health"] = character["max_health"]
 
+    # Let an attached quest tracker unlock level-gated quests
+    tracker = character.get("quest_tracker")
+    if tracker is not None and character["level"] != old_level:
+        tracker.level_changed(character)
+
     return character
 
 def add_gold(character, amount):
@@ -315,6 +2338,42 @@ def revive_character(character):
         print('That Death was temporary, but be more careful next time!')
         return True
 
+def format_inventory(inventory):
+    """
+    Format an inventory for the save file as "item:count,item:count"
+    """
+    counts = inventory.counts() if isinstance(inventory, Inventory) else _count_items(inventory)
+    return ",".join(f"{item_id}:{count}" for item_id, count in counts.items())
+
+def _count_items(items):
+    """{item_id: count} for a plain list of item ids"""
+    counts = {}
+    for item_id in items:
+        counts[item_id] = counts.get(item_id, 0) + 1
+    return counts
+
+def parse_inventory(value):
+    """
+    Parse a saved inventory into an Inventory
+    
+    Accepts the compact "item:count" form and the older flat
+    "item1,item1,item2" form (or a mix of both).
+    
+    Raises: ValueError if a count is not an integer
+    """
+    counts = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        item_id, sep, count = entry.rpartition(":")
+        if sep:
+            count = int(count)
+        else:
+            item_id, count = entry, 1
+        counts[item_id] = counts.get(item_id, 0) + count
+    return Inventory.from_counts(counts)
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -351,13 +2410,212 @@ def validate_character_data(character):
         if not isinstance(character[n], int):
             raise InvalidSaveDataError(f"Invalid numeric field: {n}")
 
-    lists = ["inventory", "active_quests", "completed_quests"]
+    if not isinstance(character["inventory"], (list, Inventory)):
+        raise InvalidSaveDataError("Invalid list field: inventory")
+
+    lists = ["active_quests", "completed_quests"]
     for l in lists:
-        if not isinstance(character[l], list):
+        if not isinstance(character[l], (list, QuestLog)):
             raise InvalidSaveDataError(f"Invalid list field: {l}")
 
     return True
 
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def benchmark_save_durability(count=200):
+    """Measure saves per second at each durability level"""
+    import time
+
+    character = create_character("BenchHero", "Warrior")
+    with tempfile.TemporaryDirectory() as tmp:
+        for durability in DURABILITY_LEVELS:
+            start = time.perf_counter()
+            for i in range(count):
+                character["gold"] = i
+                save_character(character, tmp, durability=durability)
+            elapsed = time.perf_counter() - start
+            print(f"{durability:>4}: {count / elapsed:,.0f} saves/sec")
+
+def benchmark_storage_backends(counts=(10000, 100000), durability=DURABILITY_NONE):
+    """Compare save/load/list throughput of the text and SQLite backends"""
+    template = create_character("BenchHero", "Warrior")
+
+    for count in counts:
+        names = [f"hero_{i}" for i in range(count)]
+        saves = [(name, serialize_character(dict(template, name=name))) for name in names]
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = (
+                ("text", TextFileStorage(os.path.join(tmp, "text"))),
+                ("sqlite", SQLiteStorage(os.path.join(tmp, "saves.db"))),
+            )
+            for label, storage in backends:
+                start = time.perf_counter()
+                for name, data in saves:
+                    storage.write(name, data, durability)
+                save_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                listed = storage.list_names()
+                list_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                for name in names[::10]:
+                    decode_character(storage.read(name))
+                load_time = time.perf_counter() - start
+
+                print(f"{count:>7} {label:>6}: save {count / save_time:,.0f}/s, "
+                      f"load {len(names[::10]) / load_time:,.0f}/s, "
+                      f"list {len(listed)} in {list_time * 1000:.0f}ms")
+                if isinstance(storage, SQLiteStorage):
+                    start = time.perf_counter()
+                    storage.write_many(saves)
+                    batch_time = time.perf_counter() - start
+                    print(f"{count:>7} {label:>6}: batched save {count / batch_time:,.0f}/s")
+                storage.close()
+
+def benchmark_batch_saves(count=2000, durability=DURABILITY_FILE):
+    """Time a load -> grant gold -> save pass, one at a time vs batched"""
+    global _storage
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = (
+            ("text", TextFileStorage(os.path.join(tmp, "text"))),
+            ("sqlite", SQLiteStorage(os.path.join(tmp, "saves.db"), durability)),
+        )
+        for label, storage in backends:
+            previous, _storage = _storage, storage
+            try:
+                names = [f"hero_{i}" for i in range(count)]
+                save_characters((create_character(name, "Warrior") for name in names),
+                                durability=durability)
+
+                start = time.perf_counter()
+                for name in names:
+                    character = load_character(name)
+                    character["gold"] += 10
+                    save_character(character, durability=durability)
+                single = time.perf_counter() - start
+
+                start = time.perf_counter()
+                characters, _ = load_characters(names)
+                for character in characters.values():
+                    character["gold"] += 10
+                save_characters(characters.values(), durability=durability)
+                batched = time.perf_counter() - start
+
+                print(f"{label:>6}: one at a time {single * 1000:.0f}ms, "
+                      f"batched {batched * 1000:.0f}ms ({single / batched:.1f}x)")
+            finally:
+                _storage = previous
+                storage.close()
+
+def benchmark_roster(count=100000):
+    """Compare roster queries with scanning and reading every save file"""
+    classes = ("Warrior", "Mage", "Rogue", "Cleric")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = TextFileStorage(tmp)
+        saves = []
+        for i in range(count):
+            character = create_character(f"hero_{i}", classes[i % 4])
+            character["level"] = i % 50 + 1
+            saves.append((character["name"], serialize_character(character)))
+        storage.write_many(saves, DURABILITY_NONE)
+
+        start = time.perf_counter()
+        scanned = []
+        for file in os.listdir(tmp):
+            if file.endswith(TextFileStorage.SUFFIX):
+                with open(os.path.join(tmp, file), "rb") as f:
+                    character_class, level = summarize_save(f.read())
+                if character_class == "Mage" and level >= 40:
+                    scanned.append(file)
+        scan_time = time.perf_counter() - start
+
+        RosterIndex._instances.clear()
+        start = time.perf_counter()
+        storage = TextFileStorage(tmp)
+        storage.list_names()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        page = storage.list_roster("Mage", 40, None, None, "level", 0, 50)
+        query_time = time.perf_counter() - start
+
+        print(f"{count} characters: directory scan {scan_time * 1000:.0f}ms, "
+              f"roster load {load_time * 1000:.0f}ms, "
+              f"filtered page of {len(page)} in {query_time * 1000:.1f}ms "
+              f"({len(scanned)} matches)")
+
+def benchmark_save_formats(count=20000):
+    """Compare size and decode speed of text and binary saves"""
+    character = create_character("BenchHero", "Warrior")
+    for i in range(20):
+        character["inventory"].add(f"item_{i}", 2)
+        character["completed_quests"].append(f"quest_{i}")
+    text = serialize_character_text(character).encode("utf-8")
+    data = serialize_character(character)
+
+    for label, saved in (("text", text), ("binary", data)):
+        start = time.perf_counter()
+        for _ in range(count):
+            decode_character(saved)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>6}: {len(saved)} bytes, {elapsed / count * 1e6:.1f}us per load")
+
+def benchmark_save_journal(actions=2000, compact_after=(16, 64, 256), seed=163):
+    """Compare bytes written per action, and time replay of the journal"""
+    import random
+    rng = random.Random(seed)
+    character = create_character("BenchHero", "Warrior")
+    for i in range(20):
+        character["inventory"].add(f"item_{i}", 2)
+        character["completed_quests"].append(f"quest_{i}")
+
+    # A session of small changes like game_loop makes
+    session = []
+    for i in range(actions):
+        roll = rng.random()
+        if roll < 0.5:
+            character["gold"] += rng.randint(1, 20)
+        elif roll < 0.8:
+            character["health"] = rng.randint(1, character["max_health"])
+        elif roll < 0.95:
+            character["inventory"].append(f"item_{rng.randint(0, 30)}")
+        else:
+            character["completed_quests"].append(f"bench_quest_{i}")
+        session.append(serialize_character(character))
+
+    full = sum(len(data) for data in session)
+    print(f"full rewrites: {full / actions:.0f} bytes/action")
+    for limit in compact_after:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = JournaledTextStorage(tmp, limit)
+            start = time.perf_counter()
+            for data in session:
+                storage.write("BenchHero", data, DURABILITY_NONE)
+            save_time = time.perf_counter() - start
+            print(f"journal, compact_after={limit:>3}: "
+                  f"{storage.bytes_written / actions:.0f} bytes/action "
+                  f"({full / storage.bytes_written:.0f}x less), "
+                  f"{save_time / actions * 1e6:.0f}us/save")
+
+    # Replay cost: load with an ever longer journal
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JournaledTextStorage(tmp, compact_after=max(compact_after))
+        storage.MAX_JOURNAL_RATIO = float("inf")
+        storage.write("BenchHero", session[0], DURABILITY_NONE)
+        written = 0
+        for entries in (0, 16, 64, 256):
+            for data in session[written + 1:entries + 1]:
+                storage.write("BenchHero", data, DURABILITY_NONE)
+            written = max(written, entries)
+            start = time.perf_counter()
+            for _ in range(200):
+                decode_character(JournaledTextStorage(tmp).read("BenchHero"))
+            elapsed = (time.perf_counter() - start) / 200
+            print(f"load with {entries:>3} journal entries: {elapsed * 1e6:.0f}us")
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -388,3 +2646,21 @@ if __name__ == "__main__":
     #     print("Character not found")
     # except SaveFileCorruptedError:
     #     print("Save file corrupted")
+
+    # Compare save throughput at each durability level
+    # benchmark_save_durability()
+
+    # Compare the text-file and SQLite save backends
+    # benchmark_storage_backends()
+
+    # Compare per-character and batched load/save passes
+    # benchmark_batch_saves()
+
+    # Compare roster queries with a directory scan
+    # benchmark_roster()
+
+    # Compare text and binary save formats
+    # benchmark_save_formats()
+
+    # Compare full rewrites with journal mode
+    # benchmark_save_journal()
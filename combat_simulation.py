@@ -0,0 +1,399 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat Simulation Module
+
+Name: [Your Name Here]
+
+AI Usage: [Document any AI assistance used]
+
+This module runs large numbers of headless battles for balance analysis:
+win rates, turns-to-kill and remaining-health distributions for every
+class, enemy and level. With NumPy installed a whole batch of battles is
+played at once as arrays; without it each battle is played through
+SimpleBattle.
+"""
+
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:  # simulations fall back to looping SimpleBattle
+    np = None
+
+from character_manager import CHARACTER_CLASSES, create_character, gain_experience
+from combat_system import (
+    SimpleBattle,
+    ScriptedPolicy,
+    RandomPolicy,
+    GreedyPolicy,
+    CLERIC_HEAL_AMOUNT,
+    ENEMY_MISS_PERCENT,
+    ESCAPE_PERCENT,
+    CRIT_PERCENT,
+    create_enemy,
+    damage_table,
+    enemy_types,
+    get_random_enemy_for_level
+)
+
+# Player policies a simulation can use. "fight" only ever attacks.
+POLICIES = {
+    "fight": lambda: ScriptedPolicy([]),
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy
+}
+
+# Battles still going after this many rounds are counted as unfinished
+MAX_TURNS = 1000
+
+# Battles per shard in simulate_battles. Shard i of a run always gets
+# the same seed, so results do not depend on the number of workers.
+SHARD_SIZE = 50000
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def character_for_level(character_class, level=1):
+    """
+    Build a fresh character of the given class, levelled up to level
+
+    Uses gain_experience, so stats follow the real level-up rules.
+
+    Raises: InvalidCharacterClassError if the class is not recognized
+    """
+    character = create_character("Sim", character_class)
+    gain_experience(character, sum(lvl * 100 for lvl in range(1, level)))
+    return character
+
+def simulate_matchup(character_class, enemy_type, level=1, battles=100000,
+                     policy="greedy", seed=0, vectorized=None):
+    """
+    Play many battles of one class and level against one enemy type
+
+    vectorized chooses the NumPy engine (default: when NumPy is installed).
+    Results are reproducible for a given seed and engine.
+
+    Returns: Summary dictionary (see summarize_tallies)
+    Raises: InvalidCharacterClassError / InvalidTargetError for unknown
+            classes or enemies, ValueError for an unknown policy
+    """
+    return summarize_tallies(_simulate_tallies(character_class, enemy_type, level, battles,
+                                               policy, seed, vectorized))
+
+def simulate_battles(config, n, workers=None, on_progress=None):
+    """
+    Shard n battles across a process pool and merge the results
+
+    config is a dictionary with:
+        character_class (required), level (default 1),
+        enemy_type (default: get_random_enemy_for_level's pick for level,
+                    drawn with random.Random(seed)),
+        policy (default "greedy"), seed (default 0; must not be negative),
+        vectorized (default: when NumPy is installed),
+        shard_size (default SHARD_SIZE)
+
+    Each shard has a fixed seed derived from config's seed and the shard
+    number, so the merged result is the same for any worker count.
+
+    Args:
+        workers: Number of worker processes (defaults to the CPU count;
+                 1 simulates in the current process)
+        on_progress: Optional callable given the merged summary so far
+                     each time a shard finishes
+
+    Returns: Summary dictionary for all n battles (see summarize_tallies)
+    Raises: InvalidCharacterClassError, InvalidTargetError, ValueError
+            (also for a negative seed)
+    """
+    character_class = config['character_class']
+    level = config.get('level', 1)
+    seed = config.get('seed', 0)
+    if seed < 0:
+        raise ValueError(f"Simulation seed must not be negative: {seed}")
+    enemy_type = (config.get('enemy_type')
+                  or get_random_enemy_for_level(level, random.Random(seed))['type'])
+    policy = config.get('policy', "greedy")
+    vectorized = config.get('vectorized')
+    shard_size = config.get('shard_size', SHARD_SIZE)
+
+    # Fail here rather than in every worker
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown simulation policy: {policy}")
+    character_for_level(character_class, level)
+    create_enemy(enemy_type)
+
+    shards = [(character_class, enemy_type, level, min(shard_size, n - start),
+               policy, _shard_seed(seed, shard), vectorized)
+              for shard, start in enumerate(range(0, n, shard_size))]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(shards)))
+
+    total = new_tallies()
+    if workers == 1:
+        for shard in shards:
+            merge_tallies(total, _simulate_tallies(*shard))
+            if on_progress is not None:
+                on_progress(summarize_tallies(total))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_simulate_tallies, *shard) for shard in shards]
+            for future in as_completed(futures):
+                merge_tallies(total, future.result())
+                if on_progress is not None:
+                    on_progress(summarize_tallies(total))
+    return summarize_tallies(total)
+
+def simulate_balance_table(levels=(1, 5, 10), battles=100000, policy="greedy",
+                           seed=0, vectorized=None):
+    """
+    Simulate every class x enemy x level combination
+
+    Returns: Dictionary mapping (class, enemy_type, level) to a summary
+    """
+    table = {}
+    for character_class in CHARACTER_CLASSES:
+        for enemy_type in enemy_types():
+            for level in levels:
+                table[(character_class, enemy_type, level)] = simulate_matchup(
+                    character_class, enemy_type, level, battles, policy, seed, vectorized)
+    return table
+
+def new_tallies():
+    """Empty tallies for a batch of battles"""
+    return {'battles': 0, 'wins': 0, 'losses': 0, 'escapes': 0, 'unfinished': 0,
+            'turns_to_kill': {}, 'hp_left': {}}
+
+def merge_tallies(total, part):
+    """
+    Add one batch's tallies into total (counts and histograms)
+
+    Returns: total
+    """
+    for key in ('battles', 'wins', 'losses', 'escapes', 'unfinished'):
+        total[key] += part[key]
+    for key in ('turns_to_kill', 'hp_left'):
+        histogram = total[key]
+        for value, count in part[key].items():
+            histogram[value] = histogram.get(value, 0) + count
+    return total
+
+def summarize_tallies(tallies):
+    """
+    Add rates and means to raw tallies
+
+    turns_to_kill and hp_left are histograms ({value: battles}) over the
+    battles the player won.
+
+    Returns: Copy of tallies with win_rate, loss_rate, escape_rate,
+             mean_turns_to_kill and mean_hp_left added
+    """
+    summary = dict(tallies)
+    summary['turns_to_kill'] = dict(sorted(tallies['turns_to_kill'].items()))
+    summary['hp_left'] = dict(sorted(tallies['hp_left'].items()))
+    battles = tallies['battles'] or 1
+    wins = tallies['wins']
+    summary['win_rate'] = tallies['wins'] / battles
+    summary['loss_rate'] = tallies['losses'] / battles
+    summary['escape_rate'] = tallies['escapes'] / battles
+    summary['mean_turns_to_kill'] = (
+        sum(t * n for t, n in tallies['turns_to_kill'].items()) / wins if wins else None)
+    summary['mean_hp_left'] = (
+        sum(hp * n for hp, n in tallies['hp_left'].items()) / wins if wins else None)
+    return summary
+
+def _shard_seed(seed, shard):
+    """Seed for one shard of a simulate_battles run"""
+    return (seed << 32) | shard
+
+def _simulate_tallies(character_class, enemy_type, level, battles, policy, seed, vectorized):
+    """Raw tallies for one batch of battles (also the simulate_battles worker)"""
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown simulation policy: {policy}")
+    character = character_for_level(character_class, level)
+    enemy = create_enemy(enemy_type)
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        if np is None:
+            raise ImportError("The vectorized simulator needs NumPy")
+        return _simulate_arrays(character, enemy, battles, policy, seed)
+    return _simulate_loop(character, enemy, battles, policy, seed)
+
+def _simulate_loop(character, enemy, battles, policy, seed):
+    """Play battles one at a time through SimpleBattle"""
+    rng = random.Random(seed)
+    make_policy = POLICIES[policy]
+    tallies = new_tallies()
+    turns_to_kill = Counter()
+    hp_left = Counter()
+    for _ in range(battles):
+        hero = dict(character, cooldowns={})
+        battle = SimpleBattle(hero, dict(enemy), make_policy(), rng=rng)
+        winner = battle.run()
+        if winner == 'player':
+            tallies['wins'] += 1
+            turns_to_kill[battle.turn_counter] += 1
+            hp_left[hero['health']] += 1
+        elif winner == 'enemy':
+            tallies['losses'] += 1
+        else:
+            tallies['escapes'] += 1
+    tallies['battles'] = battles
+    tallies['turns_to_kill'] = dict(turns_to_kill)
+    tallies['hp_left'] = dict(hp_left)
+    return tallies
+
+def _choice_masks(u, weights):
+    """Split uniform rolls u into one mask per action, as random.choices does"""
+    total = sum(weights.values())
+    masks = {}
+    low = 0
+    for action, weight in weights.items():
+        masks[action] = (u * total >= low) & (u * total < low + weight)
+        low += weight
+    return masks
+
+def _simulate_arrays(character, enemy, battles, policy, seed):
+    """
+    Play all battles at once as NumPy arrays
+
+    Each round runs player_turn, check_battle_end, enemy_turn and the
+    cooldown tick for every battle still going; finished battles are
+    tallied and dropped from the arrays.
+    """
+    rng = np.random.default_rng(seed)
+    table = damage_table(character, enemy)
+    char_class = character['class'].strip().lower()
+    cooldown_length = SimpleBattle.ABILITY_COOLDOWNS.get(char_class, 0)
+    max_hp = character['max_health']
+
+    hp = np.full(battles, character['health'], dtype=np.int64)
+    enemy_hp = np.full(battles, enemy['health'], dtype=np.int64)
+    cooldown = np.zeros(battles, dtype=np.int64)
+    turns_to_kill = np.zeros(MAX_TURNS + 1, dtype=np.int64)
+    hp_left = np.zeros(max_hp + 1, dtype=np.int64)
+    tallies = new_tallies()
+    tallies['battles'] = battles
+
+    turn = 0
+    while hp.size and turn < MAX_TURNS:
+        turn += 1
+        n = hp.size
+        ready = cooldown <= 0 if cooldown_length else np.zeros(n, dtype=bool)
+
+        # Player action
+        if policy == "greedy":
+            special = ready
+            if char_class == 'cleric':
+                special = ready & (max_hp - hp >= CLERIC_HEAL_AMOUNT)
+            run = np.zeros(n, dtype=bool)
+        elif policy == "random":
+            weights = RandomPolicy.DEFAULT_WEIGHTS
+            u = rng.random(n)
+            with_special = _choice_masks(u, weights)
+            without = _choice_masks(u, {a: w for a, w in weights.items() if a != "special"})
+            special = ready & with_special["special"]
+            run = np.where(ready, with_special["run"], without["run"])
+        else:
+            special = np.zeros(n, dtype=bool)
+            run = special
+
+        damage = np.where(special | run, 0, table['attack'])
+        if char_class == 'rogue':
+            crit = rng.random(n) < CRIT_PERCENT / 100
+            damage = np.where(special, np.where(crit, table['crit'], table['special']), damage)
+        elif char_class == 'cleric':
+            hp = np.where(special, hp + np.minimum(CLERIC_HEAL_AMOUNT, max_hp - hp), hp)
+        elif cooldown_length:
+            damage = np.where(special, table['special'], damage)
+        cooldown = np.where(special, cooldown_length, cooldown)
+        enemy_hp = np.maximum(enemy_hp - damage, 0)
+
+        won = enemy_hp <= 0
+        escaped = run & (rng.random(n) < ESCAPE_PERCENT / 100)
+        going = ~(won | escaped)
+
+        # Enemy turn
+        hit = going & (rng.random(n) >= ENEMY_MISS_PERCENT / 100)
+        hp = np.where(hit, np.maximum(hp - table['enemy_attack'], 0), hp)
+        lost = going & (hp <= 0)
+        going &= ~lost
+
+        wins = int(won.sum())
+        tallies['wins'] += wins
+        tallies['losses'] += int(lost.sum())
+        tallies['escapes'] += int(escaped.sum())
+        turns_to_kill[turn] += wins
+        if wins:
+            hp_left += np.bincount(hp[won], minlength=max_hp + 1)
+
+        hp, enemy_hp = hp[going], enemy_hp[going]
+        cooldown = np.maximum(cooldown[going] - 1, 0)
+
+    tallies['unfinished'] = int(hp.size)
+    tallies['turns_to_kill'] = {t: int(c) for t, c in enumerate(turns_to_kill) if c}
+    tallies['hp_left'] = {h: int(c) for h, c in enumerate(hp_left) if c}
+    return tallies
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def benchmark_simulation(battles=1000000, loop_battles=20000, enemy_type="orc", seed=22):
+    """Compare battles per second of the array engine and the SimpleBattle loop"""
+    import time
+    for character_class in CHARACTER_CLASSES:
+        start = time.perf_counter()
+        summary = simulate_matchup(character_class, enemy_type, 1, loop_battles,
+                                   seed=seed, vectorized=False)
+        loop_rate = loop_battles / (time.perf_counter() - start)
+        line = (f"{character_class:>8} vs {enemy_type}: loop {loop_rate:,.0f} battles/s "
+                f"(win {summary['win_rate']:.1%})")
+        if np is not None:
+            start = time.perf_counter()
+            summary = simulate_matchup(character_class, enemy_type, 1, battles,
+                                       seed=seed, vectorized=True)
+            elapsed = time.perf_counter() - start
+            line += (f", arrays {battles:,} in {elapsed:.2f}s "
+                     f"= {battles / elapsed:,.0f} battles/s (win {summary['win_rate']:.1%})")
+        print(line)
+
+def benchmark_simulation_farm(battles=4000000, worker_counts=(1, 2, 4), seed=23):
+    """Time simulate_battles with different numbers of worker processes"""
+    import time
+    config = {'character_class': "Rogue", 'level': 3, 'policy': "random", 'seed': seed}
+    if np is None:
+        battles //= 100
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        summary = simulate_battles(config, battles, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers} worker(s): {battles:,} battles in {elapsed:.2f}s "
+              f"({baseline / elapsed:.1f}x), win rate {summary['win_rate']:.4%}")
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== COMBAT SIMULATION TEST ===")
+
+    # Win rates for one matchup
+    # summary = simulate_matchup("Warrior", "orc", level=1, battles=10000)
+    # print(f"Win rate: {summary['win_rate']:.1%}, "
+    #       f"turns to kill: {summary['mean_turns_to_kill']:.1f}")
+
+    # Array engine vs SimpleBattle loop
+    # benchmark_simulation()
+
+    # Process pool scaling
+    # benchmark_simulation_farm()
@@ -9,8 +9,12 @@ AI Usage: [Document any AI assistance used]
 Handles combat mechanics
 """
 
+import os
 import random
-from copy import deepcopy
+from bisect import bisect_right
+from functools import lru_cache
+from collections import namedtuple
+from collections.abc import Mapping
 
 from custom_exceptions import (
     InvalidTargetError,
@@ -18,49 +22,25 @@ from custom_exceptions import (
     CharacterDeadError,
     AbilityOnCooldownError
 )
+from game_data import DATA_DIR, load_enemies
+
+# Percent chances of the battle's random rolls (randint(1, 100))
+ENEMY_MISS_PERCENT = 5    # enemy_turn misses
+ESCAPE_PERCENT = 50       # attempt_escape succeeds
+CRIT_PERCENT = 50         # rogue_critical_strike triples its damage
 
 # ============================================================================
 # ENEMY DEFINITIONS
 # ============================================================================
 
-_ENEMY_TEMPLATES = {
-    "goblin": {
-        'name': 'Goblin',
-        'type': 'goblin',
-        'health': 50,
-        'max_health': 50,
-        'strength': 8,
-        'magic': 2,
-        'xp_reward': 25,
-        'gold_reward': 10
-    },
-    "orc": {
-        'name': 'Orc',
-        'type': 'orc',
-        'health': 80,
-        'max_health': 80,
-        'strength': 12,
-        'magic': 5,
-        'xp_reward': 50,
-        'gold_reward': 25
-    },
-    "dragon": {
-        'name': 'Dragon',
-        'type': 'dragon',
-        'health': 200,
-        'max_health': 200,
-        'strength': 25,
-        'magic': 15,
-        'xp_reward': 200,
-        'gold_reward': 100
-    }
-}
+# Default enemy catalog, in the game data directory
+ENEMIES_FILE = os.path.join(DATA_DIR, "enemies.txt")
 
 def create_enemy(enemy_type):
     """
     Create an enemy based on type
     
-    Example enemy types and stats:
+    Enemy types and stats come from data/enemies.txt, for example:
     - goblin: health=50, strength=8, magic=2, xp_reward=25, gold_reward=10
     - orc: health=80, strength=12, magic=5, xp_reward=50, gold_reward=25
     - dragon: health=200, strength=25, magic=15, xp_reward=200, gold_reward=100
@@ -71,29 +51,245 @@ def create_enemy(enemy_type):
     # TODO: Implement enemy creation
     # Return dictionary with: name, health, max_health, strength, magic, xp_reward, gold_reward
     key = enemy_type.strip().lower()
-    if key not in _ENEMY_TEMPLATES:
+    templates = get_enemy_pool().templates
+    if key not in templates:
         raise InvalidTargetError(f"Unknown enemy type: {enemy_type}")
-    return deepcopy(_ENEMY_TEMPLATES[key])
+    # Templates only hold numbers and strings, so a shallow copy is enough
+    return dict(templates[key])
+
+def enemy_types():
+    """
+    Every enemy type create_enemy accepts
+    
+    Returns: List of enemy type strings
+    """
+    return list(get_enemy_pool().templates)
 
-def get_random_enemy_for_level(character_level):
+def get_random_enemy_for_level(character_level, rng=None):
     """
     Get an appropriate enemy for character's level
     
-    Level 1-2: Goblins
-    Level 3-5: Orcs
-    Level 6+: Dragons
+    Enemies and their level ranges come from data/enemies.txt
+    (by default goblins at level 1-2, orcs at 3-5, dragons at 6+);
+    when several fit the level one is picked by WEIGHT, using rng
+    (a random.Random; default: the random module).
     
     Returns: Enemy dictionary
+    Raises: InvalidTargetError if no enemy fits the level
     """
     # TODO: Implement level-appropriate enemy selection
     # Use if/elif/else to select enemy type
     # Call create_enemy with appropriate type
-    if character_level <= 2:
-        return create_enemy("goblin")
-    elif character_level <= 5:
-        return create_enemy("orc")
-    else:
-        return create_enemy("dragon")
+    return dict(get_enemy_pool().choose(max(1, character_level), rng))
+
+# ============================================================================
+# ENEMY SPAWNING
+# ============================================================================
+
+class Enemy(Mapping):
+    """
+    Spawned enemy: a shared template plus its own health
+    
+    Reads like the dictionaries from create_enemy (enemy['strength'],
+    enemy.get('name')), so SimpleBattle and the special abilities accept
+    it. Only 'health' can be assigned; every other field belongs to the
+    template that all enemies of the type share.
+    """
+    __slots__ = ("template", "health")
+
+    def __init__(self, template, health=None):
+        self.template = template
+        self.health = template['health'] if health is None else health
+
+    def __getitem__(self, key):
+        if key == 'health':
+            return self.health
+        return self.template[key]
+
+    def __setitem__(self, key, value):
+        if key != 'health':
+            raise TypeError(f"Enemy field '{key}' is shared by its template")
+        self.health = value
+
+    def __iter__(self):
+        return iter(self.template)
+
+    def __len__(self):
+        return len(self.template)
+
+    def __repr__(self):
+        return f"Enemy({self.template['type']!r}, health={self.health})"
+
+class EnemyPool:
+    """
+    Level-bucketed enemy catalog for spawning many enemies at once
+    
+    The catalog is split at every level where the set of eligible
+    enemies changes. Each bucket has a precomputed alias table, so a
+    weighted pick costs one random number and two list lookups however
+    many enemies share the level.
+    """
+
+    def __init__(self, enemies):
+        """
+        Args:
+            enemies: {enemy_id: record} as returned by game_data.load_enemies
+        """
+        self.templates = {enemy_id: _template_from_record(record)
+                          for enemy_id, record in enemies.items()}
+        starts = {record['min_level'] for record in enemies.values()}
+        starts.update(record['max_level'] + 1 for record in enemies.values()
+                      if record['max_level'] is not None)
+        self._starts = sorted(starts)
+        self._buckets = []
+        for start in self._starts:
+            eligible = [enemy_id for enemy_id, record in enemies.items()
+                        if record['min_level'] <= start
+                        and (record['max_level'] is None or start <= record['max_level'])]
+            if not eligible:
+                self._buckets.append(None)
+                continue
+            prob, alias = build_alias_table([enemies[e]['weight'] for e in eligible])
+            self._buckets.append((tuple(self.templates[e] for e in eligible), prob, alias))
+
+    def _bucket(self, level):
+        idx = bisect_right(self._starts, level) - 1
+        bucket = self._buckets[idx] if idx >= 0 else None
+        if bucket is None:
+            raise InvalidTargetError(f"No enemies for level {level}")
+        return bucket
+
+    def enemy_types(self, level):
+        """
+        Enemy types that can spawn at level
+        
+        Returns: List of enemy ids (empty if none)
+        """
+        try:
+            templates = self._bucket(level)[0]
+        except InvalidTargetError:
+            return []
+        return [template['type'] for template in templates]
+
+    def choose(self, level, rng=None):
+        """
+        Pick a weighted random template for level
+        
+        No random number is drawn when only one enemy fits the level.
+        
+        Returns: Shared template dictionary (copy it before changing it)
+        Raises: InvalidTargetError if no enemy fits the level
+        """
+        templates, prob, alias = self._bucket(level)
+        if len(templates) == 1:
+            # Nothing to pick; leave the random stream untouched
+            return templates[0]
+        u = (rng or random).random() * len(templates)
+        idx = int(u)
+        if u - idx >= prob[idx]:
+            idx = alias[idx]
+        return templates[idx]
+
+    def spawn(self, level, rng=None):
+        """
+        Spawn one enemy for level
+        
+        Returns: Enemy
+        Raises: InvalidTargetError if no enemy fits the level
+        """
+        template = self.choose(level, rng)
+        return Enemy(template, template['health'])
+
+    def spawn_batch(self, level, n, rng=None):
+        """
+        Spawn n enemies for level
+        
+        Returns: List of Enemy objects
+        Raises: InvalidTargetError if no enemy fits the level
+        """
+        templates, prob, alias = self._bucket(level)
+        if len(templates) == 1:
+            template = templates[0]
+            return [Enemy(template, template['health']) for _ in range(n)]
+        rand = (rng or random).random
+        size = len(templates)
+        enemies = []
+        append = enemies.append
+        for _ in range(n):
+            u = rand() * size
+            idx = int(u)
+            if u - idx >= prob[idx]:
+                idx = alias[idx]
+            template = templates[idx]
+            append(Enemy(template, template['health']))
+        return enemies
+
+# Loaded EnemyPools by absolute catalog path (see get_enemy_pool)
+_enemy_pools = {}
+
+def get_enemy_pool(filename=None):
+    """
+    EnemyPool for an enemy catalog file, loaded once per process
+    
+    The default catalog is ENEMIES_FILE. create_enemy, enemy_types,
+    get_random_enemy_for_level and pick_enemy all read it.
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    path = os.path.abspath(filename or ENEMIES_FILE)
+    pool = _enemy_pools.get(path)
+    if pool is None:
+        pool = _enemy_pools[path] = EnemyPool(load_enemies(path))
+    return pool
+
+def spawn_batch(level, n, rng=None):
+    """
+    Spawn n enemies for level from the default enemy catalog
+    
+    Returns: List of Enemy objects
+    Raises: InvalidTargetError if no enemy fits the level
+    """
+    return get_enemy_pool().spawn_batch(level, n, rng)
+
+def build_alias_table(weights):
+    """
+    Build a Walker/Vose alias table for weighted picks in constant time
+    
+    To pick index i with chance weights[i] / sum(weights): take
+    u = random() * n, idx = int(u); keep idx if u - idx < prob[idx],
+    otherwise use alias[idx].
+    
+    Returns: Tuple (prob, alias) of lists
+    """
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [weight * n / total for weight in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        low = small.pop()
+        high = large.pop()
+        prob[low] = scaled[low]
+        alias[low] = high
+        scaled[high] -= 1.0 - scaled[low]
+        (small if scaled[high] < 1.0 else large).append(high)
+    # Whatever is left over (rounding) keeps prob 1.0
+    return prob, alias
+
+def _template_from_record(record):
+    """Enemy dictionary, shaped like create_enemy's, for a catalog record"""
+    return {
+        'name': record['name'],
+        'type': record['enemy_id'],
+        'health': record['health'],
+        'max_health': record['health'],
+        'strength': record['strength'],
+        'magic': record['magic'],
+        'xp_reward': record['xp_reward'],
+        'gold_reward': record['gold_reward']
+    }
 
 # ============================================================================
 # COMBAT SYSTEM
@@ -104,6 +300,13 @@ class SimpleBattle:
     Simple turn-based combat system
     
     Manages combat between character and enemy
+    
+    By default the battle is interactive: the player's actions come
+    from input() and events are printed. Passing a policy (see
+    ScriptedPolicy, RandomPolicy, GreedyPolicy) makes it headless:
+    events go to event_sink if given (a callable taking a BattleEvent)
+    and are dropped otherwise. All randomness comes from rng, so a
+    seeded random.Random replays a battle exactly.
     """
     ABILITY_COOLDOWNS = {
         "warrior": 3,
@@ -112,7 +315,7 @@ class SimpleBattle:
         "cleric": 5
     }
     
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, policy=None, event_sink=None, rng=None):
         """Initialize battle with character and enemy"""
         # TODO: Implement initialization
         # Store character and enemy
@@ -123,8 +326,20 @@ class SimpleBattle:
         self.combat_active = True
         self.turn_counter = 0
 
+        if policy is None:
+            policy = InputPolicy()
+            if event_sink is None:
+                event_sink = console_event_sink
+        self.policy = policy
+        self.event_sink = event_sink
+        self.rng = rng if rng is not None else random
+
         if 'cooldowns' not in self.character:
             self.character['cooldowns'] = {}
+
+    def _emit(self, kind, message):
+        if self.event_sink is not None:
+            self.event_sink(BattleEvent(kind, self.turn_counter, message))
     
     def start_battle(self):
         """
@@ -142,18 +357,33 @@ class SimpleBattle:
         if self.character.get('health', 0) <= 0:
             raise CharacterDeadError("Light Yagami got to you.")
 
-        display_battle_log(f"Battle start: {self.character.get('name','You')} vs {self.enemy.get('name','Enemy')}")
+        final = self.run()
+        if final == 'player':
+            rewards = get_victory_rewards(self.enemy)
+            self._emit("victory", f"Victory! Gained {rewards['xp']} XP and {rewards['gold']} gold.")
+            return {'winner': 'player', 'xp_gained': rewards['xp'], 'gold_gained': rewards['gold']}
+        elif final == 'enemy':
+            raise CharacterDeadError("Plays Mario Bros Death Tune")
+        else:
+            # e.g., player ran away
+            return {'winner': 'none', 'xp_gained': 0, 'gold_gained': 0}
+
+    def run(self):
+        """
+        Play rounds until the battle ends, without rewards or exceptions
+        for a loss (start_battle adds those)
+        
+        Returns: 'player', 'enemy' or 'none' (the player escaped)
+        """
+        self._emit("start", f"Battle start: {self.character.get('name','You')} vs {self.enemy.get('name','Enemy')}")
 
         while self.combat_active:
             self.turn_counter += 1
-            display_combat_stats(self.character, self.enemy)
-
-            # Player turn
-            try:
-                self.player_turn()
-            except AbilityOnCooldownError:
-                # bubble up so caller can catch if desired; re-raise for clarity
-                raise
+            if self.event_sink is not None:
+                self._emit("status", format_combat_stats(self.character, self.enemy))
+
+            # Player turn; AbilityOnCooldownError bubbles up to the caller
+            self.player_turn()
             winner = self.check_battle_end()
             if winner:
                 self.combat_active = False
@@ -169,22 +399,13 @@ class SimpleBattle:
             # End of round: decrement cooldowns
             self._decrement_cooldowns()
 
-        final = self.check_battle_end()
-        if final == 'player':
-            rewards = get_victory_rewards(self.enemy)
-            display_battle_log(f"Victory! Gained {rewards['xp']} XP and {rewards['gold']} gold.")
-            return {'winner': 'player', 'xp_gained': rewards['xp'], 'gold_gained': rewards['gold']}
-        elif final == 'enemy':
-            raise CharacterDeadError("Plays Mario Bros Death Tune")
-        else:
-            # e.g., player ran away
-            return {'winner': 'none', 'xp_gained': 0, 'gold_gained': 0}
+        return self.check_battle_end()
 
     def player_turn(self):
         """
         Handle player's turn
         
-        Displays options:
+        Options (chosen by the battle's policy):
         1. Basic Attack
         2. Special Ability (if available)
         3. Try to Run
@@ -199,20 +420,32 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("Combat is not active.")
 
-        # Simple interactive prompt; acceptable for assignment usage
-        action = input("\nBro What You Wanna  Do?: [fight] [special] [item] [run] > ").strip().lower()
+        action = self.policy.choose_action(self)
+        self.perform_action(action)
+
+    def special_ready(self):
+        """True if the character has a special ability off cooldown"""
+        char_class = self.character.get('class', '').strip().lower()
+        return (char_class in self.ABILITY_COOLDOWNS
+                and self.character['cooldowns'].get('special', 0) <= 0)
 
+    def perform_action(self, action):
+        """
+        Carry out a player action: fight, special, item or run
+        
+        Raises: AbilityOnCooldownError if special is still cooling down
+        """
         if action in ('fight', 'f'):
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
-            display_battle_log(f"You hit the {self.enemy['name']} for {damage} damage.")
+            self._emit("player", f"You hit the {self.enemy['name']} for {damage} damage.")
             return
 
         elif action in ('special', 's'):
             # Determine class and ability name
             char_class = self.character.get('class', '').strip().lower()
             if char_class not in self.ABILITY_COOLDOWNS:
-                display_battle_log("You have no special ability.")
+                self._emit("player", "You have no special ability.")
                 return
 
             # Check cooldown
@@ -221,28 +454,28 @@ class SimpleBattle:
                 raise AbilityOnCooldownError(f"Special ability on cooldown ({remaining} turns left).")
 
             # Use ability
-            result_msg = use_special_ability(self.character, self.enemy)
+            result_msg = use_special_ability(self.character, self.enemy, self.rng)
             # Set cooldown
             self.character['cooldowns']['special'] = self.ABILITY_COOLDOWNS[char_class]
-            display_battle_log(result_msg)
+            self._emit("player", result_msg)
             return
 
         elif action in ('item', 'i'):
             # Placeholder for item logic; keep gameable
-            display_battle_log("You might have been robbed cause you have nothing useful..")
+            self._emit("player", "You might have been robbed cause you have nothing useful..")
             return
 
         elif action in ('run', 'r'):
             if self.attempt_escape():
-                display_battle_log("You successfully escaped the battle.")
+                self._emit("escape", "You successfully escaped the battle.")
                 # Mark as ended without XP/gold
                 self.combat_active = False
             else:
-                display_battle_log("Oh It has something for that ass!!!")
+                self._emit("player", "Oh It has something for that ass!!!")
             return
 
         else:
-            display_battle_log("Womp Womp! \n FuFu go get the Lion!")
+            self._emit("player", "Womp Womp! \n FuFu go get the Lion!")
             return
 
     
@@ -262,13 +495,13 @@ class SimpleBattle:
             raise CombatNotActiveError("Combat is not active.")
 
         # small miss chance for flavor
-        if random.randint(1, 100) <= 5:
-            display_battle_log(f"The {self.enemy['name']} missed its attack!")
+        if self.rng.randint(1, 100) <= ENEMY_MISS_PERCENT:
+            self._emit("enemy", f"The {self.enemy['name']} missed its attack!")
             return
 
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"The {self.enemy['name']} attacked you for {damage} damage!")
+        self._emit("enemy", f"The {self.enemy['name']} attacked you for {damage} damage!")
     
     def calculate_damage(self, attacker, defender):
         """
@@ -320,7 +553,7 @@ class SimpleBattle:
         # TODO: Implement escape attempt
         # Use random number or simple calculation
         # If successful, set combat_active to False
-        return random.randint(1, 100) > 50
+        return self.rng.randint(1, 100) > 100 - ESCAPE_PERCENT
     
     def _decrement_cooldowns(self):
         """Decrement ability cooldowns at end of turn"""
@@ -330,11 +563,82 @@ class SimpleBattle:
                 if self.character['cooldowns'][ability] == 0:
                     del self.character['cooldowns'][ability]
 
+# ============================================================================
+# BATTLE POLICIES AND EVENTS
+# ============================================================================
+
+# One thing that happened in a battle. kind is start, status, player,
+# enemy, escape or victory; turn is the round number (0 before round 1)
+BattleEvent = namedtuple("BattleEvent", ["kind", "turn", "message"])
+
+def console_event_sink(event):
+    """Print battle events the way interactive battles always have"""
+    if event.kind == "status":
+        print(event.message)
+    else:
+        display_battle_log(event.message)
+
+class InputPolicy:
+    """Asks the player for each action with input() (interactive battles)"""
+
+    def choose_action(self, battle):
+        # Simple interactive prompt; acceptable for assignment usage
+        return input("\nBro What You Wanna  Do?: [fight] [special] [item] [run] > ").strip().lower()
+
+class ScriptedPolicy:
+    """Plays a fixed list of actions, then `default` for the rest of the battle"""
+
+    def __init__(self, actions, default="fight"):
+        self.actions = list(actions)
+        self.default = default
+        self._next = 0
+
+    def choose_action(self, battle):
+        if self._next < len(self.actions):
+            self._next += 1
+            return self.actions[self._next - 1]
+        return self.default
+
+class RandomPolicy:
+    """
+    Picks a random available action
+    
+    weights maps action -> weight; special is only picked when ready.
+    Uses the battle's rng unless given its own.
+    """
+    DEFAULT_WEIGHTS = {"fight": 6, "special": 3, "run": 1}
+
+    def __init__(self, weights=None, rng=None):
+        self.weights = dict(weights or self.DEFAULT_WEIGHTS)
+        self.rng = rng
+
+    def choose_action(self, battle):
+        rng = self.rng or battle.rng
+        actions = [a for a in self.weights if a != "special" or battle.special_ready()]
+        return rng.choices(actions, [self.weights[a] for a in actions])[0]
+
+class GreedyPolicy:
+    """
+    Uses the special ability whenever it beats a basic attack
+    
+    Clerics heal only when missing at least the heal amount; every
+    other class uses its ability as soon as it is ready.
+    """
+
+    def choose_action(self, battle):
+        if not battle.special_ready():
+            return "fight"
+        character = battle.character
+        if character.get('class', '').strip().lower() == "cleric":
+            missing = character.get('max_health', 0) - character.get('health', 0)
+            return "special" if missing >= CLERIC_HEAL_AMOUNT else "fight"
+        return "special"
+
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=None):
     """
     Use character's class-specific special ability
     
@@ -344,6 +648,8 @@ def use_special_ability(character, enemy):
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
     
+    rng supplies randomness (Critical Strike); defaults to the random module.
+    
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
@@ -361,7 +667,7 @@ def use_special_ability(character, enemy):
         dmg = mage_fireball(character, enemy)
         return f"{name} cast Fireball on {enemy['name']} for {dmg} damage!"
     elif char_class == 'rogue':
-        dmg, crit = rogue_critical_strike(character, enemy)
+        dmg, crit = rogue_critical_strike(character, enemy, rng)
         if crit:
             return f"{name} landed a CRITICAL STRIKE on {enemy['name']} for {dmg} damage!"
         return f"{name} used Critical Strike on {enemy['name']} for {dmg} damage."
@@ -394,12 +700,12 @@ def mage_fireball(character, enemy):
     enemy['health'] = max(0, enemy.get('health', 0) - damage)
     return damage
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=None):
     """Rogue special ability"""
     # TODO: Implement critical strike
     # 50% chance for triple damage
     base = int(character.get('strength', 0))
-    crit = random.randint(1, 100) <= 50
+    crit = (rng or random).randint(1, 100) <= CRIT_PERCENT
     if crit:
         raw = base * 3 - (enemy.get('strength', 0) // 2)
     else:
@@ -408,17 +714,193 @@ def rogue_critical_strike(character, enemy):
     enemy['health'] = max(0, enemy.get('health', 0) - damage)
     return damage, crit
 
+CLERIC_HEAL_AMOUNT = 30
+
 def cleric_heal(character):
     """Cleric special ability"""
     # TODO: Implement healing
     # Restore 30 HP (not exceeding max_health)
-    heal_amount = 30
+    heal_amount = CLERIC_HEAL_AMOUNT
     current = int(character.get('health', 0))
     max_hp = int(character.get('max_health', current))
     actual = max(0, min(heal_amount, max_hp - current))
     character['health'] = current + actual
     return actual
 
+class _FixedRoll:
+    """Stands in for an rng whose randint always returns the same value"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def randint(self, low, high):
+        return self.value
+
+def damage_table(character, enemy):
+    """
+    Damage of each action in one matchup, using the formulas above
+    
+    Returns: Dictionary with attack, enemy_attack, special and crit damage
+             (special is the non-critical hit for rogues; 0 for clerics)
+    """
+    battle = SimpleBattle(dict(character, cooldowns={}), dict(enemy), ScriptedPolicy([]))
+    table = {'attack': battle.calculate_damage(character, enemy),
+             'enemy_attack': battle.calculate_damage(enemy, character),
+             'special': 0, 'crit': 0}
+    char_class = character['class'].strip().lower()
+    target = dict(enemy, health=10 ** 9)
+    if char_class == 'warrior':
+        table['special'] = warrior_power_strike(character, target)
+    elif char_class == 'mage':
+        table['special'] = mage_fireball(character, target)
+    elif char_class == 'rogue':
+        table['special'] = rogue_critical_strike(character, target, _FixedRoll(100))[0]
+        table['crit'] = rogue_critical_strike(character, target, _FixedRoll(1))[0]
+    return table
+
+# ============================================================================
+# EXPECTED OUTCOMES
+# ============================================================================
+
+# Player policies expected_outcome can solve for
+OUTCOME_POLICIES = ("greedy", "optimal")
+
+def expected_outcome(character, enemy, policy="greedy"):
+    """
+    Exact odds of a battle, without simulating it
+    
+    Dynamic programming over (player health, enemy health, cooldown)
+    at the start of each round. Rounds follow SimpleBattle: the player
+    acts, then the enemy attacks and misses ENEMY_MISS_PERCENT of the
+    time. "greedy" plays like GreedyPolicy; "optimal" picks fight or
+    special, whichever wins more often. Solved states are cached per
+    matchup, so repeat queries are dictionary lookups.
+    
+    Returns: Dictionary with win_probability, loss_probability,
+             expected_turns, expected_xp and expected_gold
+    Raises: CharacterDeadError if character is already dead,
+            ValueError for an unknown policy
+    """
+    if policy not in OUTCOME_POLICIES:
+        raise ValueError(f"Unknown outcome policy: {policy}")
+    if character.get('health', 0) <= 0:
+        raise CharacterDeadError("Light Yagami got to you.")
+
+    solve = _outcome_solver(
+        character.get('class', '').strip().lower(), int(character.get('max_health', 0)),
+        int(character.get('strength', 0)), int(character.get('magic', 0)),
+        int(enemy.get('strength', 0)), int(enemy.get('magic', 0)), policy)
+    cooldown = character.get('cooldowns', {}).get('special', 0)
+    win, turns = solve(int(character['health']), int(enemy.get('health', 0)), cooldown)
+    rewards = get_victory_rewards(dict(enemy, health=0))
+    return {'win_probability': win, 'loss_probability': 1.0 - win,
+            'expected_turns': turns,
+            'expected_xp': win * rewards['xp'], 'expected_gold': win * rewards['gold']}
+
+def pick_enemy(character, min_win_probability=0.9, policy="greedy"):
+    """
+    Choose the enemy type worth the most XP that character should beat
+    
+    Only enemies the catalog spawns at the character's level are
+    considered (see get_random_enemy_for_level). Falls back to the one
+    with the best odds if none reaches min_win_probability.
+    
+    Returns: Enemy type (an enemy id from the catalog)
+    Raises: InvalidTargetError if no enemy fits the level
+    """
+    pool = get_enemy_pool()
+    level = max(1, int(character.get('level', 1)))
+    odds = {}
+    for enemy_type in pool.enemy_types(level):
+        odds[enemy_type] = expected_outcome(character, pool.templates[enemy_type], policy)
+    if not odds:
+        raise InvalidTargetError(f"No enemies for level {level}")
+    safe = [t for t in odds if odds[t]['win_probability'] >= min_win_probability]
+    if safe:
+        return max(safe, key=lambda t: odds[t]['expected_xp'])
+    return max(odds, key=lambda t: odds[t]['win_probability'])
+
+@lru_cache(maxsize=256)
+def _outcome_solver(char_class, max_hp, strength, magic, enemy_strength, enemy_magic, policy):
+    """
+    Build the memoized state function for one matchup
+    
+    Returns: solve(hp, enemy_hp, cooldown) -> (win probability,
+             expected rounds until the battle ends)
+    """
+    table = damage_table(
+        {'class': char_class, 'strength': strength, 'magic': magic},
+        {'name': 'Enemy', 'strength': enemy_strength, 'magic': enemy_magic})
+    cooldown_length = SimpleBattle.ABILITY_COOLDOWNS.get(char_class, 0)
+    miss = ENEMY_MISS_PERCENT / 100
+    crit = CRIT_PERCENT / 100
+
+    solved = {}
+    missing = []
+
+    def state(hp, enemy_hp, cooldown):
+        # Solved odds of a round start; unsolved ones are queued in missing
+        result = solved.get((hp, enemy_hp, cooldown))
+        if result is None:
+            missing.append((hp, enemy_hp, cooldown))
+            return 0.0, 0.0
+        return result
+
+    def enemy_phase(hp, enemy_hp, cooldown):
+        # Odds from just after the player's action
+        if enemy_hp <= 0:
+            return 1.0, 1.0
+        cooldown = max(0, cooldown - 1)
+        missed = state(hp, enemy_hp, cooldown)
+        hit_hp = hp - table['enemy_attack']
+        hit = state(hit_hp, enemy_hp, cooldown) if hit_hp > 0 else (0.0, 0.0)
+        return (miss * missed[0] + (1 - miss) * hit[0],
+                1.0 + miss * missed[1] + (1 - miss) * hit[1])
+
+    def use_special(hp, enemy_hp):
+        if char_class == 'cleric':
+            return enemy_phase(min(max_hp, hp + CLERIC_HEAL_AMOUNT), enemy_hp, cooldown_length)
+        normal = enemy_phase(hp, enemy_hp - table['special'], cooldown_length)
+        if char_class != 'rogue':
+            return normal
+        critical = enemy_phase(hp, enemy_hp - table['crit'], cooldown_length)
+        return (crit * critical[0] + (1 - crit) * normal[0],
+                crit * critical[1] + (1 - crit) * normal[1])
+
+    def round_odds(hp, enemy_hp, cooldown):
+        attack = enemy_phase(hp, enemy_hp - table['attack'], cooldown)
+        if not cooldown_length or cooldown > 0:
+            return attack
+        if policy == "greedy":
+            if char_class == 'cleric' and max_hp - hp < CLERIC_HEAL_AMOUNT:
+                return attack
+            return use_special(hp, enemy_hp)
+        special = use_special(hp, enemy_hp)
+        # Best win probability; fewer rounds breaks ties
+        return max(attack, special, key=lambda odds: (odds[0], -odds[1]))
+
+    def solve(hp, enemy_hp, cooldown):
+        # Depth-first over an explicit stack rather than recursion: a
+        # long fight is hundreds of rounds deep. A state is stored once
+        # every state it leads to is; until then they go on the stack.
+        start = (hp, enemy_hp, cooldown)
+        stack = [start]
+        while stack:
+            key = stack[-1]
+            if key in solved:
+                stack.pop()
+                continue
+            del missing[:]
+            result = round_odds(*key)
+            if missing:
+                stack.extend(missing)
+            else:
+                solved[key] = result
+                stack.pop()
+        return solved[start]
+
+    return solve
+
 # ============================================================================
 # COMBAT UTILITIES
 # ============================================================================
@@ -451,16 +933,24 @@ def display_combat_stats(character, enemy):
     Shows both character and enemy health/stats
     """
     # TODO: Implement status display
-    print("\n--- Combat Status ---")
-    print(f"{character.get('name','You')}: HP={character.get('health',0)}/{character.get('max_health',0)} "
+    print(format_combat_stats(character, enemy))
+
+def format_combat_stats(character, enemy):
+    """
+    Build the combat status text shown by display_combat_stats
+    """
+    lines = ["\n--- Combat Status ---"]
+    lines.append(f"{character.get('name','You')}: HP={character.get('health',0)}/{character.get('max_health',0)} "
         f"STR={character.get('strength',0)} MAG={character.get('magic',0)}")
     cds = character.get('cooldowns', {})
     if cds:
         active = ", ".join(f"{k}:{v}" for k, v in cds.items() if v > 0)
-        print("Cooldowns:", active if active else "None")
-    print(f"{enemy.get('name','Enemy')}: HP={enemy.get('health',0)}/{enemy.get('max_health',0)} "
+        lines.append("Cooldowns: " + (active if active else "None"))
+    lines.append(f"{enemy.get('name','Enemy')}: HP={enemy.get('health',0)}/{enemy.get('max_health',0)} "
         f"STR={enemy.get('strength',0)} MAG={enemy.get('magic',0)}")
-    print("---------------------")
+    lines.append("---------------------")
+    return "\n".join(lines)
+
 def display_battle_log(message):
     """
     Display a formatted battle message
@@ -468,6 +958,71 @@ def display_battle_log(message):
     # TODO: Implement battle log display
     print(f">>> {message}")
 
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def benchmark_headless_battles(battles=20000, seed=21):
+    """Measure headless battles per second for each policy"""
+    import time
+    from character_manager import create_character
+    heroes = [create_character("Hero", cls) for cls in ("Warrior", "Mage", "Rogue", "Cleric")]
+    policies = {"scripted": lambda: ScriptedPolicy([]),
+                "random": RandomPolicy,
+                "greedy": GreedyPolicy}
+    for label, make_policy in policies.items():
+        rng = random.Random(seed)
+        wins = 0
+        start = time.perf_counter()
+        for i in range(battles):
+            character = dict(heroes[i % 4], cooldowns={})
+            battle = SimpleBattle(character, create_enemy("orc"), make_policy(), rng=rng)
+            wins += battle.run() == 'player'
+        elapsed = time.perf_counter() - start
+        print(f"{label:>8}: {battles / elapsed:,.0f} battles/s "
+              f"({battles / elapsed * 3600 / 1e6:.0f}M/hour), win rate {wins / battles:.1%}")
+
+def benchmark_expected_outcome(queries=20000):
+    """Time expected_outcome with a cold and a warm matchup cache"""
+    import time
+    from character_manager import create_character
+    heroes = [create_character("Hero", cls) for cls in ("Warrior", "Mage", "Rogue", "Cleric")]
+    templates = get_enemy_pool().templates
+    _outcome_solver.cache_clear()
+    start = time.perf_counter()
+    for hero in heroes:
+        for template in templates.values():
+            expected_outcome(hero, template)
+    cold = (time.perf_counter() - start) / (len(heroes) * len(templates))
+    start = time.perf_counter()
+    for i in range(queries):
+        pick_enemy(heroes[i % 4])
+    warm = (time.perf_counter() - start) / queries
+    print(f"expected_outcome, cold: {cold * 1e3:.2f}ms per matchup")
+    print(f"pick_enemy, warm: {warm * 1e6:.1f}us per call")
+
+def benchmark_spawn_batch(count=100000, level=4, seed=25):
+    """Compare spawn_batch with create_enemy and the old deepcopy per enemy"""
+    import time
+    import tracemalloc
+    from copy import deepcopy
+    rng = random.Random(seed)
+    pool = get_enemy_pool()
+    enemy_type = pool.choose(level)['type']
+    cases = (("deepcopy", lambda: [deepcopy(pool.templates[enemy_type]) for _ in range(count)]),
+             ("create_enemy", lambda: [create_enemy(enemy_type) for _ in range(count)]),
+             ("spawn_batch", lambda: pool.spawn_batch(level, count, rng)))
+    for label, spawn in cases:
+        start = time.perf_counter()
+        enemies = spawn()
+        elapsed = time.perf_counter() - start
+        del enemies
+        tracemalloc.start()
+        enemies = spawn()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del enemies
+        print(f"{label:>12}: {count / elapsed:,.0f} enemies/s, {size / count:.0f} bytes each")
 
 # ============================================================================
 # TESTING
@@ -499,4 +1054,12 @@ if __name__ == "__main__":
     #     print(f"Battle result: {result}")
     # except CharacterDeadError:
     #     print("Character is dead!")
-
+    
+    # Headless battle throughput
+    # benchmark_headless_battles()
+    
+    # Exact odds instead of simulation
+    # benchmark_expected_outcome()
+    
+    # Enemy spawning
+    # benchmark_spawn_batch()
@@ -123,3 +123,10 @@ class InvalidSaveDataError(GameError):
     """Raised when save file contains invalid data"""
     pass
 
+class SaveLockTimeoutError(GameError):
+    """Raised when another process holds a save's lock for too long"""
+    pass
+
+class StaleSaveError(GameError):
+    """Raised when saving over a save that changed since it was loaded"""
+    pass
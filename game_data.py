@@ -10,17 +10,31 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import re
+import glob
+import mmap
+import json
+import hashlib
+import tempfile
+from collections import OrderedDict
+from itertools import islice
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Game data files live next to this module, so the game finds (and
+# creates) them from any working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename=os.path.join(DATA_DIR, "quests.txt"), use_cache=True):
     """
     Load quest data from file
     
@@ -33,58 +47,15 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    When use_cache is True, a compiled copy of the parsed quests is kept
+    next to the file (see _load_catalog) and reused while it is fresh.
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle:
-    # - FileNotFoundError → raise MissingDataFileError
-    # - Invalid format → raise InvalidDataFormatError
-    # - Corrupted/unreadable data → raise CorruptedDataError
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest data file not found: {filename}")
+    return _load_catalog(filename, "quest", use_cache)
 
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = f.read()
-    except OSError as e:
-        # Permission denied, unreadable, etc.
-        raise CorruptedDataError(f"Could not read quest data file: {filename}") from e
-
-    # Split into blocks separated by blank lines
-    blocks = []
-    current = []
-    for line in raw.splitlines():
-        if line.strip() == "":
-            if current:
-                blocks.append(current)
-                current = []
-        else:
-            current.append(line.rstrip("\n"))
-    if current:
-        blocks.append(current)
-
-    quests = {}
-    for idx, block in enumerate(blocks, start=1):
-        try:
-            quest = parse_quest_block(block)
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Error parsing quest block #{idx}: {e}") from e
-
-        # Validate parsed quest structure
-        try:
-            validate_quest_data(quest)
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Invalid quest data in block #{idx}: {e}") from e
-
-        quest_id = quest.get("quest_id")
-        if quest_id in quests:
-            raise InvalidDataFormatError(f"Duplicate quest_id '{quest_id}' in file '{filename}'.")
-        quests[quest_id] = quest
-
-    return quests
-
-def load_items(filename="data/items.txt"):
+def load_items(filename=os.path.join(DATA_DIR, "items.txt"), use_cache=True):
     """
     Load item data from file
     
@@ -96,52 +67,111 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    use_cache works the same way as in load_quests.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle same exceptions as load_quests
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item data file not found: {filename}")
+    return _load_catalog(filename, "item", use_cache)
 
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = f.read()
-    except OSError as e:
-        raise CorruptedDataError(f"Could not read item data file: {filename}") from e
+def load_enemies(filename=os.path.join(DATA_DIR, "enemies.txt"), use_cache=True):
+    """
+    Load enemy templates from file
+    
+    Expected format per enemy (separated by blank lines):
+    ENEMY_ID: unique_enemy_name
+    NAME: Enemy Display Name
+    HEALTH: 50
+    STRENGTH: 8
+    MAGIC: 2
+    XP_REWARD: 25
+    GOLD_REWARD: 10
+    MIN_LEVEL: 1
+    MAX_LEVEL: 2 (or NONE for no upper limit)
+    WEIGHT: 10 (relative spawn chance among enemies of the same level)
+    
+    use_cache works the same way as in load_quests.
+    
+    Returns: Dictionary of enemies {enemy_id: enemy_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _load_catalog(filename, "enemy", use_cache)
 
-    # Split into blocks separated by blank lines
-    blocks = []
-    current = []
-    for line in raw.splitlines():
-        if line.strip() == "":
-            if current:
-                blocks.append(current)
-                current = []
-        else:
-            current.append(line.rstrip("\n"))
-    if current:
-        blocks.append(current)
+def load_catalog_dir(directory=DATA_DIR, workers=None):
+    """
+    Load quests and items from every shard file in a directory
+    
+    Shards are named quests.txt / quests_*.txt and items.txt / items_*.txt
+    and are parsed concurrently, one shard per task, in a process pool.
+    
+    Args:
+        directory: Folder containing the shard files
+        workers: Number of worker processes (defaults to the CPU count;
+                 1 parses in the current process)
+    
+    Returns: Tuple (quests, items) of {id: data_dict} dictionaries
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+            (duplicate ids across shards name both files and block numbers)
+    """
+    if not os.path.isdir(directory):
+        raise MissingDataFileError(f"Data directory not found: {directory}")
 
-    items = {}
-    for idx, block in enumerate(blocks, start=1):
-        try:
-            item = parse_item_block(block)
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Error parsing item block #{idx}: {e}") from e
+    shards = []
+    for kind, prefix in (("quest", "quests"), ("item", "items")):
+        paths = glob.glob(os.path.join(directory, f"{prefix}.txt"))
+        paths += glob.glob(os.path.join(directory, f"{prefix}_*.txt"))
+        shards.extend((path, kind) for path in sorted(paths))
 
-        # Validate parsed item structure
-        try:
-            validate_item_data(item)
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Invalid item data in block #{idx}: {e}") from e
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(shards)))
+
+    if workers == 1:
+        results = [_parse_shard(path, kind) for path, kind in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_shard, *zip(*shards)))
 
-        item_id = item.get("item_id")
-        if item_id in items:
-            raise InvalidDataFormatError(f"Duplicate item_id '{item_id}' in file '{filename}'.")
-        items[item_id] = item
+    catalogs = {"quest": {}, "item": {}}
+    origins = {"quest": {}, "item": {}}
+    for (path, kind), records in zip(shards, results):
+        catalog = catalogs[kind]
+        seen = origins[kind]
+        for idx, record in records:
+            record_id = record[f"{kind}_id"]
+            if record_id in catalog:
+                first_path, first_idx = seen[record_id]
+                raise InvalidDataFormatError(
+                    f"Duplicate {kind}_id '{record_id}' in '{path}' block #{idx} "
+                    f"(already defined in '{first_path}' block #{first_idx})."
+                )
+            catalog[record_id] = record
+            seen[record_id] = (path, idx)
+
+    return catalogs["quest"], catalogs["item"]
+
+def iter_quest_blocks(filename=os.path.join(DATA_DIR, "quests.txt")):
+    """
+    Lazily parse and validate quests from file, one block at a time
+    
+    The file is read line by line, so memory use does not depend on
+    the size of the file.
+    
+    Yields: Validated quest dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, quest in _iter_records(filename, "quest"):
+        yield quest
 
-    return items
+def iter_item_blocks(filename=os.path.join(DATA_DIR, "items.txt")):
+    """
+    Lazily parse and validate items from file, one block at a time
+    
+    Yields: Validated item dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, item in _iter_records(filename, "item"):
+        yield item
 
 def validate_quest_data(quest_dict):
     """
@@ -155,7 +185,7 @@ def validate_quest_data(quest_dict):
     # TODO: Implement validation
     # Check that all required keys exist
     # Check that numeric values are actually numbers
-    if not isinstance(quest_dict, dict):
+    if not isinstance(quest_dict, Mapping):
         raise InvalidDataFormatError("Quest data must be a dictionary.")
 
     required_fields = [
@@ -174,6 +204,39 @@ def validate_quest_data(quest_dict):
 
     return True
 
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that enemy dictionary has all required fields
+    
+    Required fields: enemy_id, name, health, strength, magic, xp_reward,
+    gold_reward, min_level, max_level, weight
+    
+    Returns: True if valid
+    Raises: InvalidDataFormatError if fields are missing or out of range
+    """
+    if not isinstance(enemy_dict, Mapping):
+        raise InvalidDataFormatError("Enemy data must be a dictionary.")
+
+    for field in EnemyTemplate.FIELDS:
+        if field not in enemy_dict:
+            raise InvalidDataFormatError(f"Missing required field: {field}")
+
+    for num_field in _ENEMY_INT_FIELDS:
+        if not isinstance(enemy_dict[num_field], int):
+            raise InvalidDataFormatError(f"Field '{num_field}' must be an integer.")
+
+    if enemy_dict["health"] <= 0:
+        raise InvalidDataFormatError("Field 'health' must be positive.")
+    if enemy_dict["weight"] <= 0:
+        raise InvalidDataFormatError("Field 'weight' must be positive.")
+    if enemy_dict["min_level"] < 1:
+        raise InvalidDataFormatError("Field 'min_level' must be at least 1.")
+    max_level = enemy_dict["max_level"]
+    if max_level is not None and (not isinstance(max_level, int) or max_level < enemy_dict["min_level"]):
+        raise InvalidDataFormatError("Field 'max_level' must be NONE or an integer >= min_level.")
+
+    return True
+
 def validate_item_data(item_dict):
     """
     Validate that item dictionary has all required fields
@@ -185,7 +248,7 @@ def validate_item_data(item_dict):
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
     # TODO: Implement validation
-    if not isinstance(item_dict, dict):
+    if not isinstance(item_dict, Mapping):
         raise InvalidDataFormatError("Item data must be a dictionary.")
 
     required_fields = ["item_id", "name", "type", "effect", "cost", "description"]
@@ -202,20 +265,22 @@ def validate_item_data(item_dict):
     return True
 
 
-def create_default_data_files():
+def create_default_data_files(data_dir=DATA_DIR):
     """
     Create default data files if they don't exist
     This helps with initial setup and testing
+    
+    data_dir defaults to DATA_DIR, where the loaders look.
     """
     # TODO: Implement this function
     # Create data/ directory if it doesn't exist
-    # Create default quests.txt and items.txt files
+    # Create default quests.txt, items.txt and enemies.txt files
     # Handle any file permission errors appropriately
-    data_dir = "data"
     os.makedirs(data_dir, exist_ok=True)
 
     quests_path = os.path.join(data_dir, "quests.txt")
     items_path = os.path.join(data_dir, "items.txt")
+    enemies_path = os.path.join(data_dir, "enemies.txt")
 
     # Only create if missing
     if not os.path.isfile(quests_path):
@@ -241,18 +306,327 @@ def create_default_data_files():
                 "DESCRIPTION: A sword used for testing purposes.\n"
             )
 
+    if not os.path.isfile(enemies_path):
+        with open(enemies_path, "w", encoding="utf-8") as f:
+            f.write(
+                "ENEMY_ID: goblin\n"
+                "NAME: Goblin\n"
+                "HEALTH: 50\n"
+                "STRENGTH: 8\n"
+                "MAGIC: 2\n"
+                "XP_REWARD: 25\n"
+                "GOLD_REWARD: 10\n"
+                "MIN_LEVEL: 1\n"
+                "MAX_LEVEL: 2\n"
+                "WEIGHT: 10\n"
+                "\n"
+                "ENEMY_ID: orc\n"
+                "NAME: Orc\n"
+                "HEALTH: 80\n"
+                "STRENGTH: 12\n"
+                "MAGIC: 5\n"
+                "XP_REWARD: 50\n"
+                "GOLD_REWARD: 25\n"
+                "MIN_LEVEL: 3\n"
+                "MAX_LEVEL: 5\n"
+                "WEIGHT: 10\n"
+                "\n"
+                "ENEMY_ID: dragon\n"
+                "NAME: Dragon\n"
+                "HEALTH: 200\n"
+                "STRENGTH: 25\n"
+                "MAGIC: 15\n"
+                "XP_REWARD: 200\n"
+                "GOLD_REWARD: 100\n"
+                "MIN_LEVEL: 6\n"
+                "MAX_LEVEL: NONE\n"
+                "WEIGHT: 10\n"
+            )
+
+# ============================================================================
+# DATA RECORDS
+# ============================================================================
+
+class _Record(Mapping):
+    """
+    Compact, read-only-mapping record with a fixed set of fields
+    
+    Fields live in __slots__ instead of a per-record dict, but records
+    still support record["field"], .get(), "field" in record, .items()
+    and comparison with plain dicts, so code written against the old
+    dict records keeps working.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    # Attributes derived from FIELDS by compute(); not part of the mapping
+    COMPUTED = ()
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            if key not in self.FIELDS:
+                raise TypeError(f"{type(self).__name__} has no field '{key}'")
+            setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        return key in self.FIELDS and hasattr(self, key)
+
+    def to_dict(self):
+        """Return the record as a plain dictionary"""
+        return dict(self.items())
+
+    def to_values(self):
+        """Field values in FIELDS order, for the catalog cache"""
+        return [getattr(self, key, None) for key in self.FIELDS]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Assigns every slot in one unpacking statement; much faster
+        # than a setattr() per field when the cache loads many records
+        targets = "".join(f"record.{key}, " for key in cls.FIELDS)
+        namespace = {}
+        exec(f"def restore(record, values):\n    {targets}= values\n", namespace)
+        cls._restore = staticmethod(namespace["restore"])
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Rebuild a record from to_values() output
+        
+        The values are trusted (they were validated before they were
+        cached), so the slots are filled directly without __init__.
+        
+        Raises: ValueError if the number of values is wrong
+        """
+        if len(values) != len(cls.FIELDS):
+            raise ValueError(f"Expected {len(cls.FIELDS)} values for {cls.__name__}")
+        record = object.__new__(cls)
+        cls._restore(record, values)
+        if cls.COMPUTED:
+            record.compute()
+        return record
+
+    def compute(self):
+        """Fill in COMPUTED fields from the parsed ones"""
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+class Quest(_Record):
+    """Quest record produced by parse_quest_block"""
+    FIELDS = ("quest_id", "title", "description",
+              "reward_xp", "reward_gold", "required_level", "prerequisite")
+    __slots__ = FIELDS
+
+class Item(_Record):
+    """
+    Item record produced by parse_item_block
+    
+    The effects attribute holds the EFFECT string pre-parsed by
+    parse_effect_string, e.g. (("strength", 5), ("magic", 2)). It is not
+    a key, so items still compare equal to the plain item dictionaries.
+    """
+    FIELDS = ("item_id", "name", "type", "effect", "cost", "description")
+    COMPUTED = ("effects",)
+    __slots__ = FIELDS + COMPUTED
+
+    def compute(self):
+        # Parse effects once here so equipping/using items never re-parses them
+        if hasattr(self, "effect"):
+            self.effects = parse_effect_string(self.effect)
+
+class EnemyTemplate(_Record):
+    """Enemy record produced by parse_enemy_block (max_level None = no limit)"""
+    FIELDS = ("enemy_id", "name", "health", "strength", "magic",
+              "xp_reward", "gold_reward", "min_level", "max_level", "weight")
+    __slots__ = FIELDS
+
+# ============================================================================
+# LAZY CATALOGS
+# ============================================================================
+
+# A run of one or more blank (whitespace-only) lines separating two blocks
+_BLOCK_SEPARATOR = re.compile(rb"\n(?:[ \t\r\f\v]*\n)+")
+
+class LazyCatalog(Mapping):
+    """
+    Read-only {id: record} mapping backed by a memory-mapped data file
+    
+    Opening the catalog only records the byte range of every block; a
+    block is parsed and validated the first time its id is looked up.
+    The most recently used records are kept in a bounded cache.
+    
+    Works anywhere a quest_data_dict / item_data_dict is expected.
+    """
+
+    def __init__(self, filename, kind="quest", cache_size=256):
+        """
+        Args:
+            filename: Quest or item data file
+            kind: "quest" or "item"
+            cache_size: Maximum number of parsed records kept in memory
+        
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if kind not in _RECORD_TYPES:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"{kind.capitalize()} data file not found: {filename}")
+
+        self.filename = filename
+        self.kind = kind
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._mm = None
+        self._index = {}
+        self.closed = False
+
+        try:
+            with open(filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise CorruptedDataError(f"Could not read {kind} data file: {filename}") from e
+
+        if self._mm is not None:
+            self._build_index()
+
+    def _build_index(self):
+        """Map every record id to (block_number, start, end) in the file"""
+        id_line = re.compile(rb"^[ \t]*" + self.kind.encode() + rb"_id[ \t]*: (.*)$",
+                             re.IGNORECASE | re.MULTILINE)
+        mm = self._mm
+        idx = 0
+        start = 0
+        ends = [m.start() for m in _BLOCK_SEPARATOR.finditer(mm)]
+        ends.append(len(mm))
+
+        for end in ends:
+            block_start, start = start, end
+            if not mm[block_start:end].strip():
+                continue
+            idx += 1
+            # Like parse_block, the last ID line of a block wins
+            match = None
+            for match in id_line.finditer(mm, block_start, end):
+                pass
+            if match is None:
+                raise InvalidDataFormatError(
+                    f"Error parsing {self.kind} block #{idx}: "
+                    f"Missing '{self.kind.upper()}_ID' in {self.kind} block."
+                )
+            record_id = match.group(1).strip().decode("utf-8")
+            if record_id in self._index:
+                raise InvalidDataFormatError(
+                    f"Duplicate {self.kind}_id '{record_id}' in file '{self.filename}'."
+                )
+            self._index[record_id] = (idx, block_start, end)
+
+    def __getitem__(self, record_id):
+        cache = self._cache
+        if record_id in cache:
+            cache.move_to_end(record_id)
+            return cache[record_id]
+
+        idx, start, end = self._index[record_id]
+        if self.closed:
+            raise ValueError(f"{self.kind.capitalize()} catalog {self.filename} is closed")
+        parse_block, validate = _RECORD_TYPES[self.kind]
+        try:
+            text = self._mm[start:end].decode("utf-8")
+        except (UnicodeDecodeError, ValueError) as e:
+            raise CorruptedDataError(
+                f"Could not read {self.kind} block #{idx} in {self.filename}"
+            ) from e
+        lines = [line for line in text.splitlines() if line.strip()]
+
+        try:
+            record = parse_block(lines)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"Error parsing {self.kind} block #{idx}: {e}") from e
+        try:
+            validate(record)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"Invalid {self.kind} data in block #{idx}: {e}") from e
+
+        cache[record_id] = record
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return record
+
+    def __contains__(self, record_id):
+        return record_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """
+        Release the memory map; cached records stay readable, other
+        lookups raise ValueError
+        """
+        self.closed = True
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def open_quest_catalog(filename=os.path.join(DATA_DIR, "quests.txt"), cache_size=256):
+    """
+    Open quests lazily instead of loading them all with load_quests
+    
+    Returns: LazyCatalog of quests
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return LazyCatalog(filename, "quest", cache_size)
+
+def open_item_catalog(filename=os.path.join(DATA_DIR, "items.txt"), cache_size=256):
+    """
+    Open items lazily instead of loading them all with load_items
+    
+    Returns: LazyCatalog of items
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return LazyCatalog(filename, "item", cache_size)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 def parse_quest_block(lines):
     """
-    Parse a block of lines into a quest dictionary
+    Parse a block of lines into a quest record
     
     Args:
         lines: List of strings representing one quest
     
-    Returns: Dictionary with quest data
+    Fields outside Quest.FIELDS are skipped.
+    
+    Returns: Quest record (read like a dictionary)
     Raises: InvalidDataFormatError if parsing fails
     """
     # TODO: Implement parsing logic
@@ -270,6 +644,10 @@ def parse_quest_block(lines):
         key = key.strip().lower()
         value = value.strip()
 
+        if key not in Quest.FIELDS:
+            # Extra keys are ignored, as they always were
+            continue
+
         if key in ("reward_xp", "reward_gold", "required_level"):
             try:
                 value = int(value)
@@ -288,16 +666,18 @@ def parse_quest_block(lines):
     if "quest_id" not in quest:
         raise InvalidDataFormatError("Missing 'QUEST_ID' in quest block.")
 
-    return quest
+    return Quest(**quest)
 
 def parse_item_block(lines):
     """
-    Parse a block of lines into an item dictionary
+    Parse a block of lines into an item record
     
     Args:
         lines: List of strings representing one item
     
-    Returns: Dictionary with item data
+    Fields outside Item.FIELDS are skipped.
+    
+    Returns: Item record (read like a dictionary)
     Raises: InvalidDataFormatError if parsing fails
     """
     # TODO: Implement parsing logic
@@ -312,6 +692,10 @@ def parse_item_block(lines):
         key = key.strip().lower()
         value = value.strip()
 
+        if key not in Item.FIELDS:
+            # Extra keys are ignored, as they always were
+            continue
+
         if key == "cost":
             try:
                 value = int(value)
@@ -323,7 +707,377 @@ def parse_item_block(lines):
     if "item_id" not in item:
         raise InvalidDataFormatError("Missing 'ITEM_ID' in item block.")
 
-    return item
+    record = Item(**item)
+    record.compute()
+    return record
+
+# Enemy fields holding integers (max_level may also be NONE)
+_ENEMY_INT_FIELDS = ("health", "strength", "magic", "xp_reward", "gold_reward",
+                     "min_level", "weight")
+
+def parse_enemy_block(lines):
+    """
+    Parse a block of lines into an enemy record
+    
+    Args:
+        lines: List of strings representing one enemy
+    
+    Fields outside EnemyTemplate.FIELDS are skipped.
+    
+    Returns: EnemyTemplate record (read like a dictionary)
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    if not lines:
+        raise InvalidDataFormatError("Empty enemy block.")
+
+    enemy = {}
+    for raw in lines:
+        if ": " not in raw:
+            raise InvalidDataFormatError(f"Invalid line format (expected 'KEY: value'): '{raw}'")
+        key, value = raw.split(": ", 1)
+        key = key.strip().lower()
+        value = value.strip()
+
+        if key not in EnemyTemplate.FIELDS:
+            # Extra keys are ignored, as they always were
+            continue
+
+        if key == "max_level" and value.upper() == "NONE":
+            value = None
+        elif key in _ENEMY_INT_FIELDS or key == "max_level":
+            try:
+                value = int(value)
+            except ValueError:
+                raise InvalidDataFormatError(f"Field '{key.upper()}' must be an integer (got '{value}').")
+
+        enemy[key] = value
+
+    if "enemy_id" not in enemy:
+        raise InvalidDataFormatError("Missing 'ENEMY_ID' in enemy block.")
+
+    return EnemyTemplate(**enemy)
+
+def parse_effect_string(effect_string):
+    """
+    Parse an EFFECT value into (stat, value) pairs
+    
+    Accepts a single effect ("strength:5") or several separated by
+    commas ("strength:5,magic:2").
+    
+    Returns: Tuple of (stat_name, int_value) tuples
+    Raises: InvalidDataFormatError if an effect is malformed
+    """
+    effects = []
+    for part in effect_string.split(","):
+        if part.count(":") != 1:
+            raise InvalidDataFormatError(f"Invalid effect format: '{effect_string}'")
+        stat, value = part.split(":")
+        stat = stat.strip()
+        try:
+            value = int(value.strip())
+        except ValueError:
+            raise InvalidDataFormatError(f"Effect value must be an integer: '{effect_string}'")
+        if not stat:
+            raise InvalidDataFormatError(f"Invalid effect format: '{effect_string}'")
+        effects.append((stat, value))
+    return tuple(effects)
+
+def _iter_blocks(lines):
+    """
+    Group an iterable of lines into blocks separated by blank lines
+    
+    Yields: (block_number, list_of_lines) tuples, numbered from 1
+    """
+    current = []
+    idx = 0
+    for line in lines:
+        if line.strip() == "":
+            if current:
+                idx += 1
+                yield idx, current
+                current = []
+        else:
+            current.append(line.rstrip("\n"))
+    if current:
+        idx += 1
+        yield idx, current
+
+def _parse_shard(filename, kind):
+    """
+    Parse one shard file (runs inside a worker process)
+    
+    Returns: List of (block_number, record) tuples
+    """
+    try:
+        return list(_iter_records(filename, kind))
+    except (InvalidDataFormatError, CorruptedDataError) as e:
+        raise type(e)(f"{filename}: {e}") from e
+
+# Bump whenever the parsed record layout changes so stale caches are ignored
+_CACHE_VERSION = 5
+_CACHE_SUFFIX = ".cache"
+# Cache lines decoded per json.loads call
+_CACHE_CHUNK_LINES = 1024
+
+def _load_catalog(filename, kind, use_cache=True):
+    """
+    Load a quest, item or enemy file into a {id: record} dictionary
+    
+    With use_cache, the parsed records are stored as JSON at
+    "<filename>.cache" (plain data only, so a tampered cache cannot run
+    code). The cache is used only when the source file has the same
+    size, mtime and SHA-1 digest as when the cache was written;
+    otherwise the text is re-parsed and the cache rebuilt.
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not use_cache:
+        return _build_catalog(filename, kind)
+
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        # Let the text parser report the missing/unreadable file
+        return _build_catalog(filename, kind)
+
+    records, digest = _read_catalog_cache(filename, kind, stat)
+    if records is not None:
+        return records
+
+    records = _build_catalog(filename, kind)
+    _write_catalog_cache(filename, kind, stat, digest, records)
+    return records
+
+def _build_catalog(filename, kind):
+    """Parse a whole catalog file, rejecting duplicate ids"""
+    id_field = f"{kind}_id"
+    records = {}
+    for _, record in _iter_records(filename, kind):
+        record_id = record.get(id_field)
+        if record_id in records:
+            raise InvalidDataFormatError(f"Duplicate {id_field} '{record_id}' in file '{filename}'.")
+        records[record_id] = record
+    return records
+
+def _file_digest(filename):
+    """SHA-1 of a file's contents, read in chunks; None if unreadable"""
+    sha = hashlib.sha1()
+    try:
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+    except OSError:
+        return None
+    return sha.hexdigest()
+
+def _read_catalog_cache(filename, kind, stat):
+    """
+    Return (records, digest) from a fresh cache, or (None, digest) if the
+    cache is missing, stale or unreadable. digest is the source file's
+    SHA-1 when it had to be computed, so the caller can reuse it.
+    
+    The cache starts with a one-line JSON header; the records follow
+    one per line as a JSON list of field values, and are read one line
+    at a time. The header's count catches a cache cut off between lines.
+    """
+    try:
+        f = open(filename + _CACHE_SUFFIX, "r", encoding="utf-8")
+    except OSError:
+        return None, None
+
+    digest = None
+    with f:
+        try:
+            header = json.loads(f.readline())
+            if (header.get("version") != _CACHE_VERSION
+                    or header.get("kind") != kind
+                    or header.get("size") != stat.st_size
+                    or header.get("mtime_ns") != stat.st_mtime_ns):
+                return None, None
+            # Same size and mtime can still hide an edit (coarse mtime,
+            # tools that restore it), so the content must match too
+            digest = _file_digest(filename)
+            if digest is None or digest != header.get("digest"):
+                return None, digest
+            from_values = _RECORD_CLASSES[kind].from_values
+            id_index = _RECORD_CLASSES[kind].FIELDS.index(f"{kind}_id")
+            records = {}
+            while True:
+                # One json.loads per chunk of lines keeps decoding in C
+                # without holding the whole cache in memory
+                lines = list(islice(f, _CACHE_CHUNK_LINES))
+                if not lines:
+                    break
+                for values in json.loads("[" + ",".join(lines) + "]"):
+                    records[values[id_index]] = from_values(values)
+            if len(records) != header.get("count"):
+                return None, digest
+            return records, digest
+        except Exception:
+            # Truncated or corrupted cache: fall back to the text file
+            return None, digest
+
+def _write_catalog_cache(filename, kind, stat, digest, records):
+    """Atomically write the compiled cache; failures are silently ignored"""
+    if digest is None:
+        digest = _file_digest(filename)
+        if digest is None:
+            return
+    header = {
+        "version": _CACHE_VERSION,
+        "kind": kind,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "digest": digest,
+        "count": len(records),
+    }
+    cache_path = filename + _CACHE_SUFFIX
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(cache_path) + ".",
+            dir=os.path.dirname(cache_path) or ".",
+        )
+    except OSError:
+        # e.g. read-only data directory; the cache is only an optimization
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            dumps = json.dumps
+            f.write(dumps(header) + "\n")
+            for record in records.values():
+                f.write(dumps(record.to_values()) + "\n")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# Per-record-type parsing settings: (parser, validator)
+_RECORD_TYPES = {
+    "quest": (parse_quest_block, validate_quest_data),
+    "item": (parse_item_block, validate_item_data),
+    "enemy": (parse_enemy_block, validate_enemy_data),
+}
+_RECORD_CLASSES = {"quest": Quest, "item": Item, "enemy": EnemyTemplate}
+
+def _iter_records(filename, kind):
+    """
+    Stream (block_number, record) pairs out of a quest or item file
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    parse_block, validate = _RECORD_TYPES[kind]
+
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"{kind.capitalize()} data file not found: {filename}")
+
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except OSError as e:
+        # Permission denied, unreadable, etc.
+        raise CorruptedDataError(f"Could not read {kind} data file: {filename}") from e
+
+    with f:
+        blocks = _iter_blocks(f)
+        while True:
+            try:
+                idx, block = next(blocks)
+            except StopIteration:
+                break
+            except OSError as e:
+                raise CorruptedDataError(f"Could not read {kind} data file: {filename}") from e
+
+            try:
+                record = parse_block(block)
+            except InvalidDataFormatError as e:
+                raise InvalidDataFormatError(f"Error parsing {kind} block #{idx}: {e}") from e
+
+            try:
+                validate(record)
+            except InvalidDataFormatError as e:
+                raise InvalidDataFormatError(f"Invalid {kind} data in block #{idx}: {e}") from e
+
+            yield idx, record
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def write_sample_quest_file(filename, count):
+    """Write `count` generated quests (a simple linear chain) to filename"""
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(count):
+            prereq = f"quest_{i - 1}" if i else "NONE"
+            f.write(
+                f"QUEST_ID: quest_{i}\n"
+                f"TITLE: Generated Quest {i}\n"
+                f"DESCRIPTION: Generated quest number {i}\n"
+                f"REWARD_XP: {50 + i % 100}\n"
+                f"REWARD_GOLD: {25 + i % 50}\n"
+                f"REQUIRED_LEVEL: {1 + i % 50}\n"
+                f"PREREQUISITE: {prereq}\n"
+                "\n"
+            )
+
+def benchmark_catalog_cache(count=100000):
+    """Compare text parsing with loading from the compiled cache"""
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "quests.txt")
+        write_sample_quest_file(path, count)
+
+        start = time.perf_counter()
+        load_quests(path, use_cache=False)
+        parse_time = time.perf_counter() - start
+
+        load_quests(path)  # builds the cache
+        start = time.perf_counter()
+        load_quests(path)
+        cached_time = time.perf_counter() - start
+
+    print(f"{count} quests: parse {parse_time:.3f}s, cached {cached_time:.3f}s "
+          f"({parse_time / cached_time:.1f}x faster)")
+
+def benchmark_catalog_dir(shards=8, count=25000):
+    """Time load_catalog_dir on generated shards with 1 worker and all cores"""
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for shard in range(shards):
+            path = os.path.join(tmp, f"quests_{shard:03d}.txt")
+            write_sample_quest_file(path, count)
+            # Keep ids unique across shards
+            with open(path, encoding="utf-8") as f:
+                text = f.read().replace("quest_", f"s{shard}_quest_")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        for workers in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            quests, _ = load_catalog_dir(tmp, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{len(quests)} quests in {shards} shards, {workers} worker(s): {elapsed:.3f}s")
+
+def benchmark_record_memory(count=100000):
+    """Compare the per-record memory of plain dicts with Quest records"""
+    import tracemalloc
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "quests.txt")
+        write_sample_quest_file(path, count)
+
+        for label, convert in (("dict", Quest.to_dict), ("Quest", None)):
+            tracemalloc.start()
+            quests = {}
+            for quest in iter_quest_blocks(path):
+                quests[quest["quest_id"]] = convert(quest) if convert else quest
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{label:>5}: {size / count:.0f} bytes per record "
+                  f"({size / 2**20:.1f} MiB for {count})")
+            del quests
 
 # ============================================================================
 # TESTING
@@ -353,3 +1107,11 @@ if __name__ == "__main__":
     # except InvalidDataFormatError as e:
     #     print(f"Invalid item format: {e}")
 
+    # Benchmark the compiled catalog cache
+    # benchmark_catalog_cache()
+
+    # Benchmark parallel shard loading
+    # benchmark_catalog_dir()
+
+    # Compare dict and __slots__ record memory
+    # benchmark_record_memory()
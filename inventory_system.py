@@ -13,12 +13,116 @@ from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
     InsufficientResourcesError,
-    InvalidItemTypeError
+    InvalidItemTypeError,
+    InvalidDataFormatError
 )
+from game_data import parse_effect_string
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# Maximum copies of one item per inventory (tune per game design); kept
+# below MAX_INVENTORY_SIZE so one item can't fill the whole inventory
+MAX_STACK_SIZE = 10
+
+# ============================================================================
+# INVENTORY CONTAINER
+# ============================================================================
+
+class Inventory:
+    """
+    Counted multiset of item ids (item_id -> count)
+    
+    Keeps the list operations the game uses on character["inventory"]
+    (append, remove, count, len, "in", iteration) but counting, lookups
+    and removal are O(1) instead of scanning a flat list. len() is the
+    total number of items, so capacity checks are unchanged.
+    """
+    __slots__ = ("_counts", "_total", "stack_limit")
+
+    def __init__(self, item_ids=(), stack_limit=MAX_STACK_SIZE):
+        self._counts = {}
+        self._total = 0
+        self.stack_limit = stack_limit
+        # Loaded inventories are taken as-is, even if over a limit
+        for item_id in item_ids:
+            self._counts[item_id] = self._counts.get(item_id, 0) + 1
+            self._total += 1
+
+    @classmethod
+    def from_counts(cls, counts, stack_limit=MAX_STACK_SIZE):
+        """Build an inventory from an {item_id: count} mapping"""
+        inventory = cls(stack_limit=stack_limit)
+        for item_id, count in counts.items():
+            if count > 0:
+                inventory._counts[item_id] = inventory._counts.get(item_id, 0) + count
+                inventory._total += count
+        return inventory
+
+    def add(self, item_id, quantity=1):
+        """
+        Add quantity copies of item_id
+        
+        Raises: InventoryFullError if the item's stack limit would be exceeded
+        """
+        count = self._counts.get(item_id, 0)
+        if count + quantity > self.stack_limit:
+            raise InventoryFullError(f"Can't carry more than {self.stack_limit} {item_id}")
+        self._counts[item_id] = count + quantity
+        self._total += quantity
+
+    def append(self, item_id):
+        self.add(item_id)
+
+    def remove(self, item_id, quantity=1):
+        """Remove quantity copies; raises ValueError if there are not enough, like list.remove"""
+        count = self._counts.get(item_id, 0)
+        if count < quantity:
+            raise ValueError(f"{item_id!r} not in inventory")
+        if count == quantity:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = count - quantity
+        self._total -= quantity
+
+    def count(self, item_id):
+        return self._counts.get(item_id, 0)
+
+    def counts(self):
+        """Return a copy of the {item_id: count} mapping"""
+        return dict(self._counts)
+
+    def clear(self):
+        self._counts.clear()
+        self._total = 0
+
+    def copy(self):
+        """Flat list of item ids, like list.copy() on the old inventories"""
+        return list(self)
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        for item_id, count in self._counts.items():
+            for _ in range(count):
+                yield item_id
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return self == Inventory(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Inventory({self._counts!r})"
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -32,7 +136,8 @@ def add_item_to_inventory(character, item_id):
         item_id: Unique item identifier
     
     Returns: True if added successfully
-    Raises: InventoryFullError if inventory is at max capacity
+    Raises: InventoryFullError if inventory is at max capacity or the
+            character already carries MAX_STACK_SIZE of item_id
     """
     # TODO: Implement adding items
     # Check if inventory is full (>= MAX_INVENTORY_SIZE)
@@ -103,8 +208,10 @@ def clear_inventory(character):
     # TODO: Implement inventory clearing
     # Save current inventory before clearing
     # Clear character's inventory list
-    removed = character.get("inventory", []).copy()
-    character["inventory"] = []
+    inventory = character.get("inventory", [])
+    removed = list(inventory)
+    inventory.clear()
+    character["inventory"] = inventory
     return removed
 # ============================================================================
 # ITEM USAGE
@@ -142,16 +249,17 @@ def use_item(character, item_id, item_data):
     if item_data.get("type") != "consumable":
         raise InvalidItemTypeError(f"Item {item_id} is not a consumable")
 
-    # Parse effect
-    stat_name, value = parse_item_effect(item_data.get("effect", ""))
+    # Effects are pre-parsed by game_data for catalog items
+    effects = get_item_effects(item_data)
 
-    # Apply stat effect
-    apply_stat_effect(character, stat_name, value)
+    # Apply stat effects
+    apply_item_effects(character, effects)
 
     # Remove item from inventory
     inventory.remove(item_id)
 
-    return f"Used {item_data.get('name', item_id)}. {stat_name} increased by {value}."
+    increases = ", ".join(f"{stat} increased by {value}" for stat, value in effects)
+    return f"Used {item_data.get('name', item_id)}. {increases}."
 
 
 def equip_weapon(character, item_id, item_data):
@@ -166,25 +274,24 @@ def equip_weapon(character, item_id, item_data):
     if item_data.get("type") != "weapon":
         raise InvalidItemTypeError(f"Item {item_id} is not a weapon")
 
-    # Parse effect (e.g., "strength:5")
-    stat, value = parse_item_effect(item_data["effect"])
+    # Effects, e.g. (("strength", 5),)
+    effects = get_item_effects(item_data)
 
     # If already equipped, unequip old weapon
     old_weapon_id = character.get("equipped_weapon")
     if old_weapon_id:
         old_weapon_data = character["item_data"][old_weapon_id]
-        old_stat, old_value = parse_item_effect(old_weapon_data["effect"])
-        apply_stat_effect(character, old_stat, -old_value)  # remove bonus
+        apply_item_effects(character, get_item_effects(old_weapon_data), -1)  # remove bonus
         add_item_to_inventory(character, old_weapon_id)
 
     # Apply new weapon bonus
-    apply_stat_effect(character, stat, value)
+    apply_item_effects(character, effects)
 
     # Set equipped weapon
     character["equipped_weapon"] = item_id
     inventory.remove(item_id)
 
-    return f"Equipped weapon {item_id} (+{value} {stat})."
+    return f"Equipped weapon {item_id} ({describe_item_effects(effects)})."
 
 
 def equip_armor(character, item_id, item_data):
@@ -197,22 +304,21 @@ def equip_armor(character, item_id, item_data):
     if item_data.get("type") != "armor":
         raise InvalidItemTypeError(f"Item {item_id} is not armor")
 
-    stat, value = parse_item_effect(item_data["effect"])
+    effects = get_item_effects(item_data)
 
     # Unequip previous armor
     old_armor_id = character.get("equipped_armor")
     if old_armor_id:
         old_armor_data = character["item_data"][old_armor_id]
-        old_stat, old_value = parse_item_effect(old_armor_data["effect"])
-        apply_stat_effect(character, old_stat, -old_value)
+        apply_item_effects(character, get_item_effects(old_armor_data), -1)
         add_item_to_inventory(character, old_armor_id)
 
-    apply_stat_effect(character, stat, value)
+    apply_item_effects(character, effects)
 
     character["equipped_armor"] = item_id
     inventory.remove(item_id)
 
-    return f"Equipped armor {item_data['name']} (+{value} {stat})."
+    return f"Equipped armor {item_data['name']} ({describe_item_effects(effects)})."
 
 
 def unequip_weapon(character):
@@ -224,10 +330,9 @@ def unequip_weapon(character):
         return None
 
     weapon_data = character["item_data"][weapon_id]
-    stat, value = parse_item_effect(weapon_data["effect"])
 
     # Remove stat bonuses
-    apply_stat_effect(character, stat, -value)
+    apply_item_effects(character, get_item_effects(weapon_data), -1)
 
     # Try adding back to inventory
     add_item_to_inventory(character, weapon_id)
@@ -245,8 +350,7 @@ def unequip_armor(character):
         return None
 
     armor_data = character["item_data"][armor_id]
-    stat, value = parse_item_effect(armor_data["effect"])
-    apply_stat_effect(character, stat, -value)
+    apply_item_effects(character, get_item_effects(armor_data), -1)
 
     add_item_to_inventory(character, armor_id)
 
@@ -267,8 +371,9 @@ def purchase_item(character, item_id, item_data):
     if len(character.get("inventory", [])) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("We got that at home!")  # your joke preserved
 
-    character["gold"] -= cost
+    # Add first: a full stack raises before any gold is taken
     character["inventory"].append(item_id)
+    character["gold"] -= cost
     return True
 
 
@@ -289,12 +394,33 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_item_effect(effect_string):
-    """Parse 'stat:value' into (stat, int(value))."""
-    if ":" not in effect_string:
-        raise InvalidItemTypeError(f"Invalid effect format: {effect_string}")
-    stat, value = effect_string.split(":")
-    return stat.strip(), int(value.strip())
+def get_item_effects(item_data):
+    """
+    Return an item's effects as (stat, value) pairs
+    
+    Catalog items from game_data carry a pre-parsed effects attribute;
+    plain item dictionaries fall back to parsing their "effect" string.
+    
+    Raises: InvalidItemTypeError if the effect string is malformed
+    """
+    effects = getattr(item_data, "effects", None)
+    if effects is not None:
+        return effects
+    try:
+        return parse_effect_string(item_data.get("effect", ""))
+    except InvalidDataFormatError as e:
+        raise InvalidItemTypeError(str(e)) from e
+
+
+def apply_item_effects(character, effects, sign=1):
+    """Apply (or with sign=-1, remove) every (stat, value) effect"""
+    for stat_name, value in effects:
+        apply_stat_effect(character, stat_name, sign * value)
+
+
+def describe_item_effects(effects):
+    """Format effects for messages, e.g. '+5 strength, +2 magic'"""
+    return ", ".join(f"+{value} {stat}" for stat, value in effects)
 
 
 def apply_stat_effect(character, stat_name, value):
@@ -315,10 +441,12 @@ def display_inventory(character, item_data_dict):
     Display inventory in a readable format.
     """
     inventory = character.get("inventory", [])
-    counts = {}
-
-    for item_id in inventory:
-        counts[item_id] = counts.get(item_id, 0) + 1
+    if isinstance(inventory, Inventory):
+        counts = inventory.counts()
+    else:
+        counts = {}
+        for item_id in inventory:
+            counts[item_id] = counts.get(item_id, 0) + 1
 
     print("Inventory:")
     if not counts:
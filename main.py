@@ -26,8 +26,13 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+quest_graph = None
 game_running = False
 
+# Autosave writes at most once per this many seconds, and only on change
+AUTOSAVE_INTERVAL = 5.0
+autosave = None
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -71,14 +76,16 @@ def load_game():
 
     print("\nLoading a saved game...")
 
-    saved_characters = character_manager.list_saved_characters()
+    # Most recently played first; read from the roster, not the save files
+    roster = character_manager.list_roster(sort="recent")
+    saved_characters = [entry['name'] for entry in roster]
     if not saved_characters:
         print("No saved characters found.")
         return
 
     print("\nSaved Characters:")
-    for idx, char_name in enumerate(saved_characters, 1):
-        print(f"{idx}. {char_name}")
+    for idx, entry in enumerate(roster, 1):
+        print(f"{idx}. {entry['name']} (Level {entry['level']} {entry['class']})")
 
     while True:
         choice = input("Select a character to load (number): ")
@@ -100,10 +107,21 @@ def load_game():
 
 def game_loop():
     """Primary loop for in-game actions"""
-    global game_running, current_character
+    global game_running, current_character, autosave
     game_running = True
 
+    # The character was just created or loaded, so it starts out clean
+    autosave = character_manager.SaveScheduler(min_interval=AUTOSAVE_INTERVAL)
+    autosave.mark_saved(current_character)
+
+    # Keep the available-quest list up to date incrementally instead of
+    # rescanning the catalog every time the quest menu is opened
+    if quest_graph is not None:
+        quest_handler.attach_quest_tracker(current_character, quest_graph)
+
     while game_running:
+        # A change held back by the interval is written once it has passed
+        autosave_pending()
         choice = game_menu()
 
         if choice == 1:
@@ -121,9 +139,10 @@ def game_loop():
             print("Exiting to main menu...")
             game_running = False
 
-        # Save after each action unless quitting
+        # Autosave after each action unless quitting; viewing screens
+        # leave the character unchanged and never touch the disk
         if game_running:
-            save_game()
+            autosave_game()
 
 
 def game_menu():
@@ -197,7 +216,7 @@ def quest_menu():
 
     elif choice == "2":
         print("\nAvailable Quests:")
-        for q in quest_handler.get_available_quests(current_character, all_quests):
+        for q in quest_handler.get_available_quests(current_character, all_quests, quest_graph):
             print(f"- {q['name']}: {q['description']}")
 
     elif choice == "3":
@@ -289,26 +308,60 @@ def shop():
 def save_game():
     try:
         character_manager.save_character(current_character)
+        # Don't report success until queued async saves are on disk
+        character_manager.flush_saves()
+        if autosave is not None:
+            autosave.mark_saved(current_character)
         print("Game saved.")
     except Exception as e:
         print(f"Error saving: {e}")
 
 
+def autosave_game():
+    """Save only if the character changed, at most once per AUTOSAVE_INTERVAL"""
+    try:
+        if autosave.request_save(current_character):
+            print("Game saved.")
+    except Exception as e:
+        print(f"Error saving: {e}")
+
+
+def autosave_pending():
+    """Write an autosave that was deferred by AUTOSAVE_INTERVAL, if due"""
+    try:
+        if autosave.tick():
+            print("Game saved.")
+    except Exception as e:
+        print(f"Error saving: {e}")
+
+
 def load_game_data():
-    global all_quests, all_items
+    """
+    Load quests, items and the enemy catalog
+    
+    Missing data files are replaced with the defaults first.
+    
+    Raises: InvalidDataFormatError, CorruptedDataError if a data file is bad
+    """
+    global all_quests, all_items, quest_graph
 
     try:
         all_quests = game_data.load_quests()
         all_items = game_data.load_items()
+        # Loaded once here; combat_system reads the same pool later
+        combat_system.get_enemy_pool()
     except MissingDataFileError:
         print("Missing data files. Creating defaults...")
         game_data.create_default_data_files()
         all_quests = game_data.load_quests()
         all_items = game_data.load_items()
+        combat_system.get_enemy_pool()
     except InvalidDataFormatError as e:
         print(f"Invalid data format: {e}")
         raise
 
+    quest_graph = quest_handler.QuestGraph(all_quests)
+
 
 def handle_character_death():
     global game_running
@@ -351,15 +404,20 @@ def main():
         print("Data files corrupted. Fix them and try again.")
         return
 
-    while True:
-        choice = main_menu()
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("Thanks for playing Quest Chronicles!")
-            break
+    # Write saves on a background thread so actions don't wait on fsync
+    character_manager.enable_async_saves()
+    try:
+        while True:
+            choice = main_menu()
+            if choice == 1:
+                new_game()
+            elif choice == 2:
+                load_game()
+            elif choice == 3:
+                print("Thanks for playing Quest Chronicles!")
+                break
+    finally:
+        character_manager.disable_async_saves()
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ AI Usage: [Document any AI assistance used]
 This module handles quest management, dependencies, and completion.
 """
 
+from bisect import bisect_left, bisect_right
+
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -17,6 +19,84 @@ from custom_exceptions import (
     InsufficientLevelError
 )
 
+# ============================================================================
+# QUEST LOG
+# ============================================================================
+
+class QuestLog:
+    """
+    Insertion-ordered set of quest ids used for active/completed quests
+    
+    Backed by a dict, so membership tests and removal are O(1) while
+    iteration (and therefore the save file) keeps the order quests were
+    added in. Supports the list methods the game uses on quest lists
+    (append, remove, index, len, iteration, comparison with lists).
+    """
+    __slots__ = ("_ids",)
+
+    def __init__(self, quest_ids=()):
+        self._ids = dict.fromkeys(quest_ids)
+
+    def append(self, quest_id):
+        """Add quest_id at the end (no-op if it is already present)"""
+        self._ids[quest_id] = None
+
+    add = append
+
+    def extend(self, quest_ids):
+        for quest_id in quest_ids:
+            self._ids[quest_id] = None
+
+    def remove(self, quest_id):
+        """Remove quest_id; raises ValueError if missing, like list.remove"""
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id!r} not in quest log") from None
+
+    def discard(self, quest_id):
+        self._ids.pop(quest_id, None)
+
+    def clear(self):
+        self._ids.clear()
+
+    def copy(self):
+        return QuestLog(self._ids)
+
+    def index(self, quest_id):
+        for i, qid in enumerate(self._ids):
+            if qid == quest_id:
+                return i
+        raise ValueError(f"{quest_id!r} not in quest log")
+
+    def count(self, quest_id):
+        return 1 if quest_id in self._ids else 0
+
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __reversed__(self):
+        return reversed(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        return list(self._ids)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (QuestLog, list, tuple)):
+            return list(self._ids) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"QuestLog({list(self._ids)!r})"
+
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
@@ -58,6 +138,10 @@ def accept_quest(character, quest_id, quest_data_dict):
     # 6. Accept quest
     active.append(quest_id)
     character["active_quests"] = active
+
+    tracker = character.get("quest_tracker")
+    if tracker is not None:
+        tracker.quest_accepted(character, quest_id)
     return True
 
 
@@ -86,6 +170,10 @@ def complete_quest(character, quest_id, quest_data_dict):
         completed.append(quest_id)
     character["completed_quests"] = completed
 
+    tracker = character.get("quest_tracker")
+    if tracker is not None:
+        tracker.quest_completed(character, quest_id)
+
     # 5. Reward
     xp = quest["reward_xp"]
     gold = quest["reward_gold"]
@@ -112,6 +200,10 @@ def abandon_quest(character, quest_id):
 
     active.remove(quest_id)
     character["active_quests"] = active
+
+    tracker = character.get("quest_tracker")
+    if tracker is not None:
+        tracker.quest_abandoned(character, quest_id)
     return True
 
 
@@ -131,10 +223,21 @@ def get_completed_quests(character, quest_data_dict):
     return [quest_data_dict[qid] for qid in completed if qid in quest_data_dict]
 
 
-def get_available_quests(character, quest_data_dict):
+def get_available_quests(character, quest_data_dict, quest_graph=None):
     """
     Quests character can accept right now
+    
+    With a QuestGraph for the same catalog, only root quests and the
+    dependents of completed quests are checked instead of every quest.
+    A QuestTracker attached to the character answers without any scan.
     """
+    tracker = character.get("quest_tracker")
+    if tracker is not None and tracker.graph.quest_data is quest_data_dict:
+        return [quest_data_dict[qid] for qid in tracker.available_quests()]
+
+    if quest_graph is not None:
+        return [quest_data_dict[qid] for qid in quest_graph.available_quests(character)]
+
     active = set(character.get("active_quests", []))
     completed = set(character.get("completed_quests", []))
     level = character.get("level", 1)
@@ -203,13 +306,20 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest {quest_id} not found")
 
     chain = []
+    seen = set()
     current = quest_id
 
     while True:
         if current not in quest_data_dict:
             raise QuestNotFoundError(f"Quest {current} not found")
+        if current in seen:
+            cycle = chain[chain.index(current):] + [current]
+            raise QuestRequirementsNotMetError(
+                f"Prerequisite cycle: {' -> '.join(cycle)}"
+            )
 
-        chain.insert(0, current)
+        seen.add(current)
+        chain.append(current)
 
         prereq = quest_data_dict[current].get("prerequisite", "NONE")
         if prereq == "NONE":
@@ -217,8 +327,201 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
 
         current = prereq
 
+    # Built from the quest back to its root; flip to earliest-first
+    chain.reverse()
     return chain
 
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Prerequisite index built once from a quest catalog
+    
+    Holds reverse dependencies (prerequisite -> quests it unlocks), the
+    root quests, a topological order and quests bucketed by required
+    level, so availability checks only look at quests whose
+    prerequisite was just completed instead of the whole catalog.
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_data = quest_data_dict
+        self.position = {}        # quest_id -> index in catalog order
+        self.dependents = {}      # quest_id -> [quest_ids it unlocks]
+        self.roots = []           # quests with no prerequisite
+        self.level_buckets = {}   # required_level -> [quest_ids]
+        self.depth = {}           # quest_id -> number of prerequisites above it
+
+        for pos, (qid, quest) in enumerate(quest_data_dict.items()):
+            self.position[qid] = pos
+            prereq = quest.get("prerequisite", "NONE")
+            if prereq == "NONE":
+                self.roots.append(qid)
+            else:
+                self.dependents.setdefault(prereq, []).append(qid)
+            self.level_buckets.setdefault(quest["required_level"], []).append(qid)
+
+        self.levels = sorted(self.level_buckets)
+        self.topological_order = self._topological_sort()
+
+    def _topological_sort(self):
+        """Breadth-first order from the roots; quests never reached are left out"""
+        order = list(self.roots)
+        for qid in self.roots:
+            self.depth[qid] = 0
+        for qid in order:
+            for child in self.dependents.get(qid, ()):
+                self.depth[child] = self.depth[qid] + 1
+                order.append(child)
+        return order
+
+    def unlocked_by(self, quest_id):
+        """Quest ids that list quest_id as their prerequisite"""
+        return self.dependents.get(quest_id, [])
+
+    def can_accept(self, character, quest_id):
+        """Same rules as can_accept_quest, using the character's sets directly"""
+        quest = self.quest_data[quest_id]
+        completed = character.get("completed_quests", [])
+        if quest_id in completed or quest_id in character.get("active_quests", []):
+            return False
+        if character.get("level", 1) < quest["required_level"]:
+            return False
+        prereq = quest.get("prerequisite", "NONE")
+        return prereq == "NONE" or prereq in completed
+
+    def newly_available(self, character, quest_id):
+        """Dependents of a just-completed quest that the character can now accept"""
+        return [qid for qid in self.unlocked_by(quest_id) if self.can_accept(character, qid)]
+
+    def available_quests(self, character):
+        """
+        Quest ids the character can accept, in catalog order
+        
+        A QuestTracker for this graph attached to the character answers
+        from its maintained sets. Otherwise only root quests and
+        dependents of completed quests are examined.
+        """
+        tracker = character.get("quest_tracker")
+        if tracker is not None and tracker.graph is self:
+            return tracker.available_quests()
+
+        completed = _as_set(character.get("completed_quests", []))
+        active = _as_set(character.get("active_quests", []))
+        level = character.get("level", 1)
+
+        candidates = list(self.roots)
+        for qid in completed:
+            candidates.extend(self.dependents.get(qid, ()))
+
+        available = [
+            qid for qid in candidates
+            if qid not in completed
+            and qid not in active
+            and level >= self.quest_data[qid]["required_level"]
+        ]
+        available.sort(key=self.position.__getitem__)
+        return available
+
+    def quests_by_level(self, min_level, max_level):
+        """Quest ids with min_level <= required_level <= max_level"""
+        lo = bisect_left(self.levels, min_level)
+        hi = bisect_right(self.levels, max_level)
+        return [qid for level in self.levels[lo:hi] for qid in self.level_buckets[level]]
+
+    def prerequisite_chain(self, quest_id):
+        """
+        Chain from the earliest prerequisite to quest_id
+        
+        Uses the depths computed with the topological order, so the chain
+        is filled in place in O(chain length).
+        
+        Raises: QuestNotFoundError if the quest or a prerequisite is missing
+        """
+        if quest_id not in self.depth:
+            # Not reachable from a root: let the plain walk report the gap
+            return get_quest_prerequisite_chain(quest_id, self.quest_data)
+
+        chain = [None] * (self.depth[quest_id] + 1)
+        current = quest_id
+        for i in range(len(chain) - 1, -1, -1):
+            chain[i] = current
+            current = self.quest_data[current].get("prerequisite", "NONE")
+        return chain
+
+class QuestTracker:
+    """
+    Incrementally maintained set of quests a character can accept
+    
+    Attach with attach_quest_tracker(). accept_quest, complete_quest,
+    abandon_quest and character_manager.gain_experience report changes
+    to the tracker, which only re-checks the quests affected by each
+    change. Quests whose prerequisite is done but whose level is too
+    high wait in per-level buckets until the character levels up.
+    """
+
+    def __init__(self, character, quest_graph):
+        self.graph = quest_graph
+        self.available = set()
+        self.level_locked = {}  # required_level -> {quest_ids}
+        self.level = character.get("level", 1)
+        self.completed = set(character.get("completed_quests", []))
+
+        self._consider(character, quest_graph.roots)
+        for qid in self.completed:
+            self._consider(character, quest_graph.unlocked_by(qid))
+
+    def _consider(self, character, quest_ids):
+        """Place quests whose prerequisite is met into available or a level bucket"""
+        completed = self.completed
+        active = character.get("active_quests", [])
+        for qid in quest_ids:
+            if qid in completed or qid in active:
+                continue
+            required = self.graph.quest_data[qid]["required_level"]
+            if self.level >= required:
+                self.available.add(qid)
+            else:
+                self.level_locked.setdefault(required, set()).add(qid)
+
+    def quest_accepted(self, character, quest_id):
+        self.available.discard(quest_id)
+
+    def quest_abandoned(self, character, quest_id):
+        self._consider(character, (quest_id,))
+
+    def quest_completed(self, character, quest_id):
+        self.completed.add(quest_id)
+        self.available.discard(quest_id)
+        self._consider(character, self.graph.unlocked_by(quest_id))
+
+    def level_changed(self, character):
+        """Release quests that were waiting on the character's new level"""
+        old_level, self.level = self.level, character.get("level", 1)
+        for level in range(old_level + 1, self.level + 1):
+            self._consider(character, self.level_locked.pop(level, ()))
+
+    def available_quests(self):
+        """Available quest ids in catalog order"""
+        return sorted(self.available, key=self.graph.position.__getitem__)
+
+def _as_set(quest_ids):
+    """quest_ids itself if membership is already O(1), else a set copy"""
+    if isinstance(quest_ids, (set, frozenset, QuestLog)):
+        return quest_ids
+    return set(quest_ids)
+
+def attach_quest_tracker(character, quest_graph):
+    """
+    Attach a QuestTracker for quest_graph's catalog to the character
+    
+    Returns: The tracker (also stored as character["quest_tracker"])
+    """
+    tracker = QuestTracker(character, quest_graph)
+    character["quest_tracker"] = tracker
+    return tracker
+
 # ============================================================================
 # QUEST STATISTICS
 # ============================================================================
@@ -288,13 +591,118 @@ def display_character_quest_progress(character, quest_data_dict):
 # ============================================================================
 
 def validate_quest_prerequisites(quest_data_dict):
+    """
+    Check that every prerequisite exists and no prerequisites form a cycle
+    
+    Returns: True if valid
+    Raises:
+        QuestNotFoundError for the first missing prerequisite
+        QuestRequirementsNotMetError for the first prerequisite cycle
+    """
+    report = check_quest_catalog(quest_data_dict)
+    if report["dangling"]:
+        qid, prereq = report["dangling"][0]
+        raise QuestNotFoundError(
+            f"Prerequisite {prereq} for quest {qid} not found"
+        )
+    if report["cycles"]:
+        raise QuestRequirementsNotMetError(
+            f"Prerequisite cycle: {' -> '.join(report['cycles'][0])}"
+        )
+    return True
+
+
+def check_quest_catalog(quest_data_dict):
+    """
+    Report every prerequisite problem in a quest catalog in one linear pass
+    
+    Returns: Dictionary with:
+        dangling: [(quest_id, missing_prerequisite)]
+        cycles: [[quest_id, prerequisite, ..., quest_id]] one path per cycle
+        unreachable: [quest_id] that can never be unlocked from a root quest
+        level_inversions: [(quest_id, prerequisite)] where the prerequisite
+                          requires a higher level than the quest itself
+        valid: True if there are no dangling prerequisites or cycles
+    """
+    dangling = []
+    level_inversions = []
+    dependents = {}
+    roots = []
+
     for qid, data in quest_data_dict.items():
         prereq = data.get("prerequisite", "NONE")
-        if prereq != "NONE" and prereq not in quest_data_dict:
-            raise QuestNotFoundError(
-                f"Prerequisite {prereq} for quest {qid} not found"
-            )
-    return True
+        if prereq == "NONE":
+            roots.append(qid)
+        elif prereq not in quest_data_dict:
+            dangling.append((qid, prereq))
+        else:
+            dependents.setdefault(prereq, []).append(qid)
+            if quest_data_dict[prereq]["required_level"] > data["required_level"]:
+                level_inversions.append((qid, prereq))
+
+    # Each quest has at most one prerequisite, so following prerequisite
+    # links from every quest once (with a done-set) finds all cycles
+    cycles = []
+    done = set()
+    for start in quest_data_dict:
+        path = []
+        on_path = {}
+        current = start
+        while current in quest_data_dict and current not in done:
+            if current in on_path:
+                cycles.append(path[on_path[current]:] + [current])
+                break
+            on_path[current] = len(path)
+            path.append(current)
+            prereq = quest_data_dict[current].get("prerequisite", "NONE")
+            if prereq == "NONE":
+                break
+            current = prereq
+        done.update(path)
+
+    # Everything not reachable from a root is stuck behind a cycle or a
+    # missing prerequisite
+    reachable = set(roots)
+    frontier = list(roots)
+    while frontier:
+        for child in dependents.get(frontier.pop(), ()):
+            if child not in reachable:
+                reachable.add(child)
+                frontier.append(child)
+    unreachable = [qid for qid in quest_data_dict if qid not in reachable]
+
+    return {
+        "dangling": dangling,
+        "cycles": cycles,
+        "unreachable": unreachable,
+        "level_inversions": level_inversions,
+        "valid": not dangling and not cycles,
+    }
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def benchmark_quest_log(count=10000, lookups=10000):
+    """Compare list and QuestLog membership/removal with `count` completed quests"""
+    import time
+
+    quest_ids = [f"quest_{i}" for i in range(count)]
+    probes = [quest_ids[(i * 7919) % count] for i in range(lookups)]
+
+    for label, make in (("list", list), ("QuestLog", QuestLog)):
+        log = make(quest_ids)
+        start = time.perf_counter()
+        for qid in probes:
+            qid in log
+        lookup_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for qid in quest_ids[::-1][:1000]:
+            log.remove(qid)
+        remove_time = time.perf_counter() - start
+        print(f"{label:>8}: {lookups} lookups {lookup_time * 1000:.1f}ms, "
+              f"1000 removals {remove_time * 1000:.1f}ms")
 
 # ============================================================================
 # TESTING
@@ -330,3 +738,16 @@ if __name__ == "__main__":
     # except QuestRequirementsNotMetError as e:
     #     print(f"Cannot accept: {e}")
 
+    # Compare quest list and QuestLog performance
+    # benchmark_quest_log()
+
+    # Validate a quest file, e.g. in CI:  python quest_handler.py data/quests.txt
+    import sys
+    if len(sys.argv) > 1:
+        import game_data
+        report = check_quest_catalog(game_data.load_quests(sys.argv[1], use_cache=False))
+        for key in ("dangling", "cycles", "unreachable", "level_inversions"):
+            print(f"{key}: {len(report[key])}")
+            for entry in report[key][:20]:
+                print(f"  {entry}")
+        sys.exit(0 if report["valid"] else 1)
@@ -0,0 +1,27 @@
+"""
+Shared test setup
+Saves made through the default storage go to a temporary directory
+instead of data/save_games
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+@pytest.fixture(scope="session", autouse=True)
+def temporary_save_directory(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("save_games"))
+    previous = os.environ.get("QC_SAVE_PATH")
+    os.environ["QC_SAVE_PATH"] = path
+    character_manager.configure_storage("text")
+    yield path
+
+    if previous is None:
+        del os.environ["QC_SAVE_PATH"]
+    else:
+        os.environ["QC_SAVE_PATH"] = previous
+    character_manager.configure_storage("text")
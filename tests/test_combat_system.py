@@ -0,0 +1,302 @@
+"""
+Test Combat System
+Tests headless battles with policies, event sinks and seeded randomness
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import combat_system
+import combat_simulation
+
+def run_battle(character_class, policy, seed, enemy_type="orc"):
+    events = []
+    char = character_manager.create_character("Sim", character_class)
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy(enemy_type),
+                                        policy, events.append, random.Random(seed))
+    return battle.run(), events
+
+# ============================================================================
+# HEADLESS BATTLE TESTS
+# ============================================================================
+
+def test_seeded_battles_are_reproducible():
+    """Test that the same seed replays the same battle event for event"""
+    for make_policy in (combat_system.RandomPolicy, combat_system.GreedyPolicy):
+        first = run_battle("Rogue", make_policy(), seed=7)
+        assert run_battle("Rogue", make_policy(), seed=7) == first
+
+    outcomes = {tuple(run_battle("Rogue", combat_system.RandomPolicy(), seed)[1]) for seed in range(5)}
+    assert len(outcomes) > 1
+
+def test_scripted_policy_and_events():
+    """Test that scripted actions are played in order, then the default"""
+    policy = combat_system.ScriptedPolicy(["special", "item"], default="fight")
+    winner, events = run_battle("Warrior", policy, seed=1, enemy_type="goblin")
+
+    assert winner == 'player'
+    assert events[0].kind == "start" and events[0].turn == 0
+    player = [e.message for e in events if e.kind == "player"]
+    assert player[0].startswith("Sim used Power Strike")
+    assert "nothing useful" in player[1]
+    assert player[2].startswith("You hit the Goblin")
+    assert [e.turn for e in events if e.kind == "status"] == list(range(1, events[-1].turn + 1))
+
+def test_scripted_special_on_cooldown_raises():
+    """Test that headless battles keep the cooldown rule"""
+    char = character_manager.create_character("Sim", "Cleric")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("dragon"),
+                                        combat_system.ScriptedPolicy(["special", "special"]),
+                                        rng=random.Random(3))
+    with pytest.raises(AbilityOnCooldownError):
+        battle.start_battle()
+
+def test_headless_battle_prints_nothing(capsys):
+    """Test that a policy without an event sink produces no output"""
+    char = character_manager.create_character("Quiet", "Mage")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"),
+                                        combat_system.GreedyPolicy(), rng=random.Random(5))
+    result = battle.start_battle()
+
+    assert result['winner'] == 'player'
+    assert capsys.readouterr().out == ""
+
+def test_interactive_battle_reads_input(monkeypatch, capsys):
+    """Test that the default policy still prompts and prints"""
+    monkeypatch.setattr("builtins.input", lambda prompt: "fight")
+    char = character_manager.create_character("Loud", "Warrior")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"))
+    battle.rng = random.Random(2)
+
+    assert battle.start_battle()['winner'] == 'player'
+    out = capsys.readouterr().out
+    assert "--- Combat Status ---" in out and ">>> Victory!" in out
+
+# ============================================================================
+# EXPECTED OUTCOME TESTS
+# ============================================================================
+
+def test_expected_outcome_for_certain_fights():
+    """Test the solver on fights with no randomness in the result"""
+    warrior = character_manager.create_character("Odds", "Warrior")
+    odds = combat_system.expected_outcome(warrior, combat_system.create_enemy("goblin"))
+    assert odds['win_probability'] == 1.0
+    assert odds['expected_turns'] == pytest.approx(3.0)
+    assert odds['expected_xp'] == 25
+
+    warrior['health'] = 1
+    odds = combat_system.expected_outcome(warrior, combat_system.create_enemy("dragon"))
+    assert odds['win_probability'] == pytest.approx(0.0, abs=1e-9)
+    assert odds['expected_turns'] == pytest.approx(1 / 0.95)
+
+def test_expected_outcome_matches_simulation():
+    """Test that exact odds agree with simulated greedy battles"""
+    rogue = combat_simulation.character_for_level("Rogue", 7)
+    odds = combat_system.expected_outcome(rogue, combat_system.create_enemy("dragon"))
+    summary = combat_simulation.simulate_matchup("Rogue", "dragon", level=7, battles=4000,
+                                                 policy="greedy", vectorized=False)
+    assert 0 < odds['win_probability'] < 1
+    assert summary['win_rate'] == pytest.approx(odds['win_probability'], abs=0.03)
+
+    optimal = combat_system.expected_outcome(rogue, combat_system.create_enemy("dragon"), "optimal")
+    assert optimal['win_probability'] >= odds['win_probability']
+
+def test_expected_outcome_of_long_fight():
+    """Test that a fight hundreds of rounds long is solved without recursion"""
+    mage = combat_simulation.character_for_level("Mage", 1)
+    enemy = dict(combat_system.create_enemy("goblin"), health=2000, max_health=2000)
+    odds = combat_system.expected_outcome(mage, enemy, "optimal")
+    assert odds['win_probability'] == pytest.approx(0.0, abs=1e-9)
+
+    mage.update(health=10 ** 5, max_health=10 ** 5)
+    odds = combat_system.expected_outcome(mage, enemy)
+    assert odds['win_probability'] == pytest.approx(1.0)
+    assert odds['expected_turns'] > 50
+
+def test_pick_enemy_scales_with_level():
+    """Test that characters are only matched with enemies of their level"""
+    assert combat_system.pick_enemy(combat_simulation.character_for_level("Mage", 1)) == "goblin"
+    assert combat_system.pick_enemy(combat_simulation.character_for_level("Mage", 4)) == "orc"
+    assert combat_system.pick_enemy(combat_simulation.character_for_level("Mage", 6)) == "dragon"
+    with pytest.raises(ValueError):
+        combat_system.expected_outcome(character_manager.create_character("X", "Mage"),
+                                       combat_system.create_enemy("orc"), "psychic")
+
+# ============================================================================
+# COMBAT SIMULATION TESTS
+# ============================================================================
+
+def test_simulation_tallies_add_up():
+    """Test that every simulated battle is counted once"""
+    summary = combat_simulation.simulate_matchup("Rogue", "orc", battles=500,
+                                                 policy="random", seed=4, vectorized=False)
+    assert summary['wins'] + summary['losses'] + summary['escapes'] + summary['unfinished'] == 500
+    assert sum(summary['turns_to_kill'].values()) == sum(summary['hp_left'].values()) == summary['wins']
+    assert summary == combat_simulation.simulate_matchup("Rogue", "orc", battles=500,
+                                                         policy="random", seed=4, vectorized=False)
+
+def test_character_for_level_uses_level_ups():
+    """Test that simulated characters get the real level-up stats"""
+    char = combat_simulation.character_for_level("Mage", 3)
+    assert (char['level'], char['max_health'], char['magic']) == (3, 100, 24)
+
+def test_simulation_rejects_unknown_policy():
+    """Test that an unknown policy name raises ValueError"""
+    with pytest.raises(ValueError):
+        combat_simulation.simulate_matchup("Warrior", "orc", policy="turtle")
+
+def test_simulate_battles_independent_of_workers():
+    """Test that sharded runs merge to the same result for any worker count"""
+    config = {'character_class': "Cleric", 'level': 2, 'policy': "random",
+              'seed': 9, 'vectorized': False, 'shard_size': 250}
+    progress = []
+    single = combat_simulation.simulate_battles(config, 1000, workers=1,
+                                                on_progress=progress.append)
+    pooled = combat_simulation.simulate_battles(config, 1000, workers=2)
+
+    assert pooled == single
+    assert single['battles'] == 1000
+    assert [p['battles'] for p in progress] == [250, 500, 750, 1000]
+
+def test_simulate_battles_picks_enemy_for_level():
+    """Test that enemy_type defaults to the level-appropriate enemy"""
+    config = {'character_class': "Warrior", 'level': 1, 'policy': "fight", 'vectorized': False}
+    summary = combat_simulation.simulate_battles(config, 10, workers=1)
+    goblin = combat_simulation.simulate_matchup("Warrior", "goblin", battles=10,
+                                                policy="fight", vectorized=False)
+    assert summary['turns_to_kill'] == goblin['turns_to_kill'] == {4: 10}
+
+def test_simulate_battles_default_enemy_follows_seed(monkeypatch):
+    """Test that the default enemy is drawn from the seed, not the global random state"""
+    draws = []
+    def pick(level, rng=None):
+        draws.append(rng.random())
+        return combat_system.create_enemy("orc")
+    monkeypatch.setattr(combat_simulation, "get_random_enemy_for_level", pick)
+
+    config = {'character_class': "Warrior", 'level': 3, 'policy': "fight",
+              'seed': 3, 'vectorized': False}
+    combat_simulation.simulate_battles(config, 5, workers=1)
+    assert draws == [random.Random(3).random()]
+
+    config['seed'] = -1
+    with pytest.raises(ValueError):
+        combat_simulation.simulate_battles(config, 5, workers=1)
+
+def test_array_engine_matches_loop():
+    """Test that the NumPy engine reproduces SimpleBattle's results"""
+    pytest.importorskip("numpy")
+    for policy in ("fight", "greedy"):
+        arrays = combat_simulation.simulate_matchup("Warrior", "goblin", battles=2000,
+                                                    policy=policy, vectorized=True)
+        loop = combat_simulation.simulate_matchup("Warrior", "goblin", battles=2000,
+                                                  policy=policy, vectorized=False)
+        assert arrays['turns_to_kill'] == loop['turns_to_kill']
+
+    arrays = combat_simulation.simulate_matchup("Rogue", "orc", battles=20000, policy="random")
+    loop = combat_simulation.simulate_matchup("Rogue", "orc", battles=20000, policy="random",
+                                              vectorized=False)
+    assert arrays['win_rate'] == pytest.approx(loop['win_rate'], abs=0.03)
+    assert arrays['mean_turns_to_kill'] == pytest.approx(loop['mean_turns_to_kill'], abs=0.2)
+
+# ============================================================================
+# ENEMY SPAWNING TESTS
+# ============================================================================
+
+ENEMY_TEXT = (
+    "ENEMY_ID: rat\nNAME: Rat\nHEALTH: 10\nSTRENGTH: 3\nMAGIC: 0\n"
+    "XP_REWARD: 5\nGOLD_REWARD: 1\nMIN_LEVEL: 1\nMAX_LEVEL: 3\nWEIGHT: 3\n"
+    "\n"
+    "ENEMY_ID: wolf\nNAME: Wolf\nHEALTH: 40\nSTRENGTH: 9\nMAGIC: 0\n"
+    "XP_REWARD: 20\nGOLD_REWARD: 5\nMIN_LEVEL: 2\nMAX_LEVEL: NONE\nWEIGHT: 1\n"
+)
+
+def make_pool(tmp_path):
+    path = tmp_path / "enemies.txt"
+    path.write_text(ENEMY_TEXT)
+    return combat_system.EnemyPool(game_data.load_enemies(str(path)))
+
+def test_enemy_pool_level_buckets(tmp_path):
+    """Test that each level draws only from the enemies whose range covers it"""
+    pool = make_pool(tmp_path)
+    assert pool.enemy_types(1) == ["rat"]
+    assert pool.enemy_types(3) == ["rat", "wolf"]
+    assert pool.enemy_types(50) == ["wolf"]
+    assert pool.enemy_types(0) == []
+    with pytest.raises(InvalidTargetError):
+        pool.spawn(0)
+
+def test_spawn_batch_follows_weights(tmp_path):
+    """Test that overlapping enemies spawn in proportion to WEIGHT"""
+    pool = make_pool(tmp_path)
+    enemies = pool.spawn_batch(2, 8000, random.Random(11))
+    rats = sum(1 for enemy in enemies if enemy['type'] == "rat")
+    assert rats / len(enemies) == pytest.approx(0.75, abs=0.02)
+
+    prob, alias = combat_system.build_alias_table([1, 2, 5])
+    chances = [p / 3 for p in prob]
+    for idx, p in enumerate(prob):
+        chances[alias[idx]] += (1 - p) / 3
+    assert chances == pytest.approx([1 / 8, 2 / 8, 5 / 8])
+
+def test_single_candidate_draws_no_random_number(tmp_path):
+    """Test that a level with one eligible enemy leaves the rng alone"""
+    pool = make_pool(tmp_path)
+    rng = random.Random(5)
+    state = rng.getstate()
+    assert pool.choose(1, rng)['type'] == "rat"
+    assert len(pool.spawn_batch(50, 3, rng)) == 3
+    combat_system.get_random_enemy_for_level(6, rng)
+    assert rng.getstate() == state
+
+    pool.choose(2, rng)
+    assert rng.getstate() != state
+
+def test_spawned_enemies_share_templates(tmp_path):
+    """Test that spawned enemies share stats but not health, and can fight"""
+    pool = make_pool(tmp_path)
+    first, second = pool.spawn_batch(1, 2)
+    assert first.template is second.template
+    assert not hasattr(first, "__dict__")
+
+    first['health'] = 1
+    assert (first['health'], second['health'], second['max_health']) == (1, 10, 10)
+    with pytest.raises(TypeError):
+        first['strength'] = 99
+
+    char = character_manager.create_character("Exterminator", "Warrior")
+    battle = combat_system.SimpleBattle(char, second, combat_system.GreedyPolicy(),
+                                        rng=random.Random(1))
+    assert battle.start_battle() == {'winner': 'player', 'xp_gained': 5, 'gold_gained': 1}
+    assert second['health'] == 0 and first['health'] == 1
+
+def test_random_enemy_for_level_uses_catalog():
+    """Test that the default catalog keeps the original level tiers"""
+    tiers = {1: "goblin", 2: "goblin", 3: "orc", 5: "orc", 6: "dragon", 20: "dragon"}
+    for level, enemy_type in tiers.items():
+        enemy = combat_system.get_random_enemy_for_level(level)
+        assert enemy == combat_system.create_enemy(enemy_type)
+    assert combat_system.enemy_types() == ["goblin", "orc", "dragon"]
+
+def test_enemies_load_from_any_directory(tmp_path, monkeypatch):
+    """Test that create_enemy and level picks use the catalog next to the module"""
+    monkeypatch.chdir(tmp_path)
+    templates = combat_system.get_enemy_pool().templates
+    assert combat_system.create_enemy("Orc") == templates["orc"]
+    assert combat_system.create_enemy("orc") is not templates["orc"]
+    assert combat_system.get_random_enemy_for_level(1)['type'] == "goblin"
+
+    # Missing files are recreated where the loaders read them, not in the cwd
+    assert os.path.dirname(combat_system.ENEMIES_FILE) == game_data.DATA_DIR
+    game_data.create_default_data_files()
+    assert os.listdir(tmp_path) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
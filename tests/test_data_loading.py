@@ -0,0 +1,304 @@
+"""
+Test Data Loading
+Tests streaming, cached and lazy loading of game data files
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_TEXT = (
+    "QUEST_ID: first\n"
+    "TITLE: First\n"
+    "DESCRIPTION: The first quest\n"
+    "REWARD_XP: 50\n"
+    "REWARD_GOLD: 25\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+    "\n"
+    "\n"
+    "QUEST_ID: second\n"
+    "TITLE: Second\n"
+    "DESCRIPTION: The second quest\n"
+    "REWARD_XP: 100\n"
+    "REWARD_GOLD: 50\n"
+    "REQUIRED_LEVEL: 2\n"
+    "PREREQUISITE: first\n"
+)
+
+# ============================================================================
+# STREAMING PARSER TESTS
+# ============================================================================
+
+def test_iter_quest_blocks_streams_records(tmp_path):
+    """Test that quest blocks are yielded one at a time in file order"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    records = game_data.iter_quest_blocks(str(path))
+    first = next(records)
+    assert first['quest_id'] == "first"
+    assert [q['quest_id'] for q in records] == ["second"]
+
+def test_load_quests_matches_stream(tmp_path):
+    """Test that load_quests builds its dict from the streamed records"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    quests = game_data.load_quests(str(path))
+    assert list(quests) == ["first", "second"]
+    assert quests['second']['prerequisite'] == "first"
+
+def test_stream_reports_block_number(tmp_path):
+    """Test that parse errors name the offending block"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: lots"))
+
+    with pytest.raises(InvalidDataFormatError, match="block #2"):
+        game_data.load_quests(str(path))
+
+# ============================================================================
+# CATALOG CACHE TESTS
+# ============================================================================
+
+def test_catalog_cache_is_written_and_reused(tmp_path):
+    """Test that a fresh cache is used instead of re-parsing the text"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    quests = game_data.load_quests(str(path))
+    assert (tmp_path / "quests.txt.cache").exists()
+    assert game_data.load_quests(str(path)) == quests
+
+def test_catalog_cache_rebuilt_when_stale(tmp_path):
+    """Test that editing the source file invalidates the cache"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests(str(path))
+
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: 999"))
+    assert game_data.load_quests(str(path))['second']['reward_xp'] == 999
+
+def test_catalog_cache_checks_content_digest(tmp_path):
+    """Test that a same-size edit with a restored mtime is not served from the cache"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests(str(path))
+    stat = os.stat(path)
+
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: 999"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert game_data.load_quests(str(path))['second']['reward_xp'] == 999
+
+def test_catalog_cache_is_plain_json(tmp_path):
+    """Test that the cache holds data only and item effects are rebuilt from it"""
+    import json
+    path = tmp_path / "items.txt"
+    path.write_text("ITEM_ID: staff\nNAME: Staff\nTYPE: weapon\n"
+                    "EFFECT: strength:1,magic:4\nCOST: 30\nDESCRIPTION: A staff\n")
+    game_data.load_items(str(path))
+
+    with open(str(path) + ".cache", encoding="utf-8") as f:
+        assert json.loads(f.readline())['kind'] == "item"
+    cached = game_data.load_items(str(path))
+    assert cached['staff'].effects == (('strength', 1), ('magic', 4))
+
+def test_catalog_cache_skips_validation(tmp_path, monkeypatch):
+    """Test that cached records are rebuilt without parsing or validating again"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    quests = game_data.load_quests(str(path))
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("cache hit should not validate")
+    monkeypatch.setattr(game_data.Quest, "__init__", refuse)
+    monkeypatch.setitem(game_data._RECORD_TYPES, "quest", (refuse, refuse))
+    cached = game_data.load_quests(str(path))
+    assert cached == quests
+    assert isinstance(cached['first'], game_data.Quest)
+
+def test_catalog_cache_cut_between_lines_falls_back(tmp_path):
+    """Test that a cache missing its last records is not used"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests(str(path))
+
+    cache = tmp_path / "quests.txt.cache"
+    lines = cache.read_text().splitlines(keepends=True)
+    assert len(lines) == 3
+    cache.write_text("".join(lines[:-1]))
+    assert list(game_data.load_quests(str(path))) == ["first", "second"]
+
+def test_corrupted_catalog_cache_falls_back(tmp_path):
+    """Test that an unreadable cache is ignored"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    (tmp_path / "quests.txt.cache").write_bytes(b"not a pickle")
+
+    assert len(game_data.load_quests(str(path))) == 2
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_loaded_quests():
+    """Test that a LazyCatalog reads the same records as load_quests"""
+    quests = game_data.load_quests("data/quests.txt", use_cache=False)
+    with game_data.open_quest_catalog("data/quests.txt") as catalog:
+        assert list(catalog) == list(quests)
+        for quest_id, quest in quests.items():
+            assert catalog[quest_id] == quest
+        assert "not_a_quest" not in catalog
+        assert catalog.get("not_a_quest") is None
+
+def test_lazy_catalog_cache_is_bounded(tmp_path):
+    """Test that only cache_size parsed records are kept"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    with game_data.LazyCatalog(str(path), "quest", cache_size=1) as catalog:
+        catalog['first']
+        catalog['second']
+        assert list(catalog._cache) == ['second']
+
+def test_lazy_catalog_rejects_duplicates(tmp_path):
+    """Test that duplicate ids are reported when the index is built"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT + "\n" + QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.open_quest_catalog(str(path))
+
+def test_closed_lazy_catalog(tmp_path):
+    """Test that uncached lookups on a closed catalog raise ValueError"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    catalog = game_data.open_quest_catalog(str(path))
+    first = catalog['first']
+    catalog.close()
+    assert catalog['first'] == first
+    with pytest.raises(ValueError, match="closed"):
+        catalog['second']
+
+def test_lazy_catalog_indexes_last_id_line(tmp_path):
+    """Test that a block with two ID lines is indexed under the id it parses to"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT.replace("QUEST_ID: second\n", "QUEST_ID: draft\nQUEST_ID: second\n"))
+
+    with game_data.open_quest_catalog(str(path)) as catalog:
+        assert list(catalog) == list(game_data.load_quests(str(path), use_cache=False))
+        assert catalog['second']['quest_id'] == "second"
+
+# ============================================================================
+# SHARDED CATALOG TESTS
+# ============================================================================
+
+def test_load_catalog_dir_merges_shards(tmp_path):
+    """Test that quest shards are parsed in parallel and merged"""
+    (tmp_path / "quests_a.txt").write_text(QUEST_TEXT)
+    (tmp_path / "quests_b.txt").write_text(
+        QUEST_TEXT.replace("first", "third").replace("second", "fourth"))
+    (tmp_path / "items_a.txt").write_text(
+        "ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\n"
+        "EFFECT: health:20\nCOST: 25\nDESCRIPTION: Heals\n")
+
+    quests, items = game_data.load_catalog_dir(str(tmp_path), workers=2)
+    assert sorted(quests) == ["first", "fourth", "second", "third"]
+    assert list(items) == ["potion"]
+
+def test_load_catalog_dir_reports_cross_shard_duplicates(tmp_path):
+    """Test that duplicates across shards name the file and block"""
+    (tmp_path / "quests_a.txt").write_text(QUEST_TEXT)
+    (tmp_path / "quests_b.txt").write_text(QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError, match="quests_b.txt' block #1"):
+        game_data.load_catalog_dir(str(tmp_path), workers=2)
+
+# ============================================================================
+# RECORD CLASS TESTS
+# ============================================================================
+
+def test_parsed_quests_are_compact_records():
+    """Test that quests are Quest records readable like dictionaries"""
+    quest = game_data.parse_quest_block(QUEST_TEXT.split("\n\n")[0].splitlines())
+
+    assert isinstance(quest, game_data.Quest)
+    assert not hasattr(quest, "__dict__")
+    assert quest['reward_xp'] == 50
+    assert quest.get('missing', 'default') == 'default'
+    assert 'prerequisite' in quest
+    assert quest == quest.to_dict()
+
+def test_records_work_with_quest_handler(tmp_path):
+    """Test that quest_handler queries accept Quest records"""
+    import quest_handler
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    quests = game_data.load_quests(str(path))
+    char = {'level': 2, 'active_quests': [], 'completed_quests': ['first']}
+
+    available = quest_handler.get_available_quests(char, quests)
+    assert [q['quest_id'] for q in available] == ['second']
+    assert len(quest_handler.get_quests_by_level(quests, 1, 1)) == 1
+
+def test_unknown_field_is_ignored():
+    """Test that fields outside the quest schema are skipped as before"""
+    quest = game_data.parse_quest_block(["QUEST_ID: q", "COLOR: red"])
+    assert quest.to_dict() == {'quest_id': 'q'}
+
+# ============================================================================
+# ENEMY CATALOG TESTS
+# ============================================================================
+
+ENEMY_BLOCK = (
+    "ENEMY_ID: bat\n"
+    "NAME: Bat\n"
+    "HEALTH: 15\n"
+    "STRENGTH: 4\n"
+    "MAGIC: 0\n"
+    "XP_REWARD: 8\n"
+    "GOLD_REWARD: 2\n"
+    "MIN_LEVEL: 1\n"
+    "MAX_LEVEL: NONE\n"
+    "WEIGHT: 5\n"
+)
+
+def test_load_enemies_parses_records(tmp_path):
+    """Test that enemy blocks load as EnemyTemplate records"""
+    path = tmp_path / "enemies.txt"
+    path.write_text(ENEMY_BLOCK + "\n" + ENEMY_BLOCK.replace("bat", "bat_king")
+                    .replace("MAX_LEVEL: NONE", "MAX_LEVEL: 4"))
+
+    enemies = game_data.load_enemies(str(path))
+    assert list(enemies) == ["bat", "bat_king"]
+    assert isinstance(enemies['bat'], game_data.EnemyTemplate)
+    assert enemies['bat']['max_level'] is None
+    assert enemies['bat_king']['max_level'] == 4
+
+def test_invalid_enemy_ranges_rejected(tmp_path):
+    """Test that bad weights and level ranges raise InvalidDataFormatError"""
+    path = tmp_path / "enemies.txt"
+    for bad in (ENEMY_BLOCK.replace("WEIGHT: 5", "WEIGHT: 0"),
+                ENEMY_BLOCK.replace("MAX_LEVEL: NONE", "MAX_LEVEL: 0"),
+                ENEMY_BLOCK.replace("HEALTH: 15\n", "")):
+        path.write_text(bad)
+        with pytest.raises(InvalidDataFormatError, match="block #1"):
+            game_data.load_enemies(str(path), use_cache=False)
+
+def test_default_enemies_match_shipped_tiers(tmp_path):
+    """Test that the fallback enemy file has the same tiers as data/enemies.txt"""
+    game_data.create_default_data_files(str(tmp_path))
+    shipped = os.path.join(game_data.DATA_DIR, "enemies.txt")
+    defaults = game_data.load_enemies(str(tmp_path / "enemies.txt"), use_cache=False)
+    assert defaults == game_data.load_enemies(shipped, use_cache=False)
+    assert [(e['min_level'], e['max_level']) for e in defaults.values()] == [
+        (1, 2), (3, 5), (6, None)]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Test Inventory System
+Tests item effects and the inventory container
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+import game_data
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_effects_are_parsed_at_load_time():
+    """Test that catalog items carry pre-parsed effects outside their keys"""
+    items = game_data.load_items("data/items.txt", use_cache=False)
+    assert items['iron_sword'].effects == (('strength', 5),)
+    assert 'effects' not in items['iron_sword']
+    assert items['iron_sword'] == items['iron_sword'].to_dict()
+
+def test_multi_stat_effects():
+    """Test that comma-separated effects apply every stat"""
+    assert game_data.parse_effect_string("strength:5,magic:2") == (('strength', 5), ('magic', 2))
+
+    char = character_manager.create_character("EffectTest", "Mage")
+    char['item_data'] = {
+        'battle_staff': {'type': 'weapon', 'name': 'Battle Staff',
+                         'effect': 'strength:5,magic:2'},
+    }
+    strength, magic = char['strength'], char['magic']
+
+    inventory_system.add_item_to_inventory(char, 'battle_staff')
+    inventory_system.equip_weapon(char, 'battle_staff', char['item_data']['battle_staff'])
+    assert (char['strength'], char['magic']) == (strength + 5, magic + 2)
+
+    inventory_system.unequip_weapon(char)
+    assert (char['strength'], char['magic']) == (strength, magic)
+
+def test_malformed_effect_string():
+    """Test that a bad effect string raises InvalidItemTypeError when used"""
+    char = character_manager.create_character("BadEffect", "Cleric")
+    inventory_system.add_item_to_inventory(char, 'odd_potion')
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.use_item(char, 'odd_potion', {'type': 'consumable', 'effect': 'health'})
+
+# ============================================================================
+# INVENTORY CONTAINER TESTS
+# ============================================================================
+
+def test_inventory_counts_items():
+    """Test the counted inventory through the inventory_system API"""
+    char = character_manager.create_character("CountTest", "Warrior")
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+
+    assert isinstance(char['inventory'], inventory_system.Inventory)
+    assert inventory_system.count_item(char, "health_potion") == 3
+    assert inventory_system.get_inventory_space_remaining(char) == inventory_system.MAX_INVENTORY_SIZE - 4
+
+    inventory_system.remove_item_from_inventory(char, "health_potion")
+    assert inventory_system.count_item(char, "health_potion") == 2
+    assert sorted(inventory_system.clear_inventory(char)) == ["health_potion", "health_potion", "iron_sword"]
+    assert len(char['inventory']) == 0
+
+def test_inventory_stack_limit():
+    """Test that a full stack raises InventoryFullError"""
+    inventory = inventory_system.Inventory(stack_limit=2)
+    inventory.append("arrow")
+    inventory.append("arrow")
+
+    with pytest.raises(InventoryFullError):
+        inventory.append("arrow")
+
+def test_stack_limit_through_inventory_api():
+    """Test that the default stack limit is reached before the inventory is full"""
+    char = character_manager.create_character("Hoarder", "Rogue")
+    assert inventory_system.MAX_STACK_SIZE < inventory_system.MAX_INVENTORY_SIZE
+    for _ in range(inventory_system.MAX_STACK_SIZE):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+    gold = char['gold']
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_item(char, "health_potion", {'cost': 25})
+    assert char['gold'] == gold
+    assert inventory_system.count_item(char, "health_potion") == inventory_system.MAX_STACK_SIZE
+    assert inventory_system.add_item_to_inventory(char, "iron_sword")
+
+def test_inventory_save_format_migration(tmp_path):
+    """Test that old comma-list text saves load as counted inventories"""
+    save = tmp_path / "OldSave_save.txt"
+    char = character_manager.create_character("OldSave", "Rogue")
+    text = character_manager.serialize_character_text(char)
+    save.write_text(text.replace("INVENTORY: ", "INVENTORY: potion,potion,sword"))
+
+    loaded = character_manager.load_character("OldSave", str(tmp_path))
+    assert loaded['inventory'].counts() == {"potion": 2, "sword": 1}
+
+    character_manager.save_character(loaded, str(tmp_path))
+    reloaded = character_manager.load_character("OldSave", str(tmp_path))
+    assert reloaded['inventory'].counts() == {"potion": 2, "sword": 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,165 @@
+"""
+Test Quest Handler
+Tests the quest prerequisite graph and quest tracking structures
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import quest_handler
+
+def make_quest(quest_id, prerequisite="NONE", required_level=1):
+    return {
+        'quest_id': quest_id,
+        'title': quest_id.title(),
+        'description': 'A test quest',
+        'reward_xp': 50,
+        'reward_gold': 25,
+        'required_level': required_level,
+        'prerequisite': prerequisite,
+    }
+
+QUESTS = {
+    'a': make_quest('a'),
+    'b': make_quest('b', 'a'),
+    'c': make_quest('c', 'a', required_level=3),
+    'd': make_quest('d', 'b'),
+    'e': make_quest('e'),
+}
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_structure():
+    """Test reverse dependencies, topological order and level buckets"""
+    graph = quest_handler.QuestGraph(QUESTS)
+
+    assert graph.roots == ['a', 'e']
+    assert graph.unlocked_by('a') == ['b', 'c']
+    order = graph.topological_order
+    assert order.index('a') < order.index('b') < order.index('d')
+    assert sorted(graph.quests_by_level(2, 5)) == ['c']
+    assert graph.prerequisite_chain('d') == ['a', 'b', 'd']
+
+def test_quest_graph_matches_full_scan():
+    """Test that graph-backed availability equals the full catalog scan"""
+    graph = quest_handler.QuestGraph(QUESTS)
+    char = character_manager.create_character("GraphTest", "Warrior")
+
+    for completed in ([], ['a'], ['a', 'b']):
+        char['completed_quests'] = list(completed)
+        expected = quest_handler.get_available_quests(char, QUESTS)
+        assert quest_handler.get_available_quests(char, QUESTS, graph) == expected
+
+    assert graph.newly_available(char, 'b') == ['d']
+
+# ============================================================================
+# QUEST TRACKER TESTS
+# ============================================================================
+
+def test_quest_tracker_follows_quest_actions():
+    """Test that the tracked available set matches a full rescan after each action"""
+    graph = quest_handler.QuestGraph(QUESTS)
+    char = character_manager.create_character("TrackerTest", "Mage")
+    tracker = quest_handler.attach_quest_tracker(char, graph)
+
+    def rescan():
+        return sorted(qid for qid in QUESTS if quest_handler.can_accept_quest(char, qid, QUESTS))
+
+    assert sorted(tracker.available) == rescan() == ['a', 'e']
+
+    quest_handler.accept_quest(char, 'a', QUESTS)
+    assert sorted(tracker.available) == rescan() == ['e']
+
+    quest_handler.complete_quest(char, 'a', QUESTS)
+    assert sorted(tracker.available) == rescan() == ['b', 'e']
+    assert 'c' in tracker.level_locked[3]
+
+    quest_handler.accept_quest(char, 'b', QUESTS)
+    quest_handler.abandon_quest(char, 'b')
+    assert sorted(tracker.available) == rescan()
+
+    character_manager.gain_experience(char, 300)
+    assert char['level'] == 3
+    assert sorted(tracker.available) == rescan() == ['b', 'c', 'e']
+    assert [q['quest_id'] for q in quest_handler.get_available_quests(char, QUESTS)] == ['b', 'c', 'e']
+
+def test_graph_queries_use_attached_tracker():
+    """Test that QuestGraph.available_quests answers from the tracker's sets"""
+    graph = quest_handler.QuestGraph(QUESTS)
+    char = character_manager.create_character("SetTest", "Cleric")
+    tracker = quest_handler.attach_quest_tracker(char, graph)
+
+    quest_handler.accept_quest(char, 'a', QUESTS)
+    quest_handler.complete_quest(char, 'a', QUESTS)
+    assert tracker.completed == {'a'}
+
+    # The tracker, not the completed list, is consulted
+    char['completed_quests'] = None
+    assert graph.available_quests(char) == ['b', 'e']
+
+# ============================================================================
+# CATALOG VALIDATION TESTS
+# ============================================================================
+
+def test_check_quest_catalog_reports_all_problems():
+    """Test that one pass reports dangling links, cycles, unreachable quests and level inversions"""
+    quests = dict(QUESTS)
+    quests['x'] = make_quest('x', 'y')
+    quests['y'] = make_quest('y', 'x')
+    quests['z'] = make_quest('z', 'missing')
+    quests['low'] = make_quest('low', 'c', required_level=2)
+
+    report = quest_handler.check_quest_catalog(quests)
+    assert report['dangling'] == [('z', 'missing')]
+    assert report['cycles'] == [['x', 'y', 'x']]
+    assert sorted(report['unreachable']) == ['x', 'y', 'z']
+    assert report['level_inversions'] == [('low', 'c')]
+    assert report['valid'] is False
+
+def test_prerequisite_cycle_does_not_hang():
+    """Test that prerequisite chains and validation stop on a cycle"""
+    quests = {'x': make_quest('x', 'y'), 'y': make_quest('y', 'x')}
+
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.get_quest_prerequisite_chain('x', quests)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.validate_quest_prerequisites(quests)
+
+# ============================================================================
+# QUEST LOG TESTS
+# ============================================================================
+
+def test_quest_log_is_an_ordered_set():
+    """Test list-compatible behaviour of QuestLog"""
+    log = quest_handler.QuestLog(['b', 'a'])
+    log.append('c')
+    log.append('a')
+
+    assert log == ['b', 'a', 'c']
+    assert 'a' in log and len(log) == 3
+    log.remove('a')
+    assert list(log) == ['b', 'c']
+    with pytest.raises(ValueError):
+        log.remove('a')
+
+def test_quest_log_survives_save_and_load(tmp_path):
+    """Test that saved quest order is preserved and loads as a QuestLog"""
+    char = character_manager.create_character("LogTest", "Rogue")
+    for qid in ('q3', 'q1', 'q2'):
+        char['completed_quests'].append(qid)
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("LogTest", str(tmp_path))
+
+    assert isinstance(loaded['completed_quests'], quest_handler.QuestLog)
+    assert loaded['completed_quests'] == ['q3', 'q1', 'q2']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,573 @@
+"""
+Test Save System
+Tests saving and loading characters beyond the basic round trip
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("durability", character_manager.DURABILITY_LEVELS)
+def test_save_at_each_durability_level(tmp_path, durability):
+    """Test that every durability level produces a loadable save"""
+    char = character_manager.create_character("Durable", "Cleric")
+    character_manager.save_character(char, str(tmp_path), durability=durability)
+
+    assert character_manager.load_character("Durable", str(tmp_path))['class'] == "Cleric"
+    assert sorted(os.listdir(tmp_path)) == ["Durable_save.dat", "Durable_save.lock",
+                                         "roster.idx", "roster.lock"]
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a crash before the rename leaves the old save intact"""
+    char = character_manager.create_character("Crashy", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+
+    def crash(src, dst):
+        raise OSError("simulated crash")
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+
+    char['gold'] = 999
+    with pytest.raises(IOError):
+        character_manager.save_character(char, str(tmp_path))
+
+    monkeypatch.undo()
+    assert character_manager.load_character("Crashy", str(tmp_path))['gold'] == 100
+    assert sorted(os.listdir(tmp_path)) == ["Crashy_save.dat", "Crashy_save.lock",
+                                         "roster.idx", "roster.lock"]
+
+# ============================================================================
+# AUTOSAVE SCHEDULER TESTS
+# ============================================================================
+
+def test_save_scheduler_skips_clean_and_coalesces(tmp_path):
+    """Test that unchanged characters are not written and changes are rate-limited"""
+    now = [0.0]
+    scheduler = character_manager.SaveScheduler(
+        min_interval=5.0, save_directory=str(tmp_path), clock=lambda: now[0])
+    char = character_manager.create_character("Dirty", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    scheduler.mark_saved(char)
+
+    # Viewing stats changes nothing
+    assert scheduler.request_save(char) is False
+
+    # A change inside the interval stays pending
+    char['gold'] += 10
+    assert scheduler.is_dirty(char)
+    assert scheduler.request_save(char) is False
+    assert character_manager.load_character("Dirty", str(tmp_path))['gold'] == 100
+
+    now[0] = 6.0
+    assert scheduler.tick() == 1
+    assert character_manager.load_character("Dirty", str(tmp_path))['gold'] == 110
+
+    # Quitting flushes whatever is still pending
+    char['gold'] += 5
+    scheduler.request_save(char)
+    assert scheduler.flush() == 1
+    assert not scheduler.is_dirty(char)
+
+def test_save_scheduler_ignores_version_bump_of_async_save(tmp_path):
+    """Test that a new game's queued first save does not leave it dirty"""
+    scheduler = character_manager.SaveScheduler(min_interval=0, save_directory=str(tmp_path))
+    character_manager.enable_async_saves()
+    try:
+        # new_game saves, then game_loop marks it saved before the write lands
+        char = character_manager.create_character("Fresh", "Warrior")
+        character_manager.save_character(char, str(tmp_path))
+        scheduler.mark_saved(char)
+        character_manager.flush_saves()
+
+        assert char['save_version'] == 1
+        assert not scheduler.is_dirty(char)
+        assert scheduler.request_save(char) is False
+    finally:
+        character_manager.disable_async_saves()
+
+# ============================================================================
+# ASYNC SAVE WRITER TESTS
+# ============================================================================
+
+def test_async_saves_keep_latest_snapshot(tmp_path):
+    """Test that queued saves are written in the background, newest wins"""
+    character_manager.enable_async_saves()
+    try:
+        char = character_manager.create_character("Async", "Rogue")
+        for gold in range(100, 150):
+            char['gold'] = gold
+            character_manager.save_character(char, str(tmp_path))
+        character_manager.flush_saves()
+
+        assert character_manager.load_character("Async", str(tmp_path))['gold'] == 149
+    finally:
+        character_manager.disable_async_saves()
+
+def test_async_writer_backpressure(tmp_path, monkeypatch):
+    """Test that a full queue blocks and then times out"""
+    import threading
+    release = threading.Event()
+    monkeypatch.setattr(character_manager, "write_file_atomically",
+                        lambda path, text, durability=None: release.wait())
+
+    storage = character_manager.TextFileStorage(str(tmp_path))
+    writer = character_manager.AsyncSaveWriter(max_pending=1, timeout=0.05)
+    try:
+        writer.submit(storage, "a", "a")   # picked up, then blocks
+        with writer._cond:
+            writer._cond.wait_for(lambda: writer._writing is not None, 1)
+        writer.submit(storage, "b", "b")   # fills the queue
+        writer.submit(storage, "b", "b2")  # same character: replaces, no wait
+        with pytest.raises(IOError):
+            writer.submit(storage, "c", "c")
+    finally:
+        release.set()
+        writer.close()
+
+def test_async_save_failures_are_raised(tmp_path):
+    """Test that a failed background save is reported and never marked saved"""
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    scheduler = character_manager.SaveScheduler(min_interval=0, save_directory=str(blocker))
+    char = character_manager.create_character("Unlucky", "Cleric")
+    storage = character_manager.get_storage(str(blocker))
+
+    writer = character_manager.enable_async_saves()
+    try:
+        assert scheduler.request_save(char) is True
+        writer.wait_for(storage, "Unlucky")
+        assert scheduler.is_dirty(char)
+        with pytest.raises(IOError):
+            scheduler.request_save(char)
+
+        character_manager.save_character(char, str(blocker))
+        writer.wait_for(storage, "Unlucky")
+        with pytest.raises(IOError):
+            character_manager.save_character(char, str(blocker))
+    finally:
+        character_manager.disable_async_saves()
+
+    # Once the saves go through, the scheduler sees them
+    writer = character_manager.enable_async_saves()
+    try:
+        scheduler.save_directory = str(tmp_path)
+        assert scheduler.request_save(char) is True
+        writer.flush()
+        assert not scheduler.is_dirty(char)
+    finally:
+        character_manager.disable_async_saves()
+
+# ============================================================================
+# STORAGE BACKEND TESTS
+# ============================================================================
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = character_manager.configure_storage("sqlite", str(tmp_path / "saves.db"))
+    yield storage
+    character_manager.configure_storage("text")
+
+def test_sqlite_backend_round_trip(sqlite_storage):
+    """Test saving, listing, loading and deleting through the SQLite backend"""
+    for name in ("Zed", "Ann"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"))
+
+    assert character_manager.list_saved_characters() == ["Ann", "Zed"]
+    assert character_manager.load_character("Zed")['class'] == "Mage"
+
+    character_manager.delete_character("Zed")
+    assert character_manager.list_saved_characters() == ["Ann"]
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Zed")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Zed")
+
+def test_sqlite_write_many_is_one_transaction(sqlite_storage):
+    """Test that a failed batch leaves no partial rows"""
+    with pytest.raises(Exception):
+        sqlite_storage.write_many([("One", "x"), ("Two", None)])
+    assert sqlite_storage.list_names() == []
+
+# ============================================================================
+# BATCH SAVE/LOAD TESTS
+# ============================================================================
+
+def test_batch_load_reports_errors_per_name(tmp_path):
+    """Test that missing and broken saves don't abort a batch load"""
+    chars = [character_manager.create_character(name, "Warrior") for name in ("A", "B")]
+    assert character_manager.save_characters(chars, str(tmp_path)) == {}
+    (tmp_path / "Broken_save.txt").write_text("garbage")
+
+    loaded, errors = character_manager.load_characters(["A", "Missing", "Broken", "B"], str(tmp_path))
+    assert list(loaded) == ["A", "B"]
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+    assert isinstance(errors["Broken"], InvalidSaveDataError)
+
+def test_batch_save_on_sqlite(sqlite_storage):
+    """Test a load -> modify -> save pass through the SQLite backend"""
+    names = [f"hero_{i}" for i in range(50)]
+    character_manager.save_characters(character_manager.create_character(n, "Rogue") for n in names)
+
+    loaded, errors = character_manager.load_characters(names + ["ghost"])
+    assert len(loaded) == 50 and list(errors) == ["ghost"]
+    for char in loaded.values():
+        char['gold'] += 10
+    assert character_manager.save_characters(loaded.values()) == {}
+    assert character_manager.load_character("hero_7")['gold'] == 110
+
+def test_batch_save_reports_bad_character(tmp_path):
+    """Test that one unserializable character doesn't stop the others"""
+    good = character_manager.create_character("Good", "Mage")
+    bad = {"name": "Bad"}
+
+    errors = character_manager.save_characters([good, bad], str(tmp_path))
+    assert list(errors) == ["Bad"] and isinstance(errors["Bad"], IOError)
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Good"]
+
+def test_async_batch_save_reports_full_queue(tmp_path, monkeypatch):
+    """Test that a save the async queue can't take is reported, not raised"""
+    import threading
+    release = threading.Event()
+    monkeypatch.setattr(character_manager, "write_file_atomically",
+                        lambda path, text, durability=None: release.wait())
+
+    writer = character_manager.enable_async_saves(max_pending=1, timeout=0.05)
+    try:
+        first = character_manager.create_character("First", "Mage")
+        character_manager.save_character(first, str(tmp_path))
+        with writer._cond:
+            writer._cond.wait_for(lambda: writer._writing is not None, 1)
+
+        chars = [character_manager.create_character(n, "Rogue") for n in ("Queued", "Dropped")]
+        errors = character_manager.save_characters(chars, str(tmp_path))
+        assert list(errors) == ["Dropped"] and isinstance(errors["Dropped"], IOError)
+    finally:
+        release.set()
+        character_manager.disable_async_saves()
+
+# ============================================================================
+# ROSTER INDEX TESTS
+# ============================================================================
+
+def make_roster(directory):
+    for name, cls, level in (("Ann", "Mage", 5), ("Bob", "Warrior", 2), ("Cy", "Mage", 9)):
+        char = character_manager.create_character(name, cls)
+        char['level'] = level
+        character_manager.save_character(char, directory)
+
+def test_roster_filters_and_pages(tmp_path):
+    """Test class, level and paging filters on the text roster"""
+    make_roster(str(tmp_path))
+
+    mages = character_manager.list_roster(str(tmp_path), character_class="Mage", sort="level")
+    assert [(e['name'], e['level']) for e in mages] == [("Cy", 9), ("Ann", 5)]
+    assert mages[0]['size'] == os.path.getsize(tmp_path / "Cy_save.dat")
+
+    page = character_manager.list_roster(str(tmp_path), min_level=2, max_level=5, offset=1, limit=1)
+    assert [e['name'] for e in page] == ["Bob"]
+
+    character_manager.delete_character("Bob", str(tmp_path))
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Ann", "Cy"]
+
+def test_roster_survives_restart_and_rebuilds(tmp_path):
+    """Test that the journal is reloaded, and rebuilt if it is lost"""
+    make_roster(str(tmp_path))
+    character_manager.RosterIndex._instances.clear()
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Ann", "Bob", "Cy"]
+
+    os.remove(tmp_path / "roster.idx")
+    recent = character_manager.list_roster(str(tmp_path), sort="recent", limit=1)
+    assert len(recent) == 1
+    assert (tmp_path / "roster.idx").exists()
+
+def test_roster_escapes_separators_in_names(tmp_path, monkeypatch):
+    """Test that tabs, newlines and backslashes in names survive the journal"""
+    monkeypatch.setattr(character_manager.RosterIndex, "COMPACT_SLACK", 0)
+    odd = "Tab\tNew\nLine\\"
+    for name in (odd, "Plain", "Plain"):
+        character_manager.save_character(character_manager.create_character(name, "Rogue"),
+                                         str(tmp_path))
+    character_manager.delete_character("Plain", str(tmp_path))
+
+    character_manager.RosterIndex._instances.clear()
+    assert character_manager.list_saved_characters(str(tmp_path)) == [odd]
+    with open(tmp_path / "roster.idx", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 1  # compacted
+
+def test_roster_on_sqlite(sqlite_storage):
+    """Test that the SQLite backend answers the same roster queries"""
+    make_roster(None)
+    mages = character_manager.list_roster(character_class="Mage", min_level=6)
+    assert [e['name'] for e in mages] == ["Cy"]
+    with pytest.raises(ValueError):
+        character_manager.list_roster(sort="shoe size")
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_save_keeps_runtime_fields(tmp_path):
+    """Test that extra fields survive a round trip and transient ones are dropped"""
+    char = character_manager.create_character("Full", "Warrior")
+    char['equipped_weapon'] = "iron_sword"
+    char['equipped_armor'] = None
+    char['cooldowns'] = {'special': 2}
+    char['item_data'] = {'iron_sword': {'type': 'weapon'}}
+    character_manager.save_character(char, str(tmp_path))
+
+    data = (tmp_path / "Full_save.dat").read_bytes()
+    assert data.startswith(character_manager.SAVE_MAGIC)
+    loaded = character_manager.load_character("Full", str(tmp_path))
+    assert loaded['equipped_weapon'] == "iron_sword"
+    assert loaded['equipped_armor'] is None
+    assert loaded['cooldowns'] == {'special': 2}
+    assert 'item_data' not in loaded
+
+def test_text_save_is_migrated(tmp_path):
+    """Test that a format 0 text save loads and is rewritten as binary"""
+    char = character_manager.create_character("Old", "Cleric")
+    char['completed_quests'].append("first_steps")
+    (tmp_path / "Old_save.txt").write_text(character_manager.serialize_character_text(char))
+
+    loaded = character_manager.load_character("Old", str(tmp_path))
+    assert loaded['completed_quests'] == ["first_steps"]
+    assert character_manager.list_roster(str(tmp_path))[0]['class'] == "Cleric"
+
+    character_manager.save_character(loaded, str(tmp_path))
+    assert (tmp_path / "Old_save.dat").read_bytes().startswith(character_manager.SAVE_MAGIC)
+    assert not (tmp_path / "Old_save.txt").exists()
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Old"]
+
+def test_newer_save_format_is_rejected():
+    """Test that saves from a newer format version raise InvalidSaveDataError"""
+    data = character_manager.serialize_character(character_manager.create_character("New", "Mage"))
+    header = character_manager._SAVE_HEADER
+    future = header.pack(character_manager.SAVE_MAGIC, 99) + data[header.size:]
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_character(future)
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_character(character_manager.SAVE_MAGIC + b"junk")
+
+# ============================================================================
+# JOURNAL MODE TESTS
+# ============================================================================
+
+def test_journal_appends_small_deltas(tmp_path):
+    """Test that small changes are appended and replayed on load"""
+    storage = character_manager.JournaledTextStorage(str(tmp_path))
+    char = character_manager.create_character("Busy", "Rogue")
+    for i in range(20):
+        char['inventory'].append(f"item_{i}")
+        char['completed_quests'].append(f"quest_{i}")
+    storage.write("Busy", character_manager.serialize_character(char))
+    snapshot = (tmp_path / "Busy_save.dat").read_bytes()
+
+    char['inventory'].append("health_potion")
+    char['completed_quests'].append("first_steps")
+    storage.write("Busy", character_manager.serialize_character(char))
+
+    written = storage.bytes_written
+    char['gold'] += 5
+    storage.write("Busy", character_manager.serialize_character(char))
+    assert storage.bytes_written - written < len(snapshot) // 10
+    assert (tmp_path / "Busy_save.dat").read_bytes() == snapshot
+
+    # A fresh storage has no cached state and must replay the journal
+    fresh = character_manager.JournaledTextStorage(str(tmp_path))
+    loaded = character_manager.decode_character(fresh.read("Busy"))
+    assert loaded['gold'] == 105
+    assert loaded['inventory'].count("health_potion") == 1
+    assert loaded['completed_quests'] == [f"quest_{i}" for i in range(20)] + ["first_steps"]
+
+def test_journal_compacts_after_threshold(tmp_path):
+    """Test that a new snapshot replaces the journal after compact_after entries"""
+    storage = character_manager.JournaledTextStorage(str(tmp_path), compact_after=3)
+    char = character_manager.create_character("Compact", "Mage")
+    for _ in range(4):
+        storage.write("Compact", character_manager.serialize_character(char))
+        char['gold'] += 1
+    assert (tmp_path / "Compact_save.journal").exists()
+
+    storage.write("Compact", character_manager.serialize_character(char))
+    assert not (tmp_path / "Compact_save.journal").exists()
+    assert character_manager.decode_character(
+        (tmp_path / "Compact_save.dat").read_bytes())['gold'] == 104
+
+def test_journal_ignores_torn_and_stale_entries(tmp_path):
+    """Test recovery from a torn append and from a journal left by a crash"""
+    storage = character_manager.JournaledTextStorage(str(tmp_path))
+    char = character_manager.create_character("Torn", "Cleric")
+    storage.write("Torn", character_manager.serialize_character(char))
+    char['gold'] = 150
+    storage.write("Torn", character_manager.serialize_character(char))
+
+    with open(tmp_path / "Torn_save.journal", "ab") as f:
+        f.write(b"\x40\x00\x00\x00half")
+    fresh = character_manager.JournaledTextStorage(str(tmp_path))
+    assert character_manager.decode_character(fresh.read("Torn"))['gold'] == 150
+    char['gold'] = 160
+    fresh.write("Torn", character_manager.serialize_character(char))
+    again = character_manager.JournaledTextStorage(str(tmp_path))
+    assert character_manager.decode_character(again.read("Torn"))['gold'] == 160
+
+    # A snapshot written without removing the journal makes it stale
+    char['gold'] = 10
+    character_manager.TextFileStorage(str(tmp_path)).write(
+        "Torn", character_manager.serialize_character(char))
+    again = character_manager.JournaledTextStorage(str(tmp_path))
+    assert character_manager.decode_character(again.read("Torn"))['gold'] == 10
+
+def test_journal_storage_is_shared_per_directory(tmp_path):
+    """Test that every lookup of a journal directory reuses one storage and cache"""
+    saves = tmp_path / "saves"
+    saves.mkdir()
+    os.symlink(saves, tmp_path / "link")
+    character_manager.configure_storage("journal", str(tmp_path / "default"))
+    try:
+        storage = character_manager.get_storage(str(saves))
+        assert character_manager.get_storage(str(saves)) is storage
+        assert character_manager.get_storage(str(tmp_path / "link")) is storage
+        assert character_manager.get_storage(None) is character_manager.get_storage(
+            str(tmp_path / "default"))
+
+        character_manager.save_character(character_manager.create_character("Cached", "Mage"),
+                                         str(saves))
+        assert "Cached" in storage._states
+    finally:
+        character_manager.configure_storage("text")
+
+# ============================================================================
+# CONCURRENT ACCESS TESTS
+# ============================================================================
+
+needs_fork_and_fcntl = pytest.mark.skipif(
+    character_manager.fcntl is None or not hasattr(os, "fork"),
+    reason="needs fcntl locks and fork")
+
+def test_stale_save_is_refused(tmp_path):
+    """Test that a save based on an outdated load raises StaleSaveError"""
+    character_manager.save_character(character_manager.create_character("Race", "Rogue"), str(tmp_path))
+    first = character_manager.load_character("Race", str(tmp_path))
+    second = character_manager.load_character("Race", str(tmp_path))
+
+    first['gold'] += 50
+    character_manager.save_character(first, str(tmp_path), check_version=True)
+    second['gold'] += 1
+    with pytest.raises(StaleSaveError):
+        character_manager.save_character(second, str(tmp_path), check_version=True)
+    assert second['save_version'] == first['save_version'] - 1
+    assert character_manager.load_character("Race", str(tmp_path))['gold'] == 150
+
+@needs_fork_and_fcntl
+def test_lock_timeout(tmp_path):
+    """Test that a held exclusive lock makes readers time out"""
+    storage = character_manager.TextFileStorage(str(tmp_path))
+    storage.write("Held", character_manager.serialize_character(
+        character_manager.create_character("Held", "Mage")))
+    reader = character_manager.TextFileStorage(str(tmp_path))
+    reader.lock_timeout = 0.05
+
+    with storage.lock("Held"):
+        with pytest.raises(SaveLockTimeoutError):
+            reader.read("Held")
+    assert reader.read("Held")
+
+def test_save_version_moves_only_when_written(tmp_path):
+    """Test that failed saves, sync, async or batched, keep the old save_version"""
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    char = character_manager.create_character("Counted", "Warrior")
+
+    with pytest.raises(IOError):
+        character_manager.save_character(char, str(blocker))
+    assert char.get('save_version', 0) == 0
+    assert list(character_manager.save_characters([char], str(blocker))) == ["Counted"]
+    assert char.get('save_version', 0) == 0
+
+    writer = character_manager.enable_async_saves()
+    try:
+        character_manager.save_character(char, str(blocker))
+        writer.wait_for(character_manager.get_storage(str(blocker)), "Counted")
+        assert char.get('save_version', 0) == 0
+        with pytest.raises(IOError):
+            writer.raise_errors()
+
+        character_manager.save_character(char, str(tmp_path))
+        character_manager.save_character(char, str(tmp_path))
+        character_manager.save_characters([char], str(tmp_path))
+        character_manager.flush_saves()
+    finally:
+        character_manager.disable_async_saves()
+    assert char['save_version'] == 3
+    assert character_manager.load_character("Counted", str(tmp_path))['save_version'] == 3
+
+def test_delete_removes_lock_file(tmp_path):
+    """Test that deleting a character leaves no files behind"""
+    char = character_manager.create_character("Gone", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    assert (tmp_path / "Gone_save.lock").exists()
+
+    character_manager.delete_character("Gone", str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["roster.idx", "roster.lock"]
+
+    # A lock file that can't be created doesn't stop the read from reporting
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Gone", str(tmp_path / "missing"))
+    with character_manager._file_lock(str(tmp_path / "missing" / "x.lock"), False, 0.1):
+        pass
+
+def hammer_gold(save_directory, backend, rounds):
+    """Worker process: add 1 gold per round, retrying stale saves"""
+    if backend == "journal":
+        character_manager.configure_storage("journal", save_directory)
+    for _ in range(rounds):
+        while True:
+            char = character_manager.load_character("Shared", save_directory)
+            char['gold'] += 1
+            try:
+                character_manager.save_character(
+                    char, save_directory, durability="none", check_version=True)
+                break
+            except StaleSaveError:
+                continue
+    os._exit(0)
+
+@needs_fork_and_fcntl
+@pytest.mark.parametrize("backend", ["text", "journal"])
+def test_processes_hammering_one_save(tmp_path, backend):
+    """Test that concurrent worker processes lose no updates"""
+    import multiprocessing
+    context = multiprocessing.get_context("fork")
+    character_manager.save_character(
+        character_manager.create_character("Shared", "Warrior"), str(tmp_path))
+
+    workers = [context.Process(target=hammer_gold, args=(str(tmp_path), backend, 25))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    storage = (character_manager.JournaledTextStorage(str(tmp_path)) if backend == "journal"
+               else character_manager.TextFileStorage(str(tmp_path)))
+    char = character_manager.decode_character(storage.read("Shared"))
+    assert char['gold'] == 100 + 4 * 25
+    assert char['save_version'] == 1 + 4 * 25
+
+def test_configure_storage_rejects_unknown_backend():
+    """Test that an unknown backend name raises ValueError"""
+    with pytest.raises(ValueError):
+        character_manager.configure_storage("floppy")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])